@@ -4,11 +4,60 @@ from pathlib import Path
 
 class Settings(BaseSettings):
     database_url: str = "sqlite:///./buildflow.db"
+    async_database_url: str = ""  # empty derives aiosqlite/asyncpg from database_url
+    # Connection pool / session settings (ignored for SQLite)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 30000  # 0 disables
+    # Per-request query stats (Server-Timing header, N+1 warnings)
+    query_stats: bool = True
+    query_stats_history: int = 100
+    query_repeat_threshold: int = 10  # same statement this often in one request is logged as N+1
+    debug_endpoints: bool = False  # exposes /api/debug/queries (statement text)
+    # Response compression (brotli if the brotli package is installed, else gzip)
+    compress_min_size: int = 1024  # bytes; 0 disables
+    compress_level: int = 6
+    brotli_quality: int = 4
+    compress_routes: dict[str, int] = {"/static": 0}  # path prefix -> min size override, 0 never compresses
+    # Cache-Control: UUID-named uploads are immutable; API routes by path prefix
+    static_max_age: int = 31536000
+    cache_routes: dict[str, str] = {}
     weather_api_key: str = ""
     anthropic_api_key: str = ""
     project_location_lat: float = 33.4484
     project_location_lon: float = -112.0740
-    upload_dir: str = str(Path(__file__).parent / "static")
+    upload_dir: str = str(Path(__file__).parent / "static")  # local storage, and temp files with any storage
+    # Where uploads are stored: "local" (upload_dir) or "s3" (any S3-compatible service, e.g. MinIO)
+    storage_backend: str = "local"
+    s3_bucket: str = ""
+    s3_prefix: str = ""  # key prefix inside the bucket
+    s3_endpoint_url: str = ""  # empty for AWS; e.g. http://localhost:9000 for MinIO
+    s3_region: str = ""
+    s3_access_key: str = ""  # empty uses the standard AWS credential chain
+    s3_secret_key: str = ""
+    s3_part_size_mb: int = 16  # multipart upload part size (min 5)
+    s3_upload_concurrency: int = 4  # parts uploaded in parallel
+    s3_url_expiry: int = 3600  # seconds presigned download URLs stay valid
+    s3_public_url: str = ""  # public/CDN base URL for photos and thumbnails instead of presigned URLs
+    upload_max_mb: dict[str, int] = {"photos": 25, "documents": 500, "takeoffs": 50, "default": 100}  # per upload folder, and takeoffs; 0 = no limit
+    # Photo thumbnails/derivatives (max edge in px), rendered in a process pool after upload
+    image_derivative_sizes: dict[str, int] = {"thumb": 320, "medium": 1280}
+    image_quality: int = 80
+    image_workers: int = 2
+    # Text extraction from uploaded PDF/DOCX/XLSX documents (for search), in a process pool
+    text_extraction_workers: int = 1
+    text_extraction_timeout: int = 120  # seconds per file
+    text_extraction_max_chars: int = 5_000_000  # longer text is truncated
+    report_workers: int = 1  # processes rendering daily report PDFs
+    cost_database_source: str = ""  # CWICR CSV/Parquet export; empty uses built-in averages
+    cost_database_dir: str = str(Path(__file__).parent / "data" / "cwicr")
+    snapshot_interval_hours: float = 24  # 0 disables the in-process snapshot job
+    # Orphaned upload cleanup (files of deleted rows), in-process and scripts/collect_garbage.py
+    storage_gc_interval_hours: float = 24  # 0 disables the in-process job
+    storage_gc_grace_hours: float = 72  # files are kept this long after nothing references them
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
@@ -1,16 +1,54 @@
-from sqlalchemy import create_engine, event
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from backend.config import settings
+from backend.utils import query_stats
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False},
-    echo=False,
-)
+# Async drivers for the same database, used when no explicit async URL is set
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    """The async-driver equivalent of a sync database URL."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()!r}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _engine_options(url: str) -> dict:
+    """Dialect-specific create_engine arguments."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        # Connections are shared across FastAPI's threadpool
+        return {"connect_args": {"check_same_thread": False}}
+
+    connect_args = {}
+    if settings.db_statement_timeout_ms:
+        timeout = str(int(settings.db_statement_timeout_ms))
+        if parsed.get_driver_name() == "asyncpg":
+            connect_args["server_settings"] = {"statement_timeout": timeout}
+        else:
+            connect_args["options"] = f"-c statement_timeout={timeout}"
+    return {
+        "connect_args": connect_args,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
 
 
-@event.listens_for(engine, "connect")
 def _set_sqlite_pragma(dbapi_connection, connection_record):
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA journal_mode=WAL")
@@ -18,16 +56,79 @@ def _set_sqlite_pragma(dbapi_connection, connection_record):
     cursor.close()
 
 
+def _create_engine(url: str, factory):
+    created = factory(url, echo=False, **_engine_options(url))
+    sync_engine = getattr(created, "sync_engine", created)
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _set_sqlite_pragma)
+    if settings.query_stats:
+        query_stats.install(sync_engine)
+    return created
+
+
+engine = _create_engine(settings.database_url, create_engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = _create_engine(
+    settings.async_database_url or async_database_url(settings.database_url),
+    create_async_engine,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     pass
 
 
+def is_unique_violation(exc: IntegrityError) -> bool:
+    """Whether an IntegrityError is a unique/primary key conflict (not e.g. a missing foreign key row)."""
+    sqlstate = getattr(exc.orig, "sqlstate", None) or getattr(exc.orig, "pgcode", None)
+    if sqlstate:
+        return sqlstate == "23505"
+    return "UNIQUE constraint failed" in str(exc.orig)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """AsyncSession dependency; requests wait on the database without holding a worker thread."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Revision matching the schema the old create_all bootstrap produced
+BASELINE_REVISION = "0001"
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    root = Path(__file__).resolve().parent.parent
+    config = Config(str(root / "alembic.ini"))
+    config.set_main_option("script_location", str(Path(__file__).resolve().parent / "migrations"))
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def init_db() -> None:
+    """Bring the database schema up to the latest Alembic revision.
+
+    Databases created by the old ``create_all`` bootstrap have tables but no
+    version table; they are stamped at the baseline first so the upgrade
+    only adds what is missing.
+    """
+    from alembic import command
+
+    config = _alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        tables = inspect(connection).get_table_names()
+        if "projects" in tables and "alembic_version" not in tables:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
@@ -12,6 +12,8 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 import pandas as pd
 
+from backend.ddc_skills.work_item_index import WorkItemIndex
+
 
 class CostComponent(Enum):
     """Cost breakdown components."""
@@ -107,34 +109,54 @@ class CWICRCostCalculator:
         self._index_data()
 
     def _index_data(self):
-        """Create index for fast work item lookup."""
+        """Create prefix/trigram index for fast work item lookup."""
         if 'work_item_code' in self.data.columns:
-            self._code_index = self.data.set_index('work_item_code')
+            descriptions = self.data['description'] if 'description' in self.data.columns else None
+            self._index = WorkItemIndex(self.data['work_item_code'].tolist(),
+                                        descriptions.tolist() if descriptions is not None else None)
         else:
-            self._code_index = None
+            self._index = None
+
+    def find_work_item(self, work_item_code: str) -> Optional[int]:
+        """Row position for a code: exact match first, then best partial match."""
+        if self._index is None:
+            return None
+        pos = self._index.exact(work_item_code)
+        if pos is None:
+            pos = self._index.best_code_match(work_item_code)
+        return pos
+
+    def search_work_items(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Ranked partial matches over work item codes and descriptions."""
+        if self._index is None:
+            return []
+        results = []
+        for pos, score in self._index.search(query, limit):
+            row = self.data.iloc[pos]
+            results.append({
+                'work_item_code': row['work_item_code'],
+                'description': str(row.get('description', '')),
+                'unit': str(row.get('unit', '')),
+                'score': score,
+            })
+        return results
 
     def calculate_item_cost(self, work_item_code: str,
                             quantity: float,
                             price_overrides: Dict[str, float] = None) -> CostBreakdown:
         """Calculate cost for single work item."""
 
-        # Find work item in database
-        if self._code_index is not None and work_item_code in self._code_index.index:
-            item = self._code_index.loc[work_item_code]
-        else:
-            # Try partial match
-            matches = self.data[
-                self.data['work_item_code'].str.contains(work_item_code, case=False, na=False)
-            ]
-            if matches.empty:
-                return CostBreakdown(
-                    work_item_code=work_item_code,
-                    description="NOT FOUND",
-                    unit="",
-                    quantity=quantity,
-                    status=CostStatus.MISSING_DATA
-                )
-            item = matches.iloc[0]
+        # Find work item in database (exact code, then indexed partial match)
+        pos = self.find_work_item(work_item_code)
+        if pos is None:
+            return CostBreakdown(
+                work_item_code=work_item_code,
+                description="NOT FOUND",
+                unit="",
+                quantity=quantity,
+                status=CostStatus.MISSING_DATA
+            )
+        item = self.data.iloc[pos]
 
         # Get base costs
         labor_unit = float(item.get('labor_cost', 0) or 0)
@@ -186,71 +208,147 @@ class CWICRCostCalculator:
             status=CostStatus.CALCULATED
         )
 
-    def calculate_estimate(self, items: List[Dict[str, Any]],
-                          group_by_category: bool = True) -> CostSummary:
-        """Calculate cost estimate for multiple items."""
-
-        breakdowns = []
-        for item in items:
-            code = item.get('work_item_code') or item.get('code')
-            qty = item.get('quantity', 0)
-            overrides = item.get('price_overrides')
-
-            breakdown = self.calculate_item_cost(code, qty, overrides)
-            breakdowns.append(breakdown)
-
-        # Aggregate totals
-        labor_total = sum(b.labor_cost for b in breakdowns)
-        material_total = sum(b.material_cost for b in breakdowns)
-        equipment_total = sum(b.equipment_cost for b in breakdowns)
-        overhead_total = sum(b.overhead_cost for b in breakdowns)
-        profit_total = sum(b.profit_cost for b in breakdowns)
-        total_cost = sum(b.total_cost for b in breakdowns)
+    def _catalog_columns(self) -> pd.DataFrame:
+        """Numeric/text catalog columns needed for pricing, indexed by row position."""
+        cols = {}
+        for col in ('labor_cost', 'material_cost', 'equipment_cost', 'labor_norm', 'labor_rate'):
+            if col in self.data.columns:
+                cols[col] = pd.to_numeric(self.data[col], errors='coerce').fillna(0).to_numpy()
+            else:
+                cols[col] = np.zeros(len(self.data))
+        for col in ('description', 'unit'):
+            if col in self.data.columns:
+                cols[col] = self.data[col].fillna('').astype(str).to_numpy()
+            else:
+                cols[col] = np.full(len(self.data), '', dtype=object)
+        return pd.DataFrame(cols)
+
+    def price_lines(self, codes: pd.Series, quantities: pd.Series,
+                    overrides: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Vectorized cost breakdown for many lines at once.
+
+        Codes are resolved once per unique value, joined to the catalog in a
+        single merge, and every cost component is computed as column
+        arithmetic. ``overrides`` may carry labor_rate, material_factor and
+        equipment_factor columns aligned with the lines (NaN = no override).
+        Returns the same columns as ``CostBreakdown.to_dict`` plus
+        unit_price, labor_hours and labor_rate.
+        """
+        codes = codes.fillna('').astype(str).reset_index(drop=True)
+        qty = pd.to_numeric(quantities, errors='coerce').fillna(0).reset_index(drop=True)
+
+        unique_codes = pd.unique(codes)
+        positions = {c: self.find_work_item(c) for c in unique_codes}
+        lines = pd.DataFrame({
+            'work_item_code': codes,
+            'quantity': qty,
+            '_pos': codes.map(positions).fillna(-1).astype(np.int64),
+        })
+        catalog = self._catalog_columns()
+        catalog['_pos'] = np.arange(len(catalog), dtype=np.int64)
+        merged = lines.merge(catalog, on='_pos', how='left', sort=False)
+        found = merged['_pos'].to_numpy() >= 0
+
+        labor_unit = merged['labor_cost'].fillna(0).to_numpy()
+        material_unit = merged['material_cost'].fillna(0).to_numpy()
+        equipment_unit = merged['equipment_cost'].fillna(0).to_numpy()
+        labor_norm = merged['labor_norm'].fillna(0).to_numpy()
+
+        if overrides is not None:
+            overrides = overrides.reset_index(drop=True)
+            if 'labor_rate' in overrides:
+                rate = pd.to_numeric(overrides['labor_rate'], errors='coerce').to_numpy()
+                labor_unit = np.where(np.isnan(rate), labor_unit, labor_norm * np.nan_to_num(rate))
+            if 'material_factor' in overrides:
+                factor = pd.to_numeric(overrides['material_factor'], errors='coerce').fillna(1).to_numpy()
+                material_unit = material_unit * factor
+            if 'equipment_factor' in overrides:
+                factor = pd.to_numeric(overrides['equipment_factor'], errors='coerce').fillna(1).to_numpy()
+                equipment_unit = equipment_unit * factor
+
+        q = merged['quantity'].to_numpy(dtype=float)
+        labor_cost = labor_unit * q
+        material_cost = material_unit * q
+        equipment_cost = equipment_unit * q
+        direct_cost = labor_cost + material_cost + equipment_cost
+        overhead_cost = direct_cost * self.overhead_rate
+        profit_cost = (direct_cost + overhead_cost) * self.profit_rate
+        total_cost = direct_cost + overhead_cost + profit_cost
+        unit_price = np.divide(total_cost, q, out=np.zeros_like(total_cost), where=q > 0)
+
+        return pd.DataFrame({
+            'work_item_code': merged['work_item_code'],
+            'description': np.where(found, merged['description'].fillna(''), 'NOT FOUND'),
+            'unit': np.where(found, merged['unit'].fillna(''), ''),
+            'quantity': q,
+            'labor_cost': labor_cost,
+            'material_cost': material_cost,
+            'equipment_cost': equipment_cost,
+            'overhead_cost': overhead_cost,
+            'profit_cost': profit_cost,
+            'total_cost': total_cost,
+            'status': np.where(found, CostStatus.CALCULATED.value, CostStatus.MISSING_DATA.value),
+            'unit_price': unit_price,
+            'labor_hours': labor_norm * q,
+            'labor_rate': merged['labor_rate'].fillna(0).to_numpy(),
+        })
+
+    @staticmethod
+    def _category_of(codes: pd.Series) -> pd.Series:
+        """Category from work item code prefix ('Other' when the code has no '-')."""
+        return codes.str.split('-', n=1).str[0].where(codes.str.contains('-', regex=False), 'Other')
+
+    def summarize_lines(self, lines: pd.DataFrame,
+                        group_by_category: bool = True) -> CostSummary:
+        """Aggregate priced lines into a CostSummary."""
+        totals = lines[['labor_cost', 'material_cost', 'equipment_cost',
+                        'overhead_cost', 'profit_cost', 'total_cost']].sum()
 
-        # Group by category if requested
         breakdown_by_category = {}
-        if group_by_category:
-            for b in breakdowns:
-                # Extract category from work item code prefix
-                category = b.work_item_code.split('-')[0] if '-' in b.work_item_code else 'Other'
-                if category not in breakdown_by_category:
-                    breakdown_by_category[category] = 0
-                breakdown_by_category[category] += b.total_cost
+        if group_by_category and len(lines):
+            by_cat = lines['total_cost'].groupby(self._category_of(lines['work_item_code']), sort=False).sum()
+            breakdown_by_category = {k: float(v) for k, v in by_cat.items()}
 
         return CostSummary(
-            total_cost=total_cost,
-            labor_total=labor_total,
-            material_total=material_total,
-            equipment_total=equipment_total,
-            overhead_total=overhead_total,
-            profit_total=profit_total,
-            item_count=len(breakdowns),
+            total_cost=float(totals['total_cost']),
+            labor_total=float(totals['labor_cost']),
+            material_total=float(totals['material_cost']),
+            equipment_total=float(totals['equipment_cost']),
+            overhead_total=float(totals['overhead_cost']),
+            profit_total=float(totals['profit_cost']),
+            item_count=len(lines),
             currency=self.currency,
             calculated_at=datetime.now(),
             breakdown_by_category=breakdown_by_category
         )
 
+    def calculate_estimate(self, items: List[Dict[str, Any]],
+                          group_by_category: bool = True) -> CostSummary:
+        """Calculate cost estimate for multiple items."""
+        codes = pd.Series([item.get('work_item_code') or item.get('code') for item in items], dtype=object)
+        quantities = pd.Series([item.get('quantity', 0) for item in items], dtype=float)
+        overrides = None
+        if any(item.get('price_overrides') for item in items):
+            overrides = pd.DataFrame([item.get('price_overrides') or {} for item in items])
+
+        lines = self.price_lines(codes, quantities, overrides)
+        return self.summarize_lines(lines, group_by_category)
+
     def calculate_from_qto(self, qto_df: pd.DataFrame,
                           code_column: str = 'work_item_code',
                           quantity_column: str = 'quantity') -> pd.DataFrame:
         """Calculate costs from Quantity Takeoff DataFrame."""
-
-        results = []
-        for _, row in qto_df.iterrows():
-            code = row[code_column]
-            qty = row[quantity_column]
-
-            breakdown = self.calculate_item_cost(code, qty)
-            result = breakdown.to_dict()
-
-            # Add original QTO columns
-            for col in qto_df.columns:
-                if col not in result:
-                    result[f'qto_{col}'] = row[col]
-
-            results.append(result)
-
-        return pd.DataFrame(results)
+        lines = self.price_lines(qto_df[code_column], qto_df[quantity_column])
+        result = lines[['work_item_code', 'description', 'unit', 'quantity',
+                        'labor_cost', 'material_cost', 'equipment_cost',
+                        'overhead_cost', 'profit_cost', 'total_cost', 'status']]
+
+        # Add original QTO columns
+        extra = [c for c in qto_df.columns if c not in result.columns]
+        if extra:
+            qto_cols = qto_df[extra].reset_index(drop=True).add_prefix('qto_')
+            result = pd.concat([result, qto_cols], axis=1)
+        return result
 
     def apply_regional_factors(self, base_costs: pd.DataFrame,
                                region_factors: Dict[str, float]) -> pd.DataFrame:
@@ -324,16 +422,13 @@ class CostReportGenerator:
 
     def generate_detailed_report(self, items: List[Dict[str, Any]]) -> pd.DataFrame:
         """Generate detailed line-item report."""
-        results = []
-
-        for item in items:
-            code = item.get('work_item_code') or item.get('code')
-            qty = item.get('quantity', 0)
-
-            breakdown = self.calculator.calculate_item_cost(code, qty)
-            results.append(breakdown.to_dict())
-
-        df = pd.DataFrame(results)
+        codes = pd.Series([item.get('work_item_code') or item.get('code') for item in items], dtype=object)
+        quantities = pd.Series([item.get('quantity', 0) for item in items], dtype=float)
+        df = self.calculator.price_lines(codes, quantities)[
+            ['work_item_code', 'description', 'unit', 'quantity',
+             'labor_cost', 'material_cost', 'equipment_cost',
+             'overhead_cost', 'profit_cost', 'total_cost', 'status']
+        ]
 
         # Add totals row
         totals = df[['labor_cost', 'material_cost', 'equipment_cost',
@@ -2,6 +2,9 @@
 
 Automatically generate daily construction reports from field data, worker inputs,
 weather, and progress photos. Creates professional PDF reports.
+
+ReportLab is imported when a report is rendered (``pip install buildflow[pdf]``),
+so the data helpers work without it.
 """
 
 import os
@@ -10,18 +13,6 @@ from typing import Dict, List, Optional
 
 import pandas as pd
 import requests
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.lib.units import cm
-from reportlab.platypus import (
-    Image,
-    Paragraph,
-    SimpleDocTemplate,
-    Spacer,
-    Table,
-    TableStyle,
-)
 
 
 class DailyReportGenerator:
@@ -32,6 +23,9 @@ class DailyReportGenerator:
         self.weather_api_key = config.get('weather_api_key')
         self.project_name = config.get('project_name')
         self.report_date = config.get('report_date', date.today())
+        self.temp_unit = config.get('temp_unit', 'C')
+        self.wind_unit = config.get('wind_unit', 'm/s')
+        self.date_format = config.get('date_format', '%d.%m.%Y')
 
     def get_weather_data(self, location: str) -> dict:
         """Fetch weather data from API"""
@@ -165,6 +159,13 @@ class DailyReportGenerator:
 
     def generate_report(self, data: dict, output_path: str) -> str:
         """Generate PDF report"""
+        return self.generate_reports([(self.report_date, data)], output_path)
+
+    def generate_reports(self, reports: List[tuple], output_path: str) -> str:
+        """Generate one PDF of several (report_date, data) reports, each starting on a new page"""
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.units import cm
+        from reportlab.platypus import PageBreak, SimpleDocTemplate
 
         doc = SimpleDocTemplate(
             output_path,
@@ -175,34 +176,66 @@ class DailyReportGenerator:
             bottomMargin=2*cm
         )
 
+        styles = self._styles()
+        elements = []
+        for i, (report_date, data) in enumerate(reports):
+            if i:
+                elements.append(PageBreak())
+            elements.extend(self._report_elements(report_date, data, styles))
+
+        # Build PDF
+        doc.build(elements)
+        return output_path
+
+    def _styles(self) -> dict:
+        from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
         styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'Title',
-            parent=styles['Heading1'],
-            fontSize=16,
-            alignment=1,
-            spaceAfter=12
-        )
-        heading_style = ParagraphStyle(
-            'Heading',
-            parent=styles['Heading2'],
-            fontSize=12,
-            spaceBefore=12,
-            spaceAfter=6
-        )
+        return {
+            'title': ParagraphStyle(
+                'Title',
+                parent=styles['Heading1'],
+                fontSize=16,
+                alignment=1,
+                spaceAfter=12
+            ),
+            'heading': ParagraphStyle(
+                'Heading',
+                parent=styles['Heading2'],
+                fontSize=12,
+                spaceBefore=12,
+                spaceAfter=6
+            ),
+            'normal': styles['Normal'],
+        }
+
+    @staticmethod
+    def _measure(value, unit: str) -> str:
+        return '-' if value is None else f"{value}{unit}"
+
+    @staticmethod
+    def _bullet(label: Optional[str], description: str) -> str:
+        return f"* {label}: {description}" if label else f"* {description}"
 
+    def _report_elements(self, report_date: date, data: dict, styles: dict) -> list:
+        from reportlab.lib import colors
+        from reportlab.lib.units import cm
+        from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+
+        heading_style = styles['heading']
+        normal = styles['normal']
         elements = []
 
         # Title
         elements.append(Paragraph(
             f"DAILY CONSTRUCTION REPORT",
-            title_style
+            styles['title']
         ))
 
         # Header info
         header_data = [
-            ['Project:', self.project_name, 'Date:', self.report_date.strftime('%d.%m.%Y')],
-            ['Report #:', data.get('report_number', 'DCR-001'), 'Weather:', f"{data['weather']['icon']} {data['weather']['temp']}C"]
+            ['Project:', self.project_name, 'Date:', report_date.strftime(self.date_format)],
+            ['Report #:', data.get('report_number', 'DCR-001'), 'Weather:', f"{data['weather']['icon']} {self._measure(data['weather']['temp'], self.temp_unit)}"]
         ]
         header_table = Table(header_data, colWidths=[3*cm, 6*cm, 3*cm, 4*cm])
         header_table.setStyle(TableStyle([
@@ -218,10 +251,10 @@ class DailyReportGenerator:
         elements.append(Paragraph("1. WEATHER CONDITIONS", heading_style))
         weather = data['weather']
         weather_text = f"""
-        Temperature: {weather['temp']}C | Humidity: {weather['humidity']}% |
-        Wind: {weather['wind_speed']} m/s | Conditions: {weather['description']}
+        Temperature: {self._measure(weather['temp'], self.temp_unit)} | Humidity: {self._measure(weather['humidity'], '%')} |
+        Wind: {self._measure(weather['wind_speed'], ' ' + self.wind_unit)} | Conditions: {weather['description']}
         """
-        elements.append(Paragraph(weather_text, styles['Normal']))
+        elements.append(Paragraph(weather_text, normal))
 
         # Workforce section
         elements.append(Paragraph("2. WORKFORCE", heading_style))
@@ -254,50 +287,50 @@ class DailyReportGenerator:
 
         # Work completed
         elements.append(Paragraph("3. WORK COMPLETED TODAY", heading_style))
+        if data.get('summary'):
+            elements.append(Paragraph(data['summary'], normal))
         for item in data.get('work_completed', []):
-            bullet = f"* {item['trade']}: {item['description']}"
+            bullet = self._bullet(item.get('trade'), item['description'])
             if item.get('notes'):
                 bullet += f" ({item['notes']})"
-            elements.append(Paragraph(bullet, styles['Normal']))
+            elements.append(Paragraph(bullet, normal))
 
         # Work planned
         elements.append(Paragraph("4. WORK PLANNED FOR TOMORROW", heading_style))
         for item in data.get('work_planned', []):
-            bullet = f"* {item['trade']}: {item['description']}"
-            elements.append(Paragraph(bullet, styles['Normal']))
+            elements.append(Paragraph(self._bullet(item.get('trade'), item['description']), normal))
 
         # Issues
         elements.append(Paragraph("5. ISSUES / DELAYS", heading_style))
         issues = data.get('issues', [])
         if issues:
             for issue in issues:
-                bullet = f"* {issue['category']}: {issue['description']}"
+                bullet = self._bullet(issue.get('category'), issue['description'])
                 if issue.get('resolution_date'):
                     bullet += f" (ETA: {issue['resolution_date']})"
-                elements.append(Paragraph(bullet, styles['Normal']))
+                elements.append(Paragraph(bullet, normal))
         else:
-            elements.append(Paragraph("No significant issues reported.", styles['Normal']))
+            elements.append(Paragraph("No significant issues reported.", normal))
 
         # Safety
         elements.append(Paragraph("6. SAFETY", heading_style))
         safety = data.get('safety', {})
         if safety.get('incidents', 0) == 0:
-            elements.append(Paragraph("No incidents reported", styles['Normal']))
+            elements.append(Paragraph("No incidents reported", normal))
         else:
-            elements.append(Paragraph(f"{safety['incidents']} incident(s) reported", styles['Normal']))
+            elements.append(Paragraph(f"{safety['incidents']} incident(s) reported", normal))
 
         if safety.get('toolbox_talk'):
-            elements.append(Paragraph(f"Toolbox talk: {', '.join(safety['toolbox_talk'])}", styles['Normal']))
+            elements.append(Paragraph(f"Toolbox talk: {', '.join(safety['toolbox_talk'])}", normal))
+        if safety.get('notes'):
+            elements.append(Paragraph(safety['notes'], normal))
 
         # Signature block
         elements.append(Spacer(1, 24))
-        elements.append(Paragraph("_" * 60, styles['Normal']))
-        elements.append(Paragraph(f"Prepared by: {data.get('prepared_by', '_________________')}", styles['Normal']))
-        elements.append(Paragraph(f"Date: {datetime.now().strftime('%d.%m.%Y %H:%M')}", styles['Normal']))
-
-        # Build PDF
-        doc.build(elements)
-        return output_path
+        elements.append(Paragraph("_" * 60, normal))
+        elements.append(Paragraph(f"Prepared by: {data.get('prepared_by', '_________________')}", normal))
+        elements.append(Paragraph(f"Date: {data.get('prepared_at', datetime.now()).strftime(self.date_format + ' %H:%M')}", normal))
+        return elements
 
 
 def generate_daily_report(
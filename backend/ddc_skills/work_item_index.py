@@ -0,0 +1,152 @@
+"""Work Item Index for CWICR catalogs.
+
+Prefix and trigram index over work item codes and descriptions, built once
+per catalog so partial-code lookups and free-text search avoid full-table
+scans.
+"""
+
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Codes remembered by best_code_match (least recently used are dropped)
+MATCH_CACHE_SIZE = 4096
+
+
+def _trigrams(text: str) -> set:
+    """Trigrams of a lower-cased string padded with spaces."""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class WorkItemIndex:
+    """Ranked partial matching over a work item catalog."""
+
+    def __init__(self, codes: Sequence[str], descriptions: Optional[Sequence[str]] = None):
+        self.codes: List[str] = ["" if c is None else str(c) for c in codes]
+        self._upper = [c.upper() for c in self.codes]
+        descriptions = descriptions if descriptions is not None else [""] * len(self.codes)
+
+        # Exact lookup keeps the first row for duplicate codes (table order)
+        self._exact: Dict[str, int] = {}
+        for pos, key in enumerate(self._upper):
+            self._exact.setdefault(key, pos)
+
+        # Sorted keys for prefix range scans
+        order = sorted(range(len(self._upper)), key=self._upper.__getitem__)
+        self._sorted_keys = [self._upper[i] for i in order]
+        self._sorted_pos = order
+
+        # Trigram postings over "code description"
+        postings: Dict[str, List[int]] = {}
+        for pos, (code, desc) in enumerate(zip(self.codes, descriptions)):
+            text = f"{code} {'' if desc is None else desc}".lower()
+            for gram in _trigrams(text):
+                postings.setdefault(gram, []).append(pos)
+        self._postings: Dict[str, np.ndarray] = {
+            g: np.asarray(ids, dtype=np.int32) for g, ids in postings.items()
+        }
+
+        self._match_cache: "OrderedDict[str, Optional[int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def exact(self, code: str) -> Optional[int]:
+        """Row position of an exact (case-insensitive) code match."""
+        return self._exact.get(str(code).upper())
+
+    def prefix(self, prefix: str, limit: int = 10) -> List[int]:
+        """Row positions whose code starts with prefix, in code order."""
+        key = str(prefix).upper()
+        start = bisect_left(self._sorted_keys, key)
+        out = []
+        for i in range(start, len(self._sorted_keys)):
+            if not self._sorted_keys[i].startswith(key) or len(out) >= limit:
+                break
+            out.append(self._sorted_pos[i])
+        return out
+
+    def _candidates(self, query: str) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Rows sharing trigrams with query, with their hit counts."""
+        grams = _trigrams(query.lower())
+        lists = [self._postings[g] for g in grams if g in self._postings]
+        if not lists:
+            return np.empty(0, np.int32), np.empty(0, np.int64), len(grams)
+        rows, counts = np.unique(np.concatenate(lists), return_counts=True)
+        return rows, counts, len(grams)
+
+    def best_code_match(self, code: str) -> Optional[int]:
+        """Best row whose code contains code (prefix matches first, then shorter codes).
+
+        Same match set as ``data['work_item_code'].str.contains(code, case=False)``,
+        memoized for the last ``MATCH_CACHE_SIZE`` codes.
+        """
+        key = str(code).upper()
+        try:
+            self._match_cache.move_to_end(key)
+            return self._match_cache[key]
+        except KeyError:
+            # Not cached, or evicted by another thread in between
+            pass
+
+        if not key:
+            match = None
+        else:
+            prefixed = self.prefix(key, limit=1)
+            if prefixed:
+                match = prefixed[0]
+            else:
+                # Unpadded trigrams must all be present in the code for a substring hit
+                inner = {key.lower()[i:i + 3] for i in range(len(key) - 2)}
+                if inner and all(g in self._postings for g in inner):
+                    rows = None
+                    for g in sorted(inner, key=lambda g: len(self._postings[g])):
+                        rows = self._postings[g] if rows is None else np.intersect1d(rows, self._postings[g], assume_unique=True)
+                        if not len(rows):
+                            break
+                    candidates = rows.tolist() if rows is not None else []
+                elif not inner:
+                    candidates = range(len(self._upper))
+                else:
+                    candidates = []
+                hits = [p for p in candidates if key in self._upper[p]]
+                match = min(hits, key=lambda p: (len(self._upper[p]), p)) if hits else None
+
+        self._match_cache[key] = match
+        while len(self._match_cache) > MATCH_CACHE_SIZE:
+            try:
+                self._match_cache.popitem(last=False)
+            except KeyError:
+                break
+        return match
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """Ranked (row position, score) matches over codes and descriptions."""
+        query = str(query).strip()
+        if not query:
+            return []
+        rows, counts, n_grams = self._candidates(query)
+        if not len(rows):
+            return []
+        # Shortlist by trigram overlap plus direct code-prefix hits, then boost code matches
+        shortlist = min(len(rows), limit * 5)
+        top = np.argpartition(-counts, shortlist - 1)[:shortlist]
+        overlap = {int(rows[i]): counts[i] / n_grams for i in top}
+        for pos in self.prefix(query, limit):
+            if pos not in overlap:
+                i = np.searchsorted(rows, pos)
+                overlap[pos] = counts[i] / n_grams if i < len(rows) and rows[i] == pos else 0.0
+        key = query.upper()
+        scored = []
+        for pos, score in overlap.items():
+            code = self._upper[pos]
+            if code.startswith(key):
+                score += 2.0
+            elif key in code:
+                score += 1.0
+            scored.append((pos, round(float(score), 4)))
+        scored.sort(key=lambda s: (-s[1], s[0]))
+        return scored[:limit]
@@ -1,10 +1,13 @@
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 
-from backend.database import Base, engine
+from backend.config import settings
+from backend.database import init_db
+from backend.utils import query_stats
+from backend.utils.http_cache import CachedStaticFiles, CacheControlMiddleware, CompressionMiddleware
 from backend.routers import (
     projects,
     budget,
@@ -18,18 +21,38 @@ from backend.routers import (
     uploads,
     chat,
     education,
+    costs,
+    search,
 )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Import all models so tables are registered
-    import backend.models  # noqa: F401
-    Base.metadata.create_all(bind=engine)
+    # Apply pending schema migrations (models are registered by the migration env)
+    init_db()
     # Ensure upload directories exist
     for sub in ("photos", "documents", "exports"):
-        (Path(__file__).parent / "static" / sub).mkdir(parents=True, exist_ok=True)
+        (Path(settings.upload_dir) / sub).mkdir(parents=True, exist_ok=True)
+    # Open the CWICR store (and build its search index) before the first cost request needs it
+    from backend.services.cost_database import get_cost_database
+    cost_db_task = asyncio.create_task(asyncio.to_thread(get_cost_database)) if settings.cost_database_source else None
+    # Daily budget/KPI history snapshots for trend charts
+    from backend.services.snapshots import snapshot_loop
+    snapshot_task = asyncio.create_task(snapshot_loop()) if settings.snapshot_interval_hours > 0 else None
+    # Delete uploads no row references any more
+    from backend.services.storage_gc import storage_gc_loop
+    gc_task = asyncio.create_task(storage_gc_loop()) if settings.storage_gc_interval_hours > 0 else None
     yield
+    if snapshot_task:
+        snapshot_task.cancel()
+    if gc_task:
+        gc_task.cancel()
+    if cost_db_task:
+        cost_db_task.cancel()
+    from backend.services import daily_reports, images, text_extraction
+    images.shutdown()
+    text_extraction.shutdown()
+    daily_reports.shutdown()
 
 
 app = FastAPI(
@@ -45,12 +68,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing"],
 )
+app.add_middleware(CacheControlMiddleware, rules=settings.cache_routes)
+if settings.compress_min_size > 0:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compress_min_size,
+        compresslevel=settings.compress_level,
+        brotli_quality=settings.brotli_quality,
+        routes=settings.compress_routes,
+    )
+
+
+if settings.query_stats:
+    @app.middleware("http")
+    async def record_query_stats(request: Request, call_next):
+        with query_stats.collect(f"{request.method} {request.url.path}") as stats:
+            response = await call_next(request)
+        response.headers.append("Server-Timing", stats.server_timing())
+        query_stats.remember(stats)
+        return response
 
 # Static files for uploaded photos/documents
-static_dir = Path(__file__).parent / "static"
+static_dir = Path(settings.upload_dir)
 static_dir.mkdir(parents=True, exist_ok=True)
-app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+app.mount("/static", CachedStaticFiles(directory=str(static_dir), max_age=settings.static_max_age), name="static")
 
 # Register all routers
 app.include_router(projects.router, prefix="/api/v1", tags=["projects"])
@@ -65,8 +108,18 @@ app.include_router(subcontractors.router, prefix="/api/v1", tags=["subcontractor
 app.include_router(uploads.router, prefix="/api/v1", tags=["uploads"])
 app.include_router(chat.router, prefix="/api/v1", tags=["chat"])
 app.include_router(education.router, prefix="/api/v1", tags=["education"])
+app.include_router(costs.router, prefix="/api/v1", tags=["costs"])
+app.include_router(search.router, prefix="/api/v1", tags=["search"])
 
 
 @app.get("/api/health")
 def health_check():
     return {"status": "ok", "app": "BuildFlow", "version": "0.1.0"}
+
+
+@app.get("/api/debug/queries")
+def debug_queries():
+    """Query count, DB time and slowest/repeated statements of recent requests."""
+    if not settings.debug_endpoints:
+        raise HTTPException(404, "Not found")
+    return query_stats.recent()
@@ -0,0 +1,478 @@
+"""initial schema
+
+Tables as created by the original ``Base.metadata.create_all`` bootstrap.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('projects',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('address', sa.String(length=500), nullable=True),
+    sa.Column('city', sa.String(length=100), nullable=True),
+    sa.Column('state', sa.String(length=50), nullable=True),
+    sa.Column('zip_code', sa.String(length=20), nullable=True),
+    sa.Column('lot_number', sa.String(length=50), nullable=True),
+    sa.Column('total_budget', sa.Float(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=True),
+    sa.Column('target_end_date', sa.Date(), nullable=True),
+    sa.Column('actual_end_date', sa.Date(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('activity_log',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('module', sa.String(length=30), nullable=False),
+    sa.Column('action', sa.String(length=30), nullable=False),
+    sa.Column('entity_type', sa.String(length=30), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('budget_categories',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('code', sa.String(length=20), nullable=False),
+    sa.Column('budgeted_amount', sa.Float(), nullable=False),
+    sa.Column('sort_order', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('change_orders',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('co_number', sa.String(length=20), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('change_type', sa.String(length=30), nullable=False),
+    sa.Column('cost_impact', sa.Float(), nullable=False),
+    sa.Column('time_impact_days', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('requested_by', sa.String(length=100), nullable=True),
+    sa.Column('requested_date', sa.Date(), nullable=True),
+    sa.Column('approved_date', sa.Date(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('daily_logs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('log_date', sa.Date(), nullable=False),
+    sa.Column('report_number', sa.String(length=20), nullable=True),
+    sa.Column('weather_temp', sa.Float(), nullable=True),
+    sa.Column('weather_condition', sa.String(length=50), nullable=True),
+    sa.Column('weather_wind', sa.Float(), nullable=True),
+    sa.Column('weather_humidity', sa.Float(), nullable=True),
+    sa.Column('weather_impact', sa.String(length=20), nullable=True),
+    sa.Column('work_summary', sa.Text(), nullable=True),
+    sa.Column('work_planned', sa.Text(), nullable=True),
+    sa.Column('issues', sa.Text(), nullable=True),
+    sa.Column('safety_incidents', sa.Integer(), nullable=False),
+    sa.Column('safety_notes', sa.Text(), nullable=True),
+    sa.Column('prepared_by', sa.String(length=200), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('project_id', 'log_date')
+    )
+    op.create_table('document_categories',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('parent_id', sa.Integer(), nullable=True),
+    sa.Column('sort_order', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['parent_id'], ['document_categories.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('milestones',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('target_date', sa.Date(), nullable=True),
+    sa.Column('actual_date', sa.Date(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('permits',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('permit_type', sa.String(length=30), nullable=False),
+    sa.Column('permit_number', sa.String(length=50), nullable=True),
+    sa.Column('jurisdiction', sa.String(length=200), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('application_date', sa.Date(), nullable=True),
+    sa.Column('issued_date', sa.Date(), nullable=True),
+    sa.Column('expiry_date', sa.Date(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('project_value', sa.Float(), nullable=False),
+    sa.Column('applicant_name', sa.String(length=200), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('phases',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('sort_order', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=True),
+    sa.Column('end_date', sa.Date(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('punch_lists',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('walk_date', sa.Date(), nullable=True),
+    sa.Column('attendees', sa.Text(), nullable=True),
+    sa.Column('area', sa.String(length=200), nullable=True),
+    sa.Column('list_type', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('created_by', sa.String(length=200), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('subcontractors',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('company_name', sa.String(length=200), nullable=False),
+    sa.Column('contact_name', sa.String(length=200), nullable=True),
+    sa.Column('email', sa.String(length=200), nullable=True),
+    sa.Column('phone', sa.String(length=30), nullable=True),
+    sa.Column('trade', sa.String(length=50), nullable=False),
+    sa.Column('license_number', sa.String(length=50), nullable=True),
+    sa.Column('insurance_expiry', sa.Date(), nullable=True),
+    sa.Column('contract_amount', sa.Float(), nullable=False),
+    sa.Column('retention_percent', sa.Float(), nullable=False),
+    sa.Column('contract_start', sa.Date(), nullable=True),
+    sa.Column('contract_end', sa.Date(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('activities',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('phase_id', sa.Integer(), nullable=True),
+    sa.Column('activity_code', sa.String(length=20), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('duration_days', sa.Integer(), nullable=False),
+    sa.Column('early_start', sa.Integer(), nullable=False),
+    sa.Column('early_finish', sa.Integer(), nullable=False),
+    sa.Column('late_start', sa.Integer(), nullable=False),
+    sa.Column('late_finish', sa.Integer(), nullable=False),
+    sa.Column('total_float', sa.Integer(), nullable=False),
+    sa.Column('is_critical', sa.Boolean(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('percent_complete', sa.Float(), nullable=False),
+    sa.Column('planned_start', sa.Date(), nullable=True),
+    sa.Column('planned_finish', sa.Date(), nullable=True),
+    sa.Column('actual_start', sa.Date(), nullable=True),
+    sa.Column('actual_finish', sa.Date(), nullable=True),
+    sa.Column('assigned_to', sa.String(length=200), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('sort_order', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['phase_id'], ['phases.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('budget_items',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('item_code', sa.String(length=50), nullable=False),
+    sa.Column('description', sa.String(length=500), nullable=False),
+    sa.Column('original_budget', sa.Float(), nullable=False),
+    sa.Column('current_budget', sa.Float(), nullable=False),
+    sa.Column('committed_cost', sa.Float(), nullable=False),
+    sa.Column('actual_cost', sa.Float(), nullable=False),
+    sa.Column('forecast_cost', sa.Float(), nullable=False),
+    sa.Column('percent_complete', sa.Float(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['budget_categories.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('daily_log_crew',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('daily_log_id', sa.Integer(), nullable=False),
+    sa.Column('trade', sa.String(length=50), nullable=False),
+    sa.Column('company_name', sa.String(length=200), nullable=True),
+    sa.Column('headcount', sa.Integer(), nullable=False),
+    sa.Column('hours_worked', sa.Float(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['daily_log_id'], ['daily_logs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('daily_log_photos',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('daily_log_id', sa.Integer(), nullable=False),
+    sa.Column('file_path', sa.String(length=500), nullable=False),
+    sa.Column('caption', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['daily_log_id'], ['daily_logs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('daily_log_work_items',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('daily_log_id', sa.Integer(), nullable=False),
+    sa.Column('trade', sa.String(length=50), nullable=True),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['daily_log_id'], ['daily_logs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('documents',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('name', sa.String(length=300), nullable=False),
+    sa.Column('file_path', sa.String(length=500), nullable=False),
+    sa.Column('file_type', sa.String(length=20), nullable=True),
+    sa.Column('file_size', sa.Integer(), nullable=True),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('tags', sa.Text(), nullable=True),
+    sa.Column('uploaded_by', sa.String(length=200), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['document_categories.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('inspections',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('permit_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('inspection_type', sa.String(length=100), nullable=False),
+    sa.Column('scheduled_date', sa.Date(), nullable=True),
+    sa.Column('completed_date', sa.Date(), nullable=True),
+    sa.Column('inspector_name', sa.String(length=200), nullable=True),
+    sa.Column('result', sa.String(length=20), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('corrections', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['permit_id'], ['permits.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('permit_documents',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('permit_id', sa.Integer(), nullable=False),
+    sa.Column('document_type', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_required', sa.Boolean(), nullable=False),
+    sa.Column('file_path', sa.String(length=500), nullable=True),
+    sa.Column('submitted_date', sa.Date(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('reviewer_notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['permit_id'], ['permits.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('permit_fees',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('permit_id', sa.Integer(), nullable=False),
+    sa.Column('fee_type', sa.String(length=100), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('due_date', sa.Date(), nullable=True),
+    sa.Column('paid_date', sa.Date(), nullable=True),
+    sa.Column('receipt_number', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['permit_id'], ['permits.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('punch_items',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('punch_list_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('location', sa.String(length=200), nullable=False),
+    sa.Column('building', sa.String(length=100), nullable=True),
+    sa.Column('floor', sa.String(length=50), nullable=True),
+    sa.Column('room', sa.String(length=100), nullable=True),
+    sa.Column('trade', sa.String(length=50), nullable=False),
+    sa.Column('priority', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=30), nullable=False),
+    sa.Column('assigned_to', sa.String(length=200), nullable=True),
+    sa.Column('assigned_date', sa.Date(), nullable=True),
+    sa.Column('due_date', sa.Date(), nullable=True),
+    sa.Column('photo_before_path', sa.String(length=500), nullable=True),
+    sa.Column('photo_after_path', sa.String(length=500), nullable=True),
+    sa.Column('spec_reference', sa.String(length=200), nullable=True),
+    sa.Column('completed_by', sa.String(length=200), nullable=True),
+    sa.Column('completed_date', sa.Date(), nullable=True),
+    sa.Column('completion_notes', sa.Text(), nullable=True),
+    sa.Column('verified_by', sa.String(length=200), nullable=True),
+    sa.Column('verified_date', sa.Date(), nullable=True),
+    sa.Column('verification_notes', sa.Text(), nullable=True),
+    sa.Column('back_charge', sa.Boolean(), nullable=False),
+    sa.Column('back_charge_amount', sa.Float(), nullable=False),
+    sa.Column('back_charge_ref', sa.String(length=100), nullable=True),
+    sa.Column('created_by', sa.String(length=200), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['punch_list_id'], ['punch_lists.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('subcontractor_payments',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('subcontractor_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('invoice_number', sa.String(length=50), nullable=True),
+    sa.Column('invoice_date', sa.Date(), nullable=True),
+    sa.Column('gross_amount', sa.Float(), nullable=False),
+    sa.Column('retention_held', sa.Float(), nullable=False),
+    sa.Column('net_amount', sa.Float(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('scheduled_date', sa.Date(), nullable=True),
+    sa.Column('paid_date', sa.Date(), nullable=True),
+    sa.Column('check_number', sa.String(length=50), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['subcontractor_id'], ['subcontractors.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('activity_dependencies',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('activity_id', sa.Integer(), nullable=False),
+    sa.Column('predecessor_id', sa.Integer(), nullable=False),
+    sa.Column('dependency_type', sa.String(length=5), nullable=False),
+    sa.Column('lag_days', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['activity_id'], ['activities.id'], ),
+    sa.ForeignKeyConstraint(['predecessor_id'], ['activities.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('bids',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('budget_item_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('contractor_name', sa.String(length=200), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('is_selected', sa.Integer(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('proposal_path', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['budget_item_id'], ['budget_items.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('cost_entries',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('budget_item_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('entry_date', sa.Date(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('entry_type', sa.String(length=20), nullable=False),
+    sa.Column('vendor', sa.String(length=200), nullable=True),
+    sa.Column('invoice_number', sa.String(length=100), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('receipt_path', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['budget_item_id'], ['budget_items.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('decisions',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('activity_id', sa.Integer(), nullable=True),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('due_date', sa.Date(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('choice_made', sa.String(length=500), nullable=True),
+    sa.Column('impact_level', sa.String(length=20), nullable=False),
+    sa.Column('knowledge_term', sa.String(length=100), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('decided_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['activity_id'], ['activities.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('lien_waivers',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('payment_id', sa.Integer(), nullable=False),
+    sa.Column('waiver_type', sa.String(length=30), nullable=False),
+    sa.Column('through_date', sa.Date(), nullable=True),
+    sa.Column('amount', sa.Float(), nullable=True),
+    sa.Column('received_date', sa.Date(), nullable=True),
+    sa.Column('file_path', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['payment_id'], ['subcontractor_payments.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('lien_waivers')
+    op.drop_table('decisions')
+    op.drop_table('cost_entries')
+    op.drop_table('bids')
+    op.drop_table('activity_dependencies')
+    op.drop_table('subcontractor_payments')
+    op.drop_table('punch_items')
+    op.drop_table('permit_fees')
+    op.drop_table('permit_documents')
+    op.drop_table('inspections')
+    op.drop_table('documents')
+    op.drop_table('daily_log_work_items')
+    op.drop_table('daily_log_photos')
+    op.drop_table('daily_log_crew')
+    op.drop_table('budget_items')
+    op.drop_table('activities')
+    op.drop_table('subcontractors')
+    op.drop_table('punch_lists')
+    op.drop_table('phases')
+    op.drop_table('permits')
+    op.drop_table('milestones')
+    op.drop_table('document_categories')
+    op.drop_table('daily_logs')
+    op.drop_table('change_orders')
+    op.drop_table('budget_categories')
+    op.drop_table('activity_log')
+    op.drop_table('projects')
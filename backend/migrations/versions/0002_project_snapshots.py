@@ -0,0 +1,54 @@
+"""project snapshots
+
+Daily budget/KPI history used by the dashboard trend charts. Databases
+bootstrapped with ``create_all`` after the table was introduced already
+have it, so creation is skipped when present.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:05:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table('project_snapshots'):
+        return
+    op.create_table('project_snapshots',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('snapshot_date', sa.Date(), nullable=False),
+    sa.Column('total_budget', sa.Float(), nullable=False),
+    sa.Column('total_committed', sa.Float(), nullable=False),
+    sa.Column('total_actual', sa.Float(), nullable=False),
+    sa.Column('total_forecast', sa.Float(), nullable=False),
+    sa.Column('planned_value', sa.Float(), nullable=False),
+    sa.Column('earned_value', sa.Float(), nullable=False),
+    sa.Column('spi', sa.Float(), nullable=True),
+    sa.Column('cpi', sa.Float(), nullable=True),
+    sa.Column('eac', sa.Float(), nullable=False),
+    sa.Column('percent_complete', sa.Float(), nullable=False),
+    sa.Column('first_pass_yield', sa.Float(), nullable=True),
+    sa.Column('open_punch_items', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('project_snapshots', schema=None) as batch_op:
+        batch_op.create_index('ix_project_snapshots_project_date', ['project_id', 'snapshot_date'], unique=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('project_snapshots', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_snapshots_project_date')
+
+    op.drop_table('project_snapshots')
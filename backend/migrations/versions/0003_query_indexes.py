@@ -0,0 +1,192 @@
+"""query indexes
+
+Indexes for the per-project list/summary filters, foreign-key joins
+(dependencies, payments, lien waivers, nested log rows) and the
+(project_id, status/date) composites the dashboards filter and sort on.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 09:10:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('activities', schema=None) as batch_op:
+        batch_op.create_index('ix_activities_project_status', ['project_id', 'status'], unique=False)
+
+    with op.batch_alter_table('activity_dependencies', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_activity_dependencies_activity_id'), ['activity_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_activity_dependencies_predecessor_id'), ['predecessor_id'], unique=False)
+
+    with op.batch_alter_table('activity_log', schema=None) as batch_op:
+        batch_op.create_index('ix_activity_log_project_created', ['project_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('bids', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_bids_budget_item_id'), ['budget_item_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_bids_project_id'), ['project_id'], unique=False)
+
+    with op.batch_alter_table('budget_categories', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_budget_categories_project_id'), ['project_id'], unique=False)
+
+    with op.batch_alter_table('budget_items', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_budget_items_category_id'), ['category_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_budget_items_project_id'), ['project_id'], unique=False)
+
+    with op.batch_alter_table('change_orders', schema=None) as batch_op:
+        batch_op.create_index('ix_change_orders_project_status', ['project_id', 'status'], unique=False)
+
+    with op.batch_alter_table('cost_entries', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_cost_entries_budget_item_id'), ['budget_item_id'], unique=False)
+        batch_op.create_index('ix_cost_entries_project_date', ['project_id', 'entry_date'], unique=False)
+
+    with op.batch_alter_table('daily_log_crew', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_daily_log_crew_daily_log_id'), ['daily_log_id'], unique=False)
+
+    with op.batch_alter_table('daily_log_photos', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_daily_log_photos_daily_log_id'), ['daily_log_id'], unique=False)
+
+    with op.batch_alter_table('daily_log_work_items', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_daily_log_work_items_daily_log_id'), ['daily_log_id'], unique=False)
+
+    with op.batch_alter_table('decisions', schema=None) as batch_op:
+        batch_op.create_index('ix_decisions_project_due', ['project_id', 'due_date'], unique=False)
+
+    with op.batch_alter_table('document_categories', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_document_categories_project_id'), ['project_id'], unique=False)
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_documents_category_id'), ['category_id'], unique=False)
+        batch_op.create_index('ix_documents_project_created', ['project_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('inspections', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_inspections_permit_id'), ['permit_id'], unique=False)
+        batch_op.create_index('ix_inspections_project_scheduled', ['project_id', 'scheduled_date'], unique=False)
+
+    with op.batch_alter_table('lien_waivers', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_lien_waivers_payment_id'), ['payment_id'], unique=False)
+
+    with op.batch_alter_table('milestones', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_milestones_project_id'), ['project_id'], unique=False)
+
+    with op.batch_alter_table('permit_documents', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_permit_documents_permit_id'), ['permit_id'], unique=False)
+
+    with op.batch_alter_table('permit_fees', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_permit_fees_permit_id'), ['permit_id'], unique=False)
+
+    with op.batch_alter_table('permits', schema=None) as batch_op:
+        batch_op.create_index('ix_permits_project_status', ['project_id', 'status'], unique=False)
+
+    with op.batch_alter_table('phases', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_phases_project_id'), ['project_id'], unique=False)
+
+    with op.batch_alter_table('punch_items', schema=None) as batch_op:
+        batch_op.create_index('ix_punch_items_project_due', ['project_id', 'due_date'], unique=False)
+        batch_op.create_index('ix_punch_items_project_status', ['project_id', 'status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_punch_items_punch_list_id'), ['punch_list_id'], unique=False)
+
+    with op.batch_alter_table('punch_lists', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_punch_lists_project_id'), ['project_id'], unique=False)
+
+    with op.batch_alter_table('subcontractor_payments', schema=None) as batch_op:
+        batch_op.create_index('ix_subcontractor_payments_project_status', ['project_id', 'status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_subcontractor_payments_subcontractor_id'), ['subcontractor_id'], unique=False)
+
+    with op.batch_alter_table('subcontractors', schema=None) as batch_op:
+        batch_op.create_index('ix_subcontractors_project_status', ['project_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('subcontractors', schema=None) as batch_op:
+        batch_op.drop_index('ix_subcontractors_project_status')
+
+    with op.batch_alter_table('subcontractor_payments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_subcontractor_payments_subcontractor_id'))
+        batch_op.drop_index('ix_subcontractor_payments_project_status')
+
+    with op.batch_alter_table('punch_lists', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_punch_lists_project_id'))
+
+    with op.batch_alter_table('punch_items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_punch_items_punch_list_id'))
+        batch_op.drop_index('ix_punch_items_project_status')
+        batch_op.drop_index('ix_punch_items_project_due')
+
+    with op.batch_alter_table('phases', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_phases_project_id'))
+
+    with op.batch_alter_table('permits', schema=None) as batch_op:
+        batch_op.drop_index('ix_permits_project_status')
+
+    with op.batch_alter_table('permit_fees', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_permit_fees_permit_id'))
+
+    with op.batch_alter_table('permit_documents', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_permit_documents_permit_id'))
+
+    with op.batch_alter_table('milestones', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_milestones_project_id'))
+
+    with op.batch_alter_table('lien_waivers', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_lien_waivers_payment_id'))
+
+    with op.batch_alter_table('inspections', schema=None) as batch_op:
+        batch_op.drop_index('ix_inspections_project_scheduled')
+        batch_op.drop_index(batch_op.f('ix_inspections_permit_id'))
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.drop_index('ix_documents_project_created')
+        batch_op.drop_index(batch_op.f('ix_documents_category_id'))
+
+    with op.batch_alter_table('document_categories', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_document_categories_project_id'))
+
+    with op.batch_alter_table('decisions', schema=None) as batch_op:
+        batch_op.drop_index('ix_decisions_project_due')
+
+    with op.batch_alter_table('daily_log_work_items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_daily_log_work_items_daily_log_id'))
+
+    with op.batch_alter_table('daily_log_photos', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_daily_log_photos_daily_log_id'))
+
+    with op.batch_alter_table('daily_log_crew', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_daily_log_crew_daily_log_id'))
+
+    with op.batch_alter_table('cost_entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_cost_entries_project_date')
+        batch_op.drop_index(batch_op.f('ix_cost_entries_budget_item_id'))
+
+    with op.batch_alter_table('change_orders', schema=None) as batch_op:
+        batch_op.drop_index('ix_change_orders_project_status')
+
+    with op.batch_alter_table('budget_items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_budget_items_project_id'))
+        batch_op.drop_index(batch_op.f('ix_budget_items_category_id'))
+
+    with op.batch_alter_table('budget_categories', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_budget_categories_project_id'))
+
+    with op.batch_alter_table('bids', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_bids_project_id'))
+        batch_op.drop_index(batch_op.f('ix_bids_budget_item_id'))
+
+    with op.batch_alter_table('activity_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_activity_log_project_created')
+
+    with op.batch_alter_table('activity_dependencies', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_activity_dependencies_predecessor_id'))
+        batch_op.drop_index(batch_op.f('ix_activity_dependencies_activity_id'))
+
+    with op.batch_alter_table('activities', schema=None) as batch_op:
+        batch_op.drop_index('ix_activities_project_status')
@@ -0,0 +1,37 @@
+"""bid selected boolean
+
+``bids.is_selected`` was declared as an integer holding 0/1, which only
+works on SQLite. Postgres needs a real boolean column.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 10:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('bids', schema=None) as batch_op:
+        batch_op.alter_column('is_selected',
+               existing_type=sa.Integer(),
+               type_=sa.Boolean(),
+               existing_nullable=False,
+               postgresql_using='is_selected <> 0')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('bids', schema=None) as batch_op:
+        batch_op.alter_column('is_selected',
+               existing_type=sa.Boolean(),
+               type_=sa.Integer(),
+               existing_nullable=False,
+               postgresql_using='is_selected::integer')
@@ -0,0 +1,57 @@
+"""keyset indexes
+
+Composite (filter, sort key, id) indexes backing the cursor-paginated
+list endpoints, so each page is a single index range scan.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 11:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('change_orders', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_change_orders_project_id'), ['project_id'], unique=False)
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.drop_index('ix_documents_project_created')
+        batch_op.create_index('ix_documents_project_created', ['project_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.create_index('ix_projects_created', ['created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('punch_items', schema=None) as batch_op:
+        batch_op.create_index('ix_punch_items_project_created', ['project_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('subcontractor_payments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_subcontractor_payments_subcontractor_id'))
+        batch_op.create_index('ix_subcontractor_payments_sub_created', ['subcontractor_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('subcontractor_payments', schema=None) as batch_op:
+        batch_op.drop_index('ix_subcontractor_payments_sub_created')
+        batch_op.create_index(batch_op.f('ix_subcontractor_payments_subcontractor_id'), ['subcontractor_id'], unique=False)
+
+    with op.batch_alter_table('punch_items', schema=None) as batch_op:
+        batch_op.drop_index('ix_punch_items_project_created')
+
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_index('ix_projects_created')
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.drop_index('ix_documents_project_created')
+        batch_op.create_index('ix_documents_project_created', ['project_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('change_orders', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_change_orders_project_id'))
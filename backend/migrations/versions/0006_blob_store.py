@@ -0,0 +1,72 @@
+"""blob store
+
+Content-addressed upload storage: one ``blobs`` row per distinct SHA-256
+with a reference count, and a ``blob_sha256`` reference on every table
+whose ``file_path`` points at an upload. Existing uploads keep their
+paths until ``scripts/migrate_uploads_to_blobs.py`` moves them.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 12:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('blobs',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('file_path', sa.String(length=500), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+
+    with op.batch_alter_table('daily_log_photos', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('blob_sha256', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_daily_log_photos_blob_sha256'), ['blob_sha256'], unique=False)
+        batch_op.create_foreign_key('fk_daily_log_photos_blob_sha256_blobs', 'blobs', ['blob_sha256'], ['sha256'])
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('blob_sha256', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_documents_blob_sha256'), ['blob_sha256'], unique=False)
+        batch_op.create_foreign_key('fk_documents_blob_sha256_blobs', 'blobs', ['blob_sha256'], ['sha256'])
+
+    with op.batch_alter_table('lien_waivers', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('blob_sha256', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_lien_waivers_blob_sha256'), ['blob_sha256'], unique=False)
+        batch_op.create_foreign_key('fk_lien_waivers_blob_sha256_blobs', 'blobs', ['blob_sha256'], ['sha256'])
+
+    with op.batch_alter_table('permit_documents', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('blob_sha256', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_permit_documents_blob_sha256'), ['blob_sha256'], unique=False)
+        batch_op.create_foreign_key('fk_permit_documents_blob_sha256_blobs', 'blobs', ['blob_sha256'], ['sha256'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('permit_documents', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_permit_documents_blob_sha256'))
+        batch_op.drop_column('blob_sha256')
+
+    with op.batch_alter_table('lien_waivers', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_lien_waivers_blob_sha256'))
+        batch_op.drop_column('blob_sha256')
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_documents_blob_sha256'))
+        batch_op.drop_column('blob_sha256')
+
+    with op.batch_alter_table('daily_log_photos', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_daily_log_photos_blob_sha256'))
+        batch_op.drop_column('blob_sha256')
+
+    op.drop_table('blobs')
@@ -0,0 +1,37 @@
+"""punch photo blobs
+
+Blob references for punch item before/after photos, so they are counted
+in ``blobs.ref_count`` like the other uploads.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 13:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('punch_items', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('photo_before_sha256', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('photo_after_sha256', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_punch_items_photo_after_sha256'), ['photo_after_sha256'], unique=False)
+        batch_op.create_index(batch_op.f('ix_punch_items_photo_before_sha256'), ['photo_before_sha256'], unique=False)
+        batch_op.create_foreign_key('fk_punch_items_photo_after_sha256_blobs', 'blobs', ['photo_after_sha256'], ['sha256'])
+        batch_op.create_foreign_key('fk_punch_items_photo_before_sha256_blobs', 'blobs', ['photo_before_sha256'], ['sha256'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('punch_items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_punch_items_photo_before_sha256'))
+        batch_op.drop_index(batch_op.f('ix_punch_items_photo_after_sha256'))
+        batch_op.drop_column('photo_after_sha256')
+        batch_op.drop_column('photo_before_sha256')
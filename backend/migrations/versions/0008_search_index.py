@@ -0,0 +1,66 @@
+"""search index
+
+Full-text index over documents, daily logs, punch items and inspections:
+an FTS5 virtual table on SQLite, a table with a weighted generated
+``tsvector`` and a GIN index on PostgreSQL. Existing rows are indexed here;
+later writes are indexed by the flush hook in ``backend.models.search``.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 14:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (entity type, type code, table, title expression, body columns); see SEARCH_SOURCES
+SOURCES = [
+    ('document', 1, 'documents', 'name', ('description', 'tags')),
+    ('daily_log', 2, 'daily_logs', "'Daily log ' || log_date", ('work_summary', 'issues', 'safety_notes')),
+    ('punch_item', 3, 'punch_items', 'location', ('description',)),
+    ('inspection', 4, 'inspections', 'inspection_type', ('notes', 'corrections')),
+]
+
+
+def _backfill(key_column: str, body_expr) -> None:
+    for entity_type, code, table, title, body in SOURCES:
+        op.execute(
+            f"INSERT INTO search_index ({key_column}, entity_type, entity_id, project_id, title, body) "
+            f"SELECT id * 8 + {code}, '{entity_type}', id, project_id, {title}, {body_expr(body)} FROM {table}"
+        )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "CREATE TABLE search_index ("
+            " id BIGINT PRIMARY KEY,"
+            " entity_type VARCHAR(20) NOT NULL,"
+            " entity_id INTEGER NOT NULL,"
+            " project_id INTEGER NOT NULL,"
+            " title TEXT NOT NULL DEFAULT '',"
+            " body TEXT NOT NULL DEFAULT '',"
+            " tsv TSVECTOR GENERATED ALWAYS AS ("
+            "  setweight(to_tsvector('english', title), 'A') || setweight(to_tsvector('english', body), 'B')"
+            " ) STORED)"
+        )
+        op.execute("CREATE INDEX ix_search_index_tsv ON search_index USING gin (tsv)")
+        op.execute("CREATE INDEX ix_search_index_project ON search_index (project_id)")
+        _backfill('id', lambda cols: f"concat_ws(E'\\n', {', '.join(cols)})")
+    else:
+        op.execute(
+            "CREATE VIRTUAL TABLE search_index USING fts5("
+            "entity_type UNINDEXED, entity_id UNINDEXED, project_id UNINDEXED, title, body, "
+            "tokenize = 'porter unicode61 remove_diacritics 2')"
+        )
+        _backfill('rowid', lambda cols: "trim(" + " || char(10) || ".join(f"coalesce({c}, '')" for c in cols) + ", char(10))")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE search_index")
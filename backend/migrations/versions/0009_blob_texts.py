@@ -0,0 +1,35 @@
+"""blob texts
+
+Text extracted from uploaded PDF/DOCX/XLSX files, one compressed row per
+blob, used to search inside documents.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 15:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('blob_texts',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('page_count', sa.Integer(), nullable=False),
+    sa.Column('content', sa.LargeBinary(), nullable=True),
+    sa.Column('extracted_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['sha256'], ['blobs.sha256'], name='fk_blob_texts_sha256_blobs'),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('blob_texts')
@@ -0,0 +1,33 @@
+"""blob orphaned at
+
+When a blob lost its last reference, for the grace period of the storage
+garbage collector. Blobs unreferenced at upgrade time start it now.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 16:00:00.000000
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('blobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('orphaned_at', sa.DateTime(), nullable=True))
+
+    blobs = sa.table('blobs', sa.column('ref_count', sa.Integer), sa.column('orphaned_at', sa.DateTime))
+    op.execute(blobs.update().where(blobs.c.ref_count <= 0).values(orphaned_at=datetime.utcnow()))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('blobs', schema=None) as batch_op:
+        batch_op.drop_column('orphaned_at')
@@ -0,0 +1,48 @@
+"""document versions
+
+Version chains for documents (previous version, shared chain id, latest
+flag, indexed for latest-only lists and per-chain lookups), and the content
+encoding of blobs stored compressed. Existing documents are each the latest
+version of their own chain.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 17:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('blobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_encoding', sa.String(length=10), nullable=True))
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('parent_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('chain_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('is_latest', sa.Boolean(), nullable=False, server_default=sa.true()))
+        batch_op.create_index('ix_documents_chain_version', ['chain_id', 'version'], unique=False)
+        batch_op.create_index(batch_op.f('ix_documents_parent_id'), ['parent_id'], unique=False)
+        batch_op.create_index('ix_documents_project_latest', ['project_id', 'is_latest', 'created_at', 'id'], unique=False)
+        batch_op.create_foreign_key('fk_documents_parent_id_documents', 'documents', ['parent_id'], ['id'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.drop_index('ix_documents_project_latest')
+        batch_op.drop_index(batch_op.f('ix_documents_parent_id'))
+        batch_op.drop_index('ix_documents_chain_version')
+        batch_op.drop_column('is_latest')
+        batch_op.drop_column('chain_id')
+        batch_op.drop_column('parent_id')
+
+    with op.batch_alter_table('blobs', schema=None) as batch_op:
+        batch_op.drop_column('content_encoding')
@@ -0,0 +1,30 @@
+"""unindex superseded documents
+
+Only the latest version of a document is searchable. Drop the search index
+entries that superseded versions kept until now.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 18:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "DELETE FROM search_index WHERE entity_type = 'document' "
+        "AND entity_id IN (SELECT id FROM documents WHERE NOT is_latest)"
+    )
+
+
+def downgrade() -> None:
+    # Superseded versions stay out of the index
+    pass
@@ -0,0 +1,30 @@
+"""blob derived at
+
+When a photo blob's derivatives were stored, so serializing a photo no
+longer asks storage whether they exist. Existing blobs start unmarked;
+scripts/generate_thumbnails.py marks those already rendered.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19 19:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('blobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('derived_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('blobs', schema=None) as batch_op:
+        batch_op.drop_column('derived_at')
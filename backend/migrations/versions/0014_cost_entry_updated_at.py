@@ -0,0 +1,36 @@
+"""cost entry updated at
+
+When a cost entry last changed, so edits to its date, amount or budget
+item invalidate the cached earned value curves. Existing entries start at
+their created_at.
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-19 20:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0014'
+down_revision: Union[str, None] = '0013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('cost_entries', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    entries = sa.table('cost_entries', sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime))
+    op.execute(entries.update().values(updated_at=entries.c.created_at))
+
+    with op.batch_alter_table('cost_entries', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('cost_entries', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -1,3 +1,4 @@
+from backend.models.blob import Blob, BlobText
 from backend.models.project import Project, Phase
 from backend.models.budget import BudgetCategory, BudgetItem, CostEntry, ChangeOrder
 from backend.models.schedule import Activity, ActivityDependency, Milestone
@@ -7,8 +8,11 @@ from backend.models.daily_log import DailyLog, DailyLogCrew, DailyLogWorkItem, D
 from backend.models.document import DocumentCategory, Document
 from backend.models.subcontractor import Subcontractor, SubcontractorPayment, LienWaiver
 from backend.models.activity_log import ActivityLog
+from backend.models.history import ProjectSnapshot
+from backend.models.search import SEARCH_SOURCES
 
 __all__ = [
+    "Blob", "BlobText",
     "Project", "Phase",
     "BudgetCategory", "BudgetItem", "CostEntry", "ChangeOrder",
     "Activity", "ActivityDependency", "Milestone",
@@ -18,4 +22,6 @@ __all__ = [
     "DocumentCategory", "Document",
     "Subcontractor", "SubcontractorPayment", "LienWaiver",
     "ActivityLog",
+    "ProjectSnapshot",
+    "SEARCH_SOURCES",
 ]
@@ -1,11 +1,14 @@
 from datetime import datetime
-from sqlalchemy import Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from backend.database import Base
 
 
 class ActivityLog(Base):
     __tablename__ = "activity_log"
+    __table_args__ = (
+        Index("ix_activity_log_project_created", "project_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
@@ -0,0 +1,112 @@
+import zlib
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import BigInteger, Integer, String, DateTime, ForeignKey, LargeBinary, case, event, func, inspect, select
+from sqlalchemy.orm import Mapped, Session, column_property, mapped_column
+from backend.database import Base
+
+
+class Blob(Base):
+    """An uploaded file stored once under its SHA-256, shared by every row that references it."""
+    __tablename__ = "blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    file_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # "gzip" if the file is stored compressed (superseded document versions), else None
+    content_encoding: Mapped[str | None] = mapped_column(String(10))
+    # Since when nothing references the blob (new blobs start unreferenced); None while referenced.
+    # Orphaned blobs are removed after a grace period by backend.services.storage_gc.
+    orphaned_at: Mapped[datetime | None] = mapped_column(DateTime, default=datetime.utcnow)
+    # When the photo derivatives (backend.services.images) were stored; None until then
+    derived_at: Mapped[datetime | None] = mapped_column(DateTime)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class BlobText(Base):
+    """Text extracted from a PDF/DOCX/XLSX blob, stored zlib-compressed with pages separated by form feeds.
+
+    One row per content hash, whatever the outcome (status ok, empty,
+    unsupported, failed or timeout), so each upload is extracted at most once.
+    """
+    __tablename__ = "blob_texts"
+
+    sha256: Mapped[str] = mapped_column(ForeignKey("blobs.sha256"), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    page_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    content: Mapped[bytes | None] = mapped_column(LargeBinary)
+    extracted_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    @staticmethod
+    def compress(pages: list[str]) -> bytes:
+        return zlib.compress("\f".join(p.replace("\f", " ") for p in pages).encode())
+
+    @staticmethod
+    def decompress(content: bytes | None) -> list[str]:
+        return zlib.decompress(content).decode().split("\f") if content else []
+
+    @property
+    def pages(self) -> list[str]:
+        return self.decompress(self.content)
+
+
+class BlobRef:
+    """Mixin for rows whose file_path points at a blob; keeps Blob.ref_count in step.
+
+    Models with other blob columns list them in ``__blob_refs__``.
+    """
+    __blob_refs__ = ("blob_sha256",)
+
+    blob_sha256: Mapped[str | None] = mapped_column(ForeignKey("blobs.sha256"), index=True)
+
+
+def derivatives_rendered(sha256_column):
+    """Column property: whether the blob in sha256_column has its photo derivatives, loaded with the row."""
+    return column_property(
+        select(Blob.derived_at.is_not(None)).where(Blob.sha256 == sha256_column).scalar_subquery()
+    )
+
+
+def _blob_refs(obj) -> tuple[str, ...]:
+    return getattr(obj, "__blob_refs__", ())
+
+
+def _blob_ref_deltas(session: Session) -> Counter:
+    deltas = Counter()
+    for obj in session.new:
+        deltas.update(sha for attr in _blob_refs(obj) if (sha := getattr(obj, attr)))
+    for obj in session.dirty:
+        for attr in _blob_refs(obj):
+            history = inspect(obj).attrs[attr].history
+            deltas.update(sha for sha in history.added if sha)
+            deltas.subtract(sha for sha in history.deleted if sha)
+    for obj in session.deleted:
+        for attr in _blob_refs(obj):
+            history = inspect(obj).attrs[attr].history
+            deltas.subtract(sha for sha in (history.deleted or history.unchanged) if sha)
+    return deltas
+
+
+@event.listens_for(Session, "before_flush")
+def _load_deleted_blob_refs(session, flush_context, instances):
+    # Deleted rows may have their blob columns expired; load them while the row still exists
+    for obj in session.deleted:
+        for attr in _blob_refs(obj):
+            getattr(obj, attr)
+
+
+@event.listens_for(Session, "after_flush")
+def _count_blob_refs(session, flush_context):
+    # new/dirty/deleted and attribute history still show the pre-flush state here
+    table = Blob.__table__
+    now = datetime.utcnow()
+    for sha, delta in _blob_ref_deltas(session).items():
+        if delta:
+            count = table.c.ref_count + delta
+            session.connection().execute(
+                table.update().where(table.c.sha256 == sha).values(
+                    ref_count=count,
+                    orphaned_at=case((count > 0, None), else_=func.coalesce(table.c.orphaned_at, now)),
+                )
+            )
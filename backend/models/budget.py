@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from sqlalchemy import Integer, String, Float, Date, DateTime, Text, ForeignKey
+from sqlalchemy import Integer, String, Float, Boolean, Date, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.database import Base
 
@@ -8,7 +8,7 @@ class BudgetCategory(Base):
     __tablename__ = "budget_categories"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False, index=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     code: Mapped[str] = mapped_column(String(20), nullable=False)
     budgeted_amount: Mapped[float] = mapped_column(Float, default=0)
@@ -22,8 +22,8 @@ class BudgetItem(Base):
     __tablename__ = "budget_items"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    category_id: Mapped[int] = mapped_column(ForeignKey("budget_categories.id"), nullable=False)
-    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    category_id: Mapped[int] = mapped_column(ForeignKey("budget_categories.id"), nullable=False, index=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False, index=True)
     item_code: Mapped[str] = mapped_column(String(50), nullable=False)
     description: Mapped[str] = mapped_column(String(500), nullable=False)
     original_budget: Mapped[float] = mapped_column(Float, default=0)
@@ -45,11 +45,11 @@ class Bid(Base):
     __tablename__ = "bids"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    budget_item_id: Mapped[int] = mapped_column(ForeignKey("budget_items.id"), nullable=False)
-    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    budget_item_id: Mapped[int] = mapped_column(ForeignKey("budget_items.id"), nullable=False, index=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False, index=True)
     contractor_name: Mapped[str] = mapped_column(String(200), nullable=False)
     amount: Mapped[float] = mapped_column(Float, nullable=False)
-    is_selected: Mapped[bool] = mapped_column(Integer, default=0)  # SQLite handles bool as 0/1
+    is_selected: Mapped[bool] = mapped_column(Boolean, default=False)
     notes: Mapped[str | None] = mapped_column(Text)
     proposal_path: Mapped[str | None] = mapped_column(String(500))
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -59,9 +59,12 @@ class Bid(Base):
 
 class CostEntry(Base):
     __tablename__ = "cost_entries"
+    __table_args__ = (
+        Index("ix_cost_entries_project_date", "project_id", "entry_date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    budget_item_id: Mapped[int] = mapped_column(ForeignKey("budget_items.id"), nullable=False)
+    budget_item_id: Mapped[int] = mapped_column(ForeignKey("budget_items.id"), nullable=False, index=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
     entry_date: Mapped[date] = mapped_column(Date, nullable=False)
     amount: Mapped[float] = mapped_column(Float, nullable=False)
@@ -71,15 +74,19 @@ class CostEntry(Base):
     description: Mapped[str | None] = mapped_column(Text)
     receipt_path: Mapped[str | None] = mapped_column(String(500))
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     budget_item: Mapped["BudgetItem"] = relationship(back_populates="cost_entries")
 
 
 class ChangeOrder(Base):
     __tablename__ = "change_orders"
+    __table_args__ = (
+        Index("ix_change_orders_project_status", "project_id", "status"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False, index=True)
     co_number: Mapped[str] = mapped_column(String(20), nullable=False)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str | None] = mapped_column(Text)
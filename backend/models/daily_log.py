@@ -1,7 +1,8 @@
 from datetime import date, datetime
-from sqlalchemy import Integer, String, Float, Date, DateTime, Text, ForeignKey, UniqueConstraint
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Integer, String, Float, Date, DateTime, Text, ForeignKey, UniqueConstraint, event, update
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 from backend.database import Base
+from backend.models.blob import BlobRef, derivatives_rendered
 
 
 class DailyLog(Base):
@@ -35,7 +36,7 @@ class DailyLogCrew(Base):
     __tablename__ = "daily_log_crew"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    daily_log_id: Mapped[int] = mapped_column(ForeignKey("daily_logs.id"), nullable=False)
+    daily_log_id: Mapped[int] = mapped_column(ForeignKey("daily_logs.id"), nullable=False, index=True)
     trade: Mapped[str] = mapped_column(String(50), nullable=False)
     company_name: Mapped[str | None] = mapped_column(String(200))
     headcount: Mapped[int] = mapped_column(Integer, default=0)
@@ -49,7 +50,7 @@ class DailyLogWorkItem(Base):
     __tablename__ = "daily_log_work_items"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    daily_log_id: Mapped[int] = mapped_column(ForeignKey("daily_logs.id"), nullable=False)
+    daily_log_id: Mapped[int] = mapped_column(ForeignKey("daily_logs.id"), nullable=False, index=True)
     trade: Mapped[str | None] = mapped_column(String(50))
     description: Mapped[str] = mapped_column(Text, nullable=False)
     status: Mapped[str] = mapped_column(String(20), default="completed")
@@ -58,13 +59,39 @@ class DailyLogWorkItem(Base):
     daily_log: Mapped["DailyLog"] = relationship(back_populates="work_items")
 
 
-class DailyLogPhoto(Base):
+class DailyLogPhoto(BlobRef, Base):
     __tablename__ = "daily_log_photos"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    daily_log_id: Mapped[int] = mapped_column(ForeignKey("daily_logs.id"), nullable=False)
+    daily_log_id: Mapped[int] = mapped_column(ForeignKey("daily_logs.id"), nullable=False, index=True)
     file_path: Mapped[str] = mapped_column(String(500), nullable=False)
     caption: Mapped[str | None] = mapped_column(Text)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     daily_log: Mapped["DailyLog"] = relationship(back_populates="photos")
+
+
+DailyLogPhoto.derivatives_rendered = derivatives_rendered(DailyLogPhoto.blob_sha256)
+
+_LOG_CHILDREN = (DailyLogCrew, DailyLogWorkItem, DailyLogPhoto)
+
+
+@event.listens_for(Session, "before_flush")
+def _load_deleted_log_ids(session, flush_context, instances):
+    # Deleted rows may have daily_log_id expired; load it while the row still exists
+    for obj in session.deleted:
+        if isinstance(obj, _LOG_CHILDREN):
+            obj.daily_log_id
+
+
+@event.listens_for(Session, "after_flush")
+def _touch_daily_logs(session, flush_context):
+    # Crew, work items and photos are part of a log: bump its updated_at (cached report PDFs are keyed by it)
+    ids = {
+        obj.daily_log_id for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, _LOG_CHILDREN) and obj.daily_log_id is not None
+    }
+    if ids:
+        session.connection().execute(
+            update(DailyLog.__table__).where(DailyLog.__table__.c.id.in_(ids)).values(updated_at=datetime.utcnow())
+        )
@@ -1,14 +1,15 @@
 from datetime import datetime
-from sqlalchemy import Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Boolean, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.database import Base
+from backend.models.blob import BlobRef
 
 
 class DocumentCategory(Base):
     __tablename__ = "document_categories"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False, index=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     parent_id: Mapped[int | None] = mapped_column(ForeignKey("document_categories.id"))
     sort_order: Mapped[int] = mapped_column(Integer, default=0)
@@ -17,17 +18,27 @@ class DocumentCategory(Base):
     children: Mapped[list["DocumentCategory"]] = relationship()
 
 
-class Document(Base):
+class Document(BlobRef, Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_project_created", "project_id", "created_at", "id"),
+        Index("ix_documents_project_latest", "project_id", "is_latest", "created_at", "id"),
+        Index("ix_documents_chain_version", "chain_id", "version"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
-    category_id: Mapped[int | None] = mapped_column(ForeignKey("document_categories.id"))
+    category_id: Mapped[int | None] = mapped_column(ForeignKey("document_categories.id"), index=True)
     name: Mapped[str] = mapped_column(String(300), nullable=False)
     file_path: Mapped[str] = mapped_column(String(500), nullable=False)
     file_type: Mapped[str | None] = mapped_column(String(20))
     file_size: Mapped[int | None] = mapped_column(Integer)
     version: Mapped[int] = mapped_column(Integer, default=1)
+    # Version chain: the version this one replaced; all versions of a revised document share
+    # chain_id (the first version's id, None until it is revised) and only the newest is_latest
+    parent_id: Mapped[int | None] = mapped_column(ForeignKey("documents.id"), index=True)
+    chain_id: Mapped[int | None] = mapped_column(Integer)
+    is_latest: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     description: Mapped[str | None] = mapped_column(Text)
     tags: Mapped[str | None] = mapped_column(Text)
     uploaded_by: Mapped[str | None] = mapped_column(String(200))
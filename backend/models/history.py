@@ -0,0 +1,28 @@
+from datetime import date, datetime
+from sqlalchemy import Integer, Float, Date, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from backend.database import Base
+
+
+class ProjectSnapshot(Base):
+    __tablename__ = "project_snapshots"
+    __table_args__ = (
+        Index("ix_project_snapshots_project_date", "project_id", "snapshot_date", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    snapshot_date: Mapped[date] = mapped_column(Date, nullable=False)
+    total_budget: Mapped[float] = mapped_column(Float, default=0)
+    total_committed: Mapped[float] = mapped_column(Float, default=0)
+    total_actual: Mapped[float] = mapped_column(Float, default=0)
+    total_forecast: Mapped[float] = mapped_column(Float, default=0)
+    planned_value: Mapped[float] = mapped_column(Float, default=0)
+    earned_value: Mapped[float] = mapped_column(Float, default=0)
+    spi: Mapped[float | None] = mapped_column(Float)
+    cpi: Mapped[float | None] = mapped_column(Float)
+    eac: Mapped[float] = mapped_column(Float, default=0)
+    percent_complete: Mapped[float] = mapped_column(Float, default=0)
+    first_pass_yield: Mapped[float | None] = mapped_column(Float)
+    open_punch_items: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -1,11 +1,15 @@
 from datetime import date, datetime
-from sqlalchemy import Integer, String, Float, Boolean, Date, DateTime, Text, ForeignKey
+from sqlalchemy import Integer, String, Float, Boolean, Date, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.database import Base
+from backend.models.blob import BlobRef
 
 
 class Permit(Base):
     __tablename__ = "permits"
+    __table_args__ = (
+        Index("ix_permits_project_status", "project_id", "status"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
@@ -27,11 +31,11 @@ class Permit(Base):
     fees: Mapped[list["PermitFee"]] = relationship(back_populates="permit", cascade="all, delete-orphan")
 
 
-class PermitDocument(Base):
+class PermitDocument(BlobRef, Base):
     __tablename__ = "permit_documents"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    permit_id: Mapped[int] = mapped_column(ForeignKey("permits.id"), nullable=False)
+    permit_id: Mapped[int] = mapped_column(ForeignKey("permits.id"), nullable=False, index=True)
     document_type: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str | None] = mapped_column(Text)
     is_required: Mapped[bool] = mapped_column(Boolean, default=True)
@@ -47,9 +51,12 @@ class PermitDocument(Base):
 
 class Inspection(Base):
     __tablename__ = "inspections"
+    __table_args__ = (
+        Index("ix_inspections_project_scheduled", "project_id", "scheduled_date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    permit_id: Mapped[int] = mapped_column(ForeignKey("permits.id"), nullable=False)
+    permit_id: Mapped[int] = mapped_column(ForeignKey("permits.id"), nullable=False, index=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
     inspection_type: Mapped[str] = mapped_column(String(100), nullable=False)
     scheduled_date: Mapped[date | None] = mapped_column(Date)
@@ -67,7 +74,7 @@ class PermitFee(Base):
     __tablename__ = "permit_fees"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    permit_id: Mapped[int] = mapped_column(ForeignKey("permits.id"), nullable=False)
+    permit_id: Mapped[int] = mapped_column(ForeignKey("permits.id"), nullable=False, index=True)
     fee_type: Mapped[str] = mapped_column(String(100), nullable=False)
     amount: Mapped[float] = mapped_column(Float, nullable=False)
     due_date: Mapped[date | None] = mapped_column(Date)
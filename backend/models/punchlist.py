@@ -1,14 +1,15 @@
 from datetime import date, datetime
-from sqlalchemy import Integer, String, Float, Boolean, Date, DateTime, Text, ForeignKey
+from sqlalchemy import Integer, String, Float, Boolean, Date, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.database import Base
+from backend.models.blob import derivatives_rendered
 
 
 class PunchList(Base):
     __tablename__ = "punch_lists"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False, index=True)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     walk_date: Mapped[date | None] = mapped_column(Date)
     attendees: Mapped[str | None] = mapped_column(Text)
@@ -23,9 +24,15 @@ class PunchList(Base):
 
 class PunchItem(Base):
     __tablename__ = "punch_items"
+    __blob_refs__ = ("photo_before_sha256", "photo_after_sha256")
+    __table_args__ = (
+        Index("ix_punch_items_project_status", "project_id", "status"),
+        Index("ix_punch_items_project_due", "project_id", "due_date"),
+        Index("ix_punch_items_project_created", "project_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    punch_list_id: Mapped[int] = mapped_column(ForeignKey("punch_lists.id"), nullable=False)
+    punch_list_id: Mapped[int] = mapped_column(ForeignKey("punch_lists.id"), nullable=False, index=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     location: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -40,6 +47,8 @@ class PunchItem(Base):
     due_date: Mapped[date | None] = mapped_column(Date)
     photo_before_path: Mapped[str | None] = mapped_column(String(500))
     photo_after_path: Mapped[str | None] = mapped_column(String(500))
+    photo_before_sha256: Mapped[str | None] = mapped_column(ForeignKey("blobs.sha256"), index=True)
+    photo_after_sha256: Mapped[str | None] = mapped_column(ForeignKey("blobs.sha256"), index=True)
     spec_reference: Mapped[str | None] = mapped_column(String(200))
     completed_by: Mapped[str | None] = mapped_column(String(200))
     completed_date: Mapped[date | None] = mapped_column(Date)
@@ -55,3 +64,7 @@ class PunchItem(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     punch_list: Mapped["PunchList"] = relationship(back_populates="items")
+
+
+PunchItem.photo_before_rendered = derivatives_rendered(PunchItem.photo_before_sha256)
+PunchItem.photo_after_rendered = derivatives_rendered(PunchItem.photo_after_sha256)
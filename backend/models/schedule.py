@@ -1,11 +1,14 @@
 from datetime import date, datetime
-from sqlalchemy import Integer, String, Float, Boolean, Date, DateTime, Text, ForeignKey
+from sqlalchemy import Integer, String, Float, Boolean, Date, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.database import Base
 
 
 class Activity(Base):
     __tablename__ = "activities"
+    __table_args__ = (
+        Index("ix_activities_project_status", "project_id", "status"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
@@ -40,8 +43,8 @@ class ActivityDependency(Base):
     __tablename__ = "activity_dependencies"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    activity_id: Mapped[int] = mapped_column(ForeignKey("activities.id"), nullable=False)
-    predecessor_id: Mapped[int] = mapped_column(ForeignKey("activities.id"), nullable=False)
+    activity_id: Mapped[int] = mapped_column(ForeignKey("activities.id"), nullable=False, index=True)
+    predecessor_id: Mapped[int] = mapped_column(ForeignKey("activities.id"), nullable=False, index=True)
     dependency_type: Mapped[str] = mapped_column(String(5), default="FS")
     lag_days: Mapped[int] = mapped_column(Integer, default=0)
 
@@ -53,7 +56,7 @@ class Milestone(Base):
     __tablename__ = "milestones"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False, index=True)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     target_date: Mapped[date | None] = mapped_column(Date)
     actual_date: Mapped[date | None] = mapped_column(Date)
@@ -64,6 +67,9 @@ class Milestone(Base):
 
 class Decision(Base):
     __tablename__ = "decisions"
+    __table_args__ = (
+        Index("ix_decisions_project_due", "project_id", "due_date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
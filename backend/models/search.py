@@ -0,0 +1,148 @@
+"""Full-text search index over project records.
+
+``search_index`` is not an ORM table: on SQLite it is an FTS5 virtual
+table, on PostgreSQL a table with a weighted, generated ``tsvector`` column
+and a GIN index (both created by migration 0008). Each indexed row is
+stored under ``entity_id * 8 + type code`` as its rowid / id, so an update
+or delete touches exactly one index row by primary key.
+
+The index is kept in step by a flush hook: rows of the models in
+``SEARCH_SOURCES`` that are inserted, have an indexed column changed, or are
+deleted are written to (or removed from) the index in the same transaction.
+Documents also carry the text extracted from their file (``BlobText``),
+which is added with ``reindex`` once extraction finishes. Only the latest
+version of a document is indexed; superseding one removes its entry.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import event, inspect, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from backend.models.blob import BlobText
+from backend.models.daily_log import DailyLog
+from backend.models.document import Document
+from backend.models.permit import Inspection
+from backend.models.punchlist import PunchItem
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    entity_type: str
+    code: int
+    title: Callable[[object], str]
+    body: tuple[str, ...]
+    # Other columns the entry is built from; a change to any of these or the body re-indexes the row
+    depends_on: tuple[str, ...]
+    # Further body text looked up at index time
+    extra: Callable[[Connection, object], str | None] | None = None
+    # Whether a row is searchable at all; rows failing it are kept out of the index
+    indexed: Callable[[object], bool] | None = None
+
+
+def _file_text(connection: Connection, doc: Document) -> str | None:
+    if not doc.blob_sha256:
+        return None
+    content = connection.execute(select(BlobText.content).where(BlobText.sha256 == doc.blob_sha256)).scalar()
+    return "\n".join(BlobText.decompress(content))
+
+
+SEARCH_SOURCES: dict[type, SearchSource] = {
+    Document: SearchSource(
+        "document", 1, lambda d: d.name, ("description", "tags"), ("name", "blob_sha256", "is_latest"), _file_text,
+        # Superseded versions would otherwise show up next to the current one
+        indexed=lambda d: d.is_latest is not False,
+    ),
+    DailyLog: SearchSource(
+        "daily_log", 2, lambda log: f"Daily log {log.log_date}",
+        ("work_summary", "issues", "safety_notes"), ("log_date",),
+    ),
+    PunchItem: SearchSource("punch_item", 3, lambda p: p.location, ("description",), ("location",)),
+    Inspection: SearchSource("inspection", 4, lambda i: i.inspection_type, ("notes", "corrections"), ("inspection_type",)),
+}
+
+
+def index_key(source: SearchSource, entity_id: int) -> int:
+    return entity_id * 8 + source.code
+
+
+_STATEMENTS = {
+    "sqlite": (
+        "DELETE FROM search_index WHERE rowid = :key",
+        "INSERT INTO search_index (rowid, entity_type, entity_id, project_id, title, body) "
+        "VALUES (:key, :entity_type, :entity_id, :project_id, :title, :body)",
+    ),
+    "postgresql": (
+        "DELETE FROM search_index WHERE id = :key",
+        "INSERT INTO search_index (id, entity_type, entity_id, project_id, title, body) "
+        "VALUES (:key, :entity_type, :entity_id, :project_id, :title, :body)",
+    ),
+}
+
+
+def _index_row(connection: Connection, source: SearchSource, obj) -> dict:
+    parts = [getattr(obj, field) for field in source.body]
+    if source.extra is not None:
+        parts.append(source.extra(connection, obj))
+    return {
+        "key": index_key(source, obj.id),
+        "entity_type": source.entity_type,
+        "entity_id": obj.id,
+        "project_id": obj.project_id,
+        "title": source.title(obj) or "",
+        "body": "\n".join(part for part in parts if part),
+    }
+
+
+def _indexed(source: SearchSource, obj) -> bool:
+    return source.indexed is None or source.indexed(obj)
+
+
+def _changed(source: SearchSource, obj) -> bool:
+    attrs = inspect(obj).attrs
+    return any(attrs[f].history.has_changes() for f in ("project_id", *source.depends_on, *source.body))
+
+
+def _write(connection: Connection, stale: list[dict], fresh: list[dict]) -> None:
+    statements = _STATEMENTS.get(connection.dialect.name)
+    if statements is None:
+        return
+    delete, insert = statements
+    if stale:
+        connection.execute(text(delete), stale)
+    if fresh:
+        connection.execute(text(insert), fresh)
+
+
+def reindex(session: Session, objs) -> None:
+    """Rewrite the index entries of objs (for changes the flush hook cannot see, like extracted text or bulk updates)."""
+    connection = session.connection()
+    sources = [(SEARCH_SOURCES[type(obj)], obj) for obj in objs]
+    _write(
+        connection,
+        [{"key": index_key(source, obj.id)} for source, obj in sources],
+        [_index_row(connection, source, obj) for source, obj in sources if _indexed(source, obj)],
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _update_search_index(session, flush_context):
+    # new/dirty/deleted and attribute history still show the pre-flush state here
+    changed = [
+        (source, obj) for obj in session.dirty
+        if (source := SEARCH_SOURCES.get(type(obj))) is not None and _changed(source, obj)
+    ]
+    added = [(source, obj) for obj in session.new if (source := SEARCH_SOURCES.get(type(obj))) is not None]
+    stale = [
+        {"key": index_key(source, obj.id)} for obj in session.deleted
+        if (source := SEARCH_SOURCES.get(type(obj))) is not None
+    ]
+    if not (stale or changed or added):
+        return
+    connection = session.connection()
+    stale += [{"key": index_key(source, obj.id)} for source, obj in changed]
+    _write(connection, stale, [
+        _index_row(connection, source, obj) for source, obj in changed + added if _indexed(source, obj)
+    ])
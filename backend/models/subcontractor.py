@@ -1,11 +1,15 @@
 from datetime import date, datetime
-from sqlalchemy import Integer, String, Float, Date, DateTime, Text, ForeignKey
+from sqlalchemy import Integer, String, Float, Date, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.database import Base
+from backend.models.blob import BlobRef
 
 
 class Subcontractor(Base):
     __tablename__ = "subcontractors"
+    __table_args__ = (
+        Index("ix_subcontractors_project_status", "project_id", "status"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
@@ -30,6 +34,10 @@ class Subcontractor(Base):
 
 class SubcontractorPayment(Base):
     __tablename__ = "subcontractor_payments"
+    __table_args__ = (
+        Index("ix_subcontractor_payments_project_status", "project_id", "status"),
+        Index("ix_subcontractor_payments_sub_created", "subcontractor_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     subcontractor_id: Mapped[int] = mapped_column(ForeignKey("subcontractors.id"), nullable=False)
@@ -51,11 +59,11 @@ class SubcontractorPayment(Base):
     lien_waiver: Mapped["LienWaiver | None"] = relationship(back_populates="payment", uselist=False, cascade="all, delete-orphan")
 
 
-class LienWaiver(Base):
+class LienWaiver(BlobRef, Base):
     __tablename__ = "lien_waivers"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    payment_id: Mapped[int] = mapped_column(ForeignKey("subcontractor_payments.id"), nullable=False)
+    payment_id: Mapped[int] = mapped_column(ForeignKey("subcontractor_payments.id"), nullable=False, index=True)
     waiver_type: Mapped[str] = mapped_column(String(30), nullable=False)
     through_date: Mapped[date | None] = mapped_column(Date)
     amount: Mapped[float | None] = mapped_column(Float)
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from backend.database import get_db
+from pathlib import Path
+import pandas as pd
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File, Form
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, select
+from backend.database import get_db, get_async_db
 from backend.models.budget import BudgetCategory, BudgetItem, CostEntry, ChangeOrder, Bid
 from backend.schemas.budget import (
     BudgetCategoryCreate, BudgetCategoryRead,
@@ -9,11 +12,14 @@ from backend.schemas.budget import (
     BidCreate, BidUpdate, BidRead,
     CostEntryCreate, CostEntryRead,
     ChangeOrderCreate, ChangeOrderUpdate, ChangeOrderRead,
-    BudgetSummary, CostSuggestionRead
+    BudgetSummary, CostSuggestionRead, EstimateResult
 )
-from backend.schemas.analytics import BudgetVarianceResult, CashFlowResult
+from backend.schemas.analytics import BudgetVarianceResult, CashFlowResult, BidLevelingResult
 from backend.services.analytics import run_budget_variance, run_cash_flow_forecast
 from backend.services.costs import CostService
+from backend.utils.file_storage import check_upload_size
+from backend.utils.pagination import PageParams, page_params, keyset_page
+from backend.services.bid_leveling import run_bid_leveling, invalidate_bid_leveling
 
 router = APIRouter()
 
@@ -32,11 +38,46 @@ def suggest_budget(project_id: int, category_id: int, db: Session = Depends(get_
     return CostService.get_suggestions(cat.code, state=project.state, city=project.city)
 
 
-@router.get("/projects/{project_id}/budget/summary", response_model=BudgetSummary)
-def budget_summary(project_id: int, db: Session = Depends(get_db)):
+@router.post("/projects/{project_id}/budget/estimate", response_model=EstimateResult)
+def estimate_from_takeoff(
+    project_id: int,
+    file: UploadFile = File(...),
+    code_column: str = Form("work_item_code"),
+    quantity_column: str = Form("quantity"),
+    region: str | None = Form(None),
+    db: Session = Depends(get_db),
+):
+    """Price an uploaded quantity takeoff (CSV or Excel) against the CWICR catalog."""
     from backend.models.project import Project
     project = db.query(Project).filter(Project.id == project_id).first()
-    items = db.query(BudgetItem).filter(BudgetItem.project_id == project_id).all()
+    if not project:
+        raise HTTPException(404, "Project not found")
+
+    check_upload_size(file, "takeoffs")
+    suffix = Path(file.filename or "").suffix.lower()
+    try:
+        if suffix in (".xlsx", ".xls"):
+            qto = pd.read_excel(file.file, dtype={code_column: str})
+        else:
+            qto = pd.read_csv(file.file, dtype={code_column: str})
+    except Exception:
+        raise HTTPException(400, "Could not parse takeoff file")
+    missing = [c for c in (code_column, quantity_column) if c not in qto.columns]
+    if missing:
+        raise HTTPException(400, f"Takeoff is missing column(s): {', '.join(missing)}")
+
+    region = region or project.state
+    lines = CostService.estimate_takeoff(qto, code_column, quantity_column, region)
+    if lines is None:
+        raise HTTPException(503, "Cost database not configured")
+    return EstimateResult(region=region, **CostService.summarize_estimate(lines))
+
+
+@router.get("/projects/{project_id}/budget/summary", response_model=BudgetSummary)
+async def budget_summary(project_id: int, db: AsyncSession = Depends(get_async_db)):
+    from backend.models.project import Project
+    project = await db.get(Project, project_id)
+    items = (await db.scalars(select(BudgetItem).where(BudgetItem.project_id == project_id))).all()
     total_budget = sum(i.current_budget for i in items) or (project.total_budget if project else 0)
     total_committed = sum(i.committed_cost for i in items)
     total_actual = sum(i.actual_cost for i in items)
@@ -44,7 +85,9 @@ def budget_summary(project_id: int, db: Session = Depends(get_db)):
     variance = total_budget - total_forecast
     variance_pct = (variance / total_budget * 100) if total_budget else 0
 
-    cats = db.query(BudgetCategory).filter(BudgetCategory.project_id == project_id).order_by(BudgetCategory.sort_order).all()
+    cats = (await db.scalars(
+        select(BudgetCategory).where(BudgetCategory.project_id == project_id).order_by(BudgetCategory.sort_order)
+    )).all()
     cat_data = []
     for c in cats:
         c_items = [i for i in items if i.category_id == c.id]
@@ -88,11 +131,18 @@ def delete_category(project_id: int, cat_id: int, db: Session = Depends(get_db))
 
 
 @router.get("/projects/{project_id}/budget/items", response_model=list[BudgetItemRead])
-def list_items(project_id: int, category_id: int | None = Query(None), db: Session = Depends(get_db)):
-    q = db.query(BudgetItem).filter(BudgetItem.project_id == project_id)
+def list_items(
+    project_id: int,
+    response: Response,
+    category_id: int | None = Query(None),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    # Bids are part of the read schema; load them for the whole page at once
+    q = db.query(BudgetItem).options(selectinload(BudgetItem.bids)).filter(BudgetItem.project_id == project_id)
     if category_id:
         q = q.filter(BudgetItem.category_id == category_id)
-    return q.all()
+    return keyset_page(q, [BudgetItem.id], page, response, descending=False)
 
 
 @router.post("/projects/{project_id}/budget/items", response_model=BudgetItemRead, status_code=201)
@@ -142,8 +192,11 @@ def add_cost_entry(project_id: int, item_id: int, data: CostEntryCreate, db: Ses
 
 
 @router.get("/projects/{project_id}/budget/change-orders", response_model=list[ChangeOrderRead])
-def list_change_orders(project_id: int, db: Session = Depends(get_db)):
-    return db.query(ChangeOrder).filter(ChangeOrder.project_id == project_id).all()
+def list_change_orders(
+    project_id: int, response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_db),
+):
+    q = db.query(ChangeOrder).filter(ChangeOrder.project_id == project_id)
+    return keyset_page(q, [ChangeOrder.id], page, response, descending=False)
 
 
 @router.post("/projects/{project_id}/budget/change-orders", response_model=ChangeOrderRead, status_code=201)
@@ -187,6 +240,11 @@ def cashflow_forecast(project_id: int, db: Session = Depends(get_db)):
 
 
 # Bid Management (Bid Leveling)
+@router.get("/projects/{project_id}/budget/bid-leveling", response_model=BidLevelingResult)
+def bid_leveling_report(project_id: int, db: Session = Depends(get_db)):
+    return run_bid_leveling(db, project_id)
+
+
 @router.get("/projects/{project_id}/budget/items/{item_id}/bids", response_model=list[BidRead])
 def list_bids(project_id: int, item_id: int, db: Session = Depends(get_db)):
     return db.query(Bid).filter(Bid.project_id == project_id, Bid.budget_item_id == item_id).all()
@@ -197,6 +255,7 @@ def create_bid(project_id: int, item_id: int, data: BidCreate, db: Session = Dep
     bid = Bid(project_id=project_id, **data.model_dump())
     db.add(bid)
     db.commit()
+    invalidate_bid_leveling(project_id)
     db.refresh(bid)
     return bid
 
@@ -215,6 +274,7 @@ def update_bid(project_id: int, bid_id: int, data: BidUpdate, db: Session = Depe
     for key, val in update_data.items():
         setattr(bid, key, val)
     db.commit()
+    invalidate_bid_leveling(project_id)
     db.refresh(bid)
     return bid
 
@@ -226,3 +286,4 @@ def delete_bid(project_id: int, bid_id: int, db: Session = Depends(get_db)):
         raise HTTPException(404, "Bid not found")
     db.delete(bid)
     db.commit()
+    invalidate_bid_leveling(project_id)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, HTTPException, Query
+from backend.schemas.budget import CostItemRead, CostItemMatch
+from backend.services.costs import CostService
+
+router = APIRouter()
+
+
+@router.get("/costs/search", response_model=list[CostItemMatch])
+def search_cost_items(q: str = Query(..., min_length=2), limit: int = Query(10, ge=1, le=100)):
+    return CostService.search_work_items(q, limit)
+
+
+@router.get("/costs/items/{work_item_code}", response_model=CostItemRead)
+def get_cost_item(work_item_code: str, region: str | None = Query(None)):
+    item = CostService.get_unit_cost(work_item_code, region)
+    if not item:
+        raise HTTPException(404, "Work item not found in cost database")
+    return item
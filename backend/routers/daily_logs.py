@@ -1,20 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
+from datetime import date
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, UploadFile, File
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, selectinload
 from backend.database import get_db
 from backend.models.daily_log import DailyLog, DailyLogCrew, DailyLogWorkItem, DailyLogPhoto
 from backend.schemas.daily_log import (
     DailyLogCreate, DailyLogUpdate, DailyLogRead, DailyLogDetail,
     CrewEntryCreate, CrewEntryRead,
     WorkItemCreate, WorkItemRead,
+    LogPhotoRead,
+    DailyReportRequest, DailyReportJobRead,
 )
-from backend.utils.file_storage import save_upload
+from backend.services import daily_reports
+from backend.services.images import generate_derivatives
+from backend.utils.downloads import stored_download
+from backend.utils.file_storage import save_upload, attach_blob
+from backend.utils.pagination import PageParams, page_params, keyset_page
+from backend.utils.fieldsets import sparse_fields, load_fields, fields_response
 
 router = APIRouter()
 
+# Child collections of DailyLogDetail, each loaded for a whole page of logs in one query
+DETAIL_OPTIONS = (
+    selectinload(DailyLog.crew_entries),
+    selectinload(DailyLog.work_items),
+    selectinload(DailyLog.photos),
+)
+
+
+def _get_detail(db: Session, project_id: int, log_id: int) -> DailyLog | None:
+    return db.query(DailyLog).options(*DETAIL_OPTIONS).filter(
+        DailyLog.id == log_id, DailyLog.project_id == project_id,
+    ).first()
+
 
 @router.get("/projects/{project_id}/daily-logs", response_model=list[DailyLogRead])
-def list_logs(project_id: int, db: Session = Depends(get_db)):
-    return db.query(DailyLog).filter(DailyLog.project_id == project_id).order_by(DailyLog.log_date.desc()).all()
+def list_logs(
+    project_id: int,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: list[str] | None = Depends(sparse_fields(DailyLogRead)),
+    db: Session = Depends(get_db),
+):
+    keys = [DailyLog.log_date, DailyLog.id]
+    q = load_fields(db.query(DailyLog).filter(DailyLog.project_id == project_id), DailyLog, fields, keys)
+    rows = keyset_page(q, keys, page, response)
+    return fields_response(rows, fields, response) if fields else rows
+
+
+# Declared before /daily-logs/{log_id}, which would otherwise match "expanded"
+@router.get("/projects/{project_id}/daily-logs/expanded", response_model=list[DailyLogDetail])
+def list_logs_expanded(
+    project_id: int,
+    response: Response,
+    start: date | None = Query(None),
+    end: date | None = Query(None),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    """Logs with crew, work items and photos, newest first (optionally from start to end)."""
+    q = db.query(DailyLog).options(*DETAIL_OPTIONS).filter(DailyLog.project_id == project_id)
+    if start:
+        q = q.filter(DailyLog.log_date >= start)
+    if end:
+        q = q.filter(DailyLog.log_date <= end)
+    return keyset_page(q, [DailyLog.log_date, DailyLog.id], page, response)
 
 
 @router.post("/projects/{project_id}/daily-logs", response_model=DailyLogDetail, status_code=201)
@@ -23,18 +73,18 @@ def create_log(project_id: int, data: DailyLogCreate, db: Session = Depends(get_
     log = DailyLog(project_id=project_id, **d)
     db.add(log)
     db.flush()
-    for crew in data.crew_entries:
-        db.add(DailyLogCrew(daily_log_id=log.id, **crew.model_dump()))
-    for wi in data.work_items:
-        db.add(DailyLogWorkItem(daily_log_id=log.id, **wi.model_dump()))
+    # One multi-row INSERT per child table
+    if data.crew_entries:
+        db.execute(insert(DailyLogCrew), [{"daily_log_id": log.id, **crew.model_dump()} for crew in data.crew_entries])
+    if data.work_items:
+        db.execute(insert(DailyLogWorkItem), [{"daily_log_id": log.id, **wi.model_dump()} for wi in data.work_items])
     db.commit()
-    db.refresh(log)
-    return log
+    return _get_detail(db, project_id, log.id)
 
 
 @router.get("/projects/{project_id}/daily-logs/{log_id}", response_model=DailyLogDetail)
 def get_log(project_id: int, log_id: int, db: Session = Depends(get_db)):
-    log = db.query(DailyLog).filter(DailyLog.id == log_id, DailyLog.project_id == project_id).first()
+    log = _get_detail(db, project_id, log_id)
     if not log:
         raise HTTPException(404, "Daily log not found")
     return log
@@ -79,12 +129,51 @@ def add_work_item(project_id: int, log_id: int, data: WorkItemCreate, db: Sessio
     return wi
 
 
-@router.post("/projects/{project_id}/daily-logs/{log_id}/photos", status_code=201)
-async def add_photo(project_id: int, log_id: int, file: UploadFile = File(...), caption: str = "", db: Session = Depends(get_db)):
-    contents = await file.read()
-    path = save_upload(contents, file.filename or "photo.jpg", "photos")
-    photo = DailyLogPhoto(daily_log_id=log_id, file_path=path, caption=caption)
+@router.post("/projects/{project_id}/daily-logs/{log_id}/photos", response_model=LogPhotoRead, status_code=201)
+async def add_photo(
+    project_id: int,
+    log_id: int,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    caption: str = "",
+    db: Session = Depends(get_db),
+):
+    blob = await save_upload(db, file, "photos", "photo.jpg")
+    photo = DailyLogPhoto(daily_log_id=log_id, caption=caption)
+    attach_blob(photo, blob)
     db.add(photo)
     db.commit()
     db.refresh(photo)
-    return {"id": photo.id, "file_path": photo.file_path, "caption": photo.caption}
+    background_tasks.add_task(generate_derivatives, blob.sha256, blob.file_path)
+    return photo
+
+
+@router.post("/projects/{project_id}/daily-reports", response_model=DailyReportJobRead, status_code=202)
+def request_daily_reports(
+    project_id: int, data: DailyReportRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db),
+):
+    """Start rendering daily report PDFs; poll the returned job, then download it."""
+    job = daily_reports.request_reports(db, project_id, data.log_ids, data.month, data.format)
+    if job is None:
+        raise HTTPException(404, "Daily log not found")
+    if job.status == "pending":
+        background_tasks.add_task(daily_reports.run_job, job)
+    return job
+
+
+@router.get("/projects/{project_id}/daily-reports/{job_id}", response_model=DailyReportJobRead)
+def get_daily_report_job(project_id: int, job_id: str):
+    job = daily_reports.get_job(project_id, job_id)
+    if not job:
+        raise HTTPException(404, "Report job not found")
+    return job
+
+
+@router.get("/projects/{project_id}/daily-reports/{job_id}/download")
+def download_daily_report(project_id: int, job_id: str, request: Request):
+    job = daily_reports.get_job(project_id, job_id)
+    if not job:
+        raise HTTPException(404, "Report job not found")
+    if job.status != "done":
+        raise HTTPException(409, f"Report is {job.status}")
+    return stored_download(request, job.key, job.filename)
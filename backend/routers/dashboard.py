@@ -1,9 +1,11 @@
+import asyncio
 from datetime import date, timedelta
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 import requests
-from backend.database import get_db
+from backend.database import get_db, get_async_db
 from backend.config import settings
 from backend.models.project import Project
 from backend.models.budget import BudgetItem
@@ -16,9 +18,11 @@ from backend.schemas.dashboard import (
     DashboardSummary, BudgetSummaryCard, ScheduleSummaryCard,
     AlertItem, DeadlineItem, ActivityFeedItem, WeatherData,
 )
-from backend.schemas.analytics import KPIResult
+from backend.schemas.analytics import KPIResult, EarnedValueResult, TrendResult
 from backend.schemas.notifications import NotificationList
 from backend.services.analytics import run_kpi_analysis
+from backend.services.earned_value import run_earned_value
+from backend.services.snapshots import get_trends, record_snapshot
 from backend.services.notifications import generate_notifications
 
 router = APIRouter()
@@ -45,13 +49,16 @@ def _get_weather() -> WeatherData | None:
 
 
 @router.get("/projects/{project_id}/dashboard/summary", response_model=DashboardSummary)
-def dashboard_summary(project_id: int, db: Session = Depends(get_db)):
-    project = db.query(Project).filter(Project.id == project_id).first()
+async def dashboard_summary(project_id: int, db: AsyncSession = Depends(get_async_db)):
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(404, "Project not found")
 
+    # Weather is a blocking HTTP call; fetch it off the event loop while the queries run
+    weather_task = asyncio.create_task(asyncio.to_thread(_get_weather))
+
     # Budget
-    items = db.query(BudgetItem).filter(BudgetItem.project_id == project_id).all()
+    items = (await db.scalars(select(BudgetItem).where(BudgetItem.project_id == project_id))).all()
     total_budget = sum(i.current_budget for i in items) or project.total_budget
     total_spent = sum(i.actual_cost for i in items)
     total_committed = sum(i.committed_cost for i in items)
@@ -65,7 +72,9 @@ def dashboard_summary(project_id: int, db: Session = Depends(get_db)):
     )
 
     # Schedule
-    acts = db.query(Activity).filter(Activity.project_id == project_id).all()
+    acts = (await db.execute(
+        select(Activity.status, Activity.is_critical).where(Activity.project_id == project_id)
+    )).all()
     total_acts = len(acts)
     completed_acts = sum(1 for a in acts if a.status == "completed")
     pct_complete = round(completed_acts / total_acts * 100, 1) if total_acts else 0
@@ -81,11 +90,11 @@ def dashboard_summary(project_id: int, db: Session = Depends(get_db)):
     # Alerts
     alerts: list[AlertItem] = []
     today = date.today()
-    overdue_punch = db.query(PunchItem).filter(
+    overdue_punch = await db.scalar(select(func.count(PunchItem.id)).where(
         PunchItem.project_id == project_id,
         PunchItem.due_date < today,
         PunchItem.status.notin_(["Verified", "Completed"]),
-    ).count()
+    ))
     if overdue_punch:
         alerts.append(AlertItem(module="punchlist", severity="warning",
                                 message=f"{overdue_punch} overdue punch items", entity_type="punch_item"))
@@ -95,23 +104,23 @@ def dashboard_summary(project_id: int, db: Session = Depends(get_db)):
         alerts.append(AlertItem(module="budget", severity="critical",
                                 message=f"{len(over_budget)} budget items over budget", entity_type="budget_item"))
 
-    expiring = db.query(Permit).filter(
+    expiring = await db.scalar(select(func.count(Permit.id)).where(
         Permit.project_id == project_id,
         Permit.expiry_date.isnot(None),
         Permit.expiry_date <= today + timedelta(days=30),
-    ).count()
+    ))
     if expiring:
         alerts.append(AlertItem(module="permits", severity="warning",
                                 message=f"{expiring} permits expiring within 30 days", entity_type="permit"))
 
     # Deadlines
     deadlines: list[DeadlineItem] = []
-    upcoming_insp = db.query(Inspection).filter(
+    upcoming_insp = (await db.scalars(select(Inspection).where(
         Inspection.project_id == project_id,
         Inspection.scheduled_date >= today,
         Inspection.scheduled_date <= today + timedelta(days=14),
         Inspection.result.is_(None),
-    ).all()
+    ))).all()
     for insp in upcoming_insp:
         days_until = (insp.scheduled_date - today).days
         deadlines.append(DeadlineItem(
@@ -120,12 +129,12 @@ def dashboard_summary(project_id: int, db: Session = Depends(get_db)):
             entity_type="inspection", entity_id=insp.id,
         ))
 
-    upcoming_ms = db.query(Milestone).filter(
+    upcoming_ms = (await db.scalars(select(Milestone).where(
         Milestone.project_id == project_id,
         Milestone.target_date >= today,
         Milestone.target_date <= today + timedelta(days=14),
         Milestone.status == "upcoming",
-    ).all()
+    ))).all()
     for ms in upcoming_ms:
         days_until = (ms.target_date - today).days
         deadlines.append(DeadlineItem(
@@ -137,9 +146,10 @@ def dashboard_summary(project_id: int, db: Session = Depends(get_db)):
     deadlines.sort(key=lambda x: x.days_until)
 
     # Recent activity
-    logs = db.query(ActivityLog).filter(ActivityLog.project_id == project_id).order_by(
-        ActivityLog.created_at.desc()
-    ).limit(10).all()
+    logs = (await db.scalars(
+        select(ActivityLog).where(ActivityLog.project_id == project_id)
+        .order_by(ActivityLog.created_at.desc()).limit(10)
+    )).all()
     recent = [
         ActivityFeedItem(
             module=log.module, action=log.action,
@@ -148,7 +158,7 @@ def dashboard_summary(project_id: int, db: Session = Depends(get_db)):
         for log in logs
     ]
 
-    weather = _get_weather()
+    weather = await weather_task
 
     return DashboardSummary(
         project_name=project.name, project_status=project.status,
@@ -166,11 +176,37 @@ def get_weather(project_id: int):
     return w
 
 
+# The analytics endpoints stay sync: their time goes to pandas/numpy, which
+# would block the event loop, and they run in the threadpool instead.
 @router.get("/projects/{project_id}/dashboard/kpis", response_model=KPIResult)
 def get_kpis(project_id: int, db: Session = Depends(get_db)):
     return run_kpi_analysis(db, project_id)
 
 
+@router.get("/projects/{project_id}/dashboard/earned-value", response_model=EarnedValueResult)
+def get_earned_value(project_id: int, db: Session = Depends(get_db)):
+    return run_earned_value(db, project_id)
+
+
+@router.get("/projects/{project_id}/dashboard/trends", response_model=TrendResult)
+def get_project_trends(
+    project_id: int,
+    start: date | None = Query(None),
+    end: date | None = Query(None),
+    points: int = Query(200, ge=2, le=2000),
+    db: Session = Depends(get_db),
+):
+    return get_trends(db, project_id, start, end, points)
+
+
+@router.post("/projects/{project_id}/dashboard/snapshots", status_code=201)
+def take_snapshot(project_id: int, db: Session = Depends(get_db)):
+    if db.get(Project, project_id) is None:
+        raise HTTPException(404, "Project not found")
+    snap = record_snapshot(db, project_id)
+    return {"project_id": project_id, "snapshot_date": str(snap.snapshot_date)}
+
+
 @router.get("/projects/{project_id}/notifications", response_model=NotificationList)
 def get_notifications(project_id: int, db: Session = Depends(get_db)):
     return generate_notifications(db, project_id)
@@ -1,14 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, UploadFile, File, Form
 from sqlalchemy.orm import Session
+import os
 from pathlib import Path
 from backend.database import get_db
+from backend.models.blob import Blob, BlobText
 from backend.models.document import DocumentCategory, Document
 from backend.schemas.document import (
     DocumentCategoryCreate, DocumentCategoryRead,
-    DocumentRead,
+    DocumentRead, DocumentText, DocumentTextPage,
 )
-from backend.utils.file_storage import save_upload
+from backend.services.document_versions import (
+    chain_id, compress_superseded, latest_version, supersede, unlink_version, version_history,
+)
+from backend.services.text_extraction import can_extract, extract_blob_text
+from backend.utils.downloads import stored_download, zip_stream
+from backend.utils.file_storage import save_upload, attach_blob
+from backend.utils.pagination import PageParams, page_params, keyset_page
+from backend.utils.fieldsets import sparse_fields, load_fields, fields_response
 
 router = APIRouter()
 
@@ -27,17 +35,61 @@ def create_category(project_id: int, data: DocumentCategoryCreate, db: Session =
     return cat
 
 
+@router.get("/projects/{project_id}/documents/categories/{category_id}/zip")
+def download_category_zip(project_id: int, category_id: int, db: Session = Depends(get_db)):
+    """Every document in a category and its subcategories (as folders), streamed as one ZIP."""
+    categories = {c.id: c for c in db.query(DocumentCategory).filter(DocumentCategory.project_id == project_id)}
+    if category_id not in categories:
+        raise HTTPException(404, "Category not found")
+    folders = {category_id: ""}
+    pending = [category_id]
+    while pending:
+        parent = pending.pop()
+        for c in categories.values():
+            if c.parent_id == parent and c.id not in folders:
+                folders[c.id] = f"{folders[parent]}{c.name}/"
+                pending.append(c.id)
+    docs = db.query(
+        Document.id, Document.name, Document.file_path, Document.category_id, Blob.content_encoding,
+    ).outerjoin(Blob, Blob.sha256 == Document.blob_sha256).filter(
+        Document.project_id == project_id, Document.category_id.in_(folders), Document.is_latest.is_(True),
+    ).order_by(Document.category_id, Document.name, Document.id).all()
+
+    entries, seen = [], set()
+    for doc in docs:
+        name = folders[doc.category_id] + _download_name(doc, doc.content_encoding).replace("/", "_")
+        if name in seen:
+            stem, ext = os.path.splitext(name)
+            name = f"{stem} ({doc.id}){ext}"
+        seen.add(name)
+        entries.append((name, doc.file_path, doc.content_encoding))
+    return zip_stream(entries, f"{categories[category_id].name}.zip")
+
+
 @router.get("/projects/{project_id}/documents", response_model=list[DocumentRead])
-def list_documents(project_id: int, category_id: int | None = None, db: Session = Depends(get_db)):
+def list_documents(
+    project_id: int,
+    response: Response,
+    category_id: int | None = None,
+    history: bool = Query(False, description="Include superseded versions"),
+    page: PageParams = Depends(page_params),
+    fields: list[str] | None = Depends(sparse_fields(DocumentRead)),
+    db: Session = Depends(get_db),
+):
+    keys = [Document.created_at, Document.id]
     q = db.query(Document).filter(Document.project_id == project_id)
+    if not history:
+        q = q.filter(Document.is_latest.is_(True))
     if category_id is not None:
         q = q.filter(Document.category_id == category_id)
-    return q.order_by(Document.created_at.desc()).all()
+    rows = keyset_page(load_fields(q, Document, fields, keys), keys, page, response)
+    return fields_response(rows, fields, response) if fields else rows
 
 
 @router.post("/projects/{project_id}/documents", response_model=DocumentRead, status_code=201)
 async def upload_document(
     project_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     name: str = Form(""),
     category_id: int | None = Form(None),
@@ -45,21 +97,68 @@ async def upload_document(
     tags: str = Form(""),
     db: Session = Depends(get_db),
 ):
-    contents = await file.read()
-    path = save_upload(contents, file.filename or "file", "documents")
+    blob = await save_upload(db, file, "documents")
     doc_name = name or file.filename or "Untitled"
     ext = Path(file.filename or "").suffix.lstrip(".") if file.filename else None
     doc = Document(
-        project_id=project_id, name=doc_name, file_path=path,
-        file_type=ext, file_size=len(contents),
+        project_id=project_id, name=doc_name,
+        file_type=ext, file_size=blob.size,
         category_id=category_id, description=description, tags=tags,
     )
+    attach_blob(doc, blob)
     db.add(doc)
     db.commit()
     db.refresh(doc)
+    background_tasks.add_task(extract_blob_text, blob.sha256)
     return doc
 
 
+@router.post("/projects/{project_id}/documents/{doc_id}/versions", response_model=DocumentRead, status_code=201)
+async def upload_document_version(
+    project_id: int,
+    doc_id: int,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    name: str = Form(""),
+    description: str = Form(""),
+    tags: str = Form(""),
+    db: Session = Depends(get_db),
+):
+    """Upload a new version of a document; it replaces the latest version of the document's chain."""
+    doc = db.query(Document).filter(Document.id == doc_id, Document.project_id == project_id).first()
+    if not doc:
+        raise HTTPException(404, "Document not found")
+    latest = latest_version(db, doc)
+    chain = chain_id(latest)
+    blob = await save_upload(db, file, "documents")
+    if not supersede(db, latest):
+        db.rollback()
+        raise HTTPException(409, "Document was revised concurrently; reload and try again")
+    ext = Path(file.filename).suffix.lstrip(".") if file.filename else latest.file_type
+    version = Document(
+        project_id=project_id, name=name or latest.name,
+        file_type=ext, file_size=blob.size, category_id=latest.category_id,
+        description=description or latest.description, tags=tags or latest.tags,
+        version=latest.version + 1, parent_id=latest.id, chain_id=chain,
+    )
+    attach_blob(version, blob)
+    db.add(version)
+    db.commit()
+    db.refresh(version)
+    background_tasks.add_task(extract_blob_text, blob.sha256)
+    background_tasks.add_task(compress_superseded, latest.blob_sha256)
+    return version
+
+
+@router.get("/projects/{project_id}/documents/{doc_id}/versions", response_model=list[DocumentRead])
+def list_document_versions(project_id: int, doc_id: int, db: Session = Depends(get_db)):
+    """Every version of a document, newest first."""
+    doc = db.query(Document).filter(Document.id == doc_id, Document.project_id == project_id).first()
+    if not doc:
+        raise HTTPException(404, "Document not found")
+    return version_history(db, doc)
+
+
 @router.get("/projects/{project_id}/documents/{doc_id}", response_model=DocumentRead)
 def get_document(project_id: int, doc_id: int, db: Session = Depends(get_db)):
     doc = db.query(Document).filter(Document.id == doc_id, Document.project_id == project_id).first()
@@ -69,14 +168,45 @@ def get_document(project_id: int, doc_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/projects/{project_id}/documents/{doc_id}/download")
-def download_document(project_id: int, doc_id: int, db: Session = Depends(get_db)):
+def download_document(project_id: int, doc_id: int, request: Request, inline: bool = False, db: Session = Depends(get_db)):
+    row = db.query(Document, Blob.content_encoding).outerjoin(Blob, Blob.sha256 == Document.blob_sha256).filter(
+        Document.id == doc_id, Document.project_id == project_id
+    ).first()
+    if not row:
+        raise HTTPException(404, "Document not found")
+    doc, encoding = row
+    return stored_download(
+        request, doc.file_path, _download_name(doc, encoding), doc.blob_sha256, inline=inline, content_encoding=encoding,
+    )
+
+
+@router.get("/projects/{project_id}/documents/{doc_id}/text", response_model=DocumentText)
+def get_document_text(
+    project_id: int,
+    doc_id: int,
+    page: int | None = Query(None, ge=1, description="Only this page (1-based)"),
+    db: Session = Depends(get_db),
+):
+    """Text extracted from the document's file, by page (status "pending" until extraction has run)."""
     doc = db.query(Document).filter(Document.id == doc_id, Document.project_id == project_id).first()
     if not doc:
         raise HTTPException(404, "Document not found")
-    p = Path(doc.file_path)
-    if not p.exists():
-        raise HTTPException(404, "File not found on disk")
-    return FileResponse(str(p), filename=doc.name)
+    text = db.get(BlobText, doc.blob_sha256) if doc.blob_sha256 else None
+    if text is None:
+        return DocumentText(status="pending" if can_extract(doc.file_path) else "unsupported")
+    pages = [DocumentTextPage(page=n, text=t) for n, t in enumerate(text.pages, start=1)]
+    if page is not None:
+        if page > text.page_count:
+            raise HTTPException(404, "Page not found")
+        pages = pages[page - 1:page]
+    return DocumentText(status=text.status, page_count=text.page_count, pages=pages)
+
+
+def _download_name(doc: Document, content_encoding: str | None = None) -> str:
+    """Document name with its file extension, as saved by the client."""
+    # Compressed blobs are stored as <key>.gz
+    suffix = Path(doc.file_path.removesuffix(".gz") if content_encoding else doc.file_path).suffix
+    return doc.name if not suffix or doc.name.lower().endswith(suffix.lower()) else doc.name + suffix
 
 
 @router.delete("/projects/{project_id}/documents/{doc_id}", status_code=204)
@@ -84,5 +214,6 @@ def delete_document(project_id: int, doc_id: int, db: Session = Depends(get_db))
     doc = db.query(Document).filter(Document.id == doc_id, Document.project_id == project_id).first()
     if not doc:
         raise HTTPException(404, "Document not found")
+    unlink_version(db, doc)
     db.delete(doc)
     db.commit()
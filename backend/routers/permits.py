@@ -1,5 +1,5 @@
 from datetime import date, timedelta
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
 from backend.database import get_db
 from backend.models.permit import Permit, PermitDocument, Inspection, PermitFee
@@ -9,6 +9,7 @@ from backend.schemas.permit import (
     InspectionCreate, InspectionUpdate, InspectionRead,
     PermitFeeCreate, PermitFeeUpdate, PermitFeeRead,
 )
+from backend.utils.file_storage import save_upload, attach_blob
 
 router = APIRouter()
 
@@ -27,6 +28,37 @@ def create_permit(project_id: int, data: PermitCreate, db: Session = Depends(get
     return permit
 
 
+@router.get("/projects/{project_id}/permits/alerts")
+def permit_alerts(project_id: int, db: Session = Depends(get_db)):
+    today = date.today()
+    alerts = []
+    permits = db.query(Permit).filter(Permit.project_id == project_id).all()
+    for p in permits:
+        if p.expiry_date:
+            days_until = (p.expiry_date - today).days
+            if days_until <= 30:
+                severity = "critical" if days_until <= 7 else "warning"
+                alerts.append({
+                    "permit_id": p.id, "permit_type": p.permit_type,
+                    "message": f"Permit expires in {days_until} days",
+                    "severity": severity, "days_until": days_until,
+                })
+    inspections = db.query(Inspection).filter(
+        Inspection.project_id == project_id, Inspection.result.is_(None)
+    ).all()
+    for i in inspections:
+        if i.scheduled_date:
+            days_until = (i.scheduled_date - today).days
+            if days_until <= 7:
+                alerts.append({
+                    "permit_id": i.permit_id, "inspection_id": i.id,
+                    "message": f"{i.inspection_type} inspection in {days_until} days",
+                    "severity": "info" if days_until > 1 else "warning",
+                    "days_until": days_until,
+                })
+    return alerts
+
+
 @router.get("/projects/{project_id}/permits/{permit_id}", response_model=PermitDetail)
 def get_permit(project_id: int, permit_id: int, db: Session = Depends(get_db)):
     permit = db.query(Permit).filter(Permit.id == permit_id, Permit.project_id == project_id).first()
@@ -70,6 +102,17 @@ def add_permit_doc(project_id: int, permit_id: int, data: PermitDocumentCreate,
     return doc
 
 
+@router.put("/projects/{project_id}/permits/{permit_id}/documents/{doc_id}/file", response_model=PermitDocumentRead)
+async def upload_permit_doc_file(project_id: int, permit_id: int, doc_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    doc = db.query(PermitDocument).filter(PermitDocument.id == doc_id, PermitDocument.permit_id == permit_id).first()
+    if not doc:
+        raise HTTPException(404, "Permit document not found")
+    attach_blob(doc, await save_upload(db, file, "documents"))
+    db.commit()
+    db.refresh(doc)
+    return doc
+
+
 @router.get("/projects/{project_id}/permits/{permit_id}/inspections", response_model=list[InspectionRead])
 def list_inspections(project_id: int, permit_id: int, db: Session = Depends(get_db)):
     return db.query(Inspection).filter(Inspection.permit_id == permit_id).all()
@@ -138,34 +181,3 @@ def delete_fee(project_id: int, permit_id: int, fee_id: int, db: Session = Depen
         raise HTTPException(404, "Fee not found")
     db.delete(fee)
     db.commit()
-
-
-@router.get("/projects/{project_id}/permits/alerts")
-def permit_alerts(project_id: int, db: Session = Depends(get_db)):
-    today = date.today()
-    alerts = []
-    permits = db.query(Permit).filter(Permit.project_id == project_id).all()
-    for p in permits:
-        if p.expiry_date:
-            days_until = (p.expiry_date - today).days
-            if days_until <= 30:
-                severity = "critical" if days_until <= 7 else "warning"
-                alerts.append({
-                    "permit_id": p.id, "permit_type": p.permit_type,
-                    "message": f"Permit expires in {days_until} days",
-                    "severity": severity, "days_until": days_until,
-                })
-    inspections = db.query(Inspection).filter(
-        Inspection.project_id == project_id, Inspection.result.is_(None)
-    ).all()
-    for i in inspections:
-        if i.scheduled_date:
-            days_until = (i.scheduled_date - today).days
-            if days_until <= 7:
-                alerts.append({
-                    "permit_id": i.permit_id, "inspection_id": i.id,
-                    "message": f"{i.inspection_type} inspection in {days_until} days",
-                    "severity": "info" if days_until > 1 else "warning",
-                    "days_until": days_until,
-                })
-    return alerts
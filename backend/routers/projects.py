@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from backend.database import get_db
 from backend.models.project import Project, Phase
@@ -6,13 +6,14 @@ from backend.schemas.project import (
     ProjectCreate, ProjectUpdate, ProjectRead, ProjectDetail,
     PhaseCreate, PhaseRead,
 )
+from backend.utils.pagination import PageParams, page_params, keyset_page
 
 router = APIRouter()
 
 
 @router.get("/projects", response_model=list[ProjectRead])
-def list_projects(db: Session = Depends(get_db)):
-    return db.query(Project).order_by(Project.created_at.desc()).all()
+def list_projects(response: Response, page: PageParams = Depends(page_params), db: Session = Depends(get_db)):
+    return keyset_page(db.query(Project), [Project.created_at, Project.id], page, response)
 
 
 @router.post("/projects", response_model=ProjectRead, status_code=201)
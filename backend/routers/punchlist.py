@@ -1,7 +1,8 @@
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Literal
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, UploadFile, File
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, case
 from backend.database import get_db
 from backend.models.punchlist import PunchList, PunchItem
 from backend.schemas.punchlist import (
@@ -10,6 +11,10 @@ from backend.schemas.punchlist import (
     PunchItemComplete, PunchItemVerify, PunchItemBackCharge,
     PunchListStats,
 )
+from backend.services.images import generate_derivatives
+from backend.utils.file_storage import save_upload, attach_blob
+from backend.utils.pagination import PageParams, page_params, keyset_page
+from backend.utils.fieldsets import sparse_fields, load_fields, fields_response
 
 router = APIRouter()
 
@@ -17,12 +22,18 @@ router = APIRouter()
 @router.get("/projects/{project_id}/punchlist/lists", response_model=list[PunchListRead])
 def list_punch_lists(project_id: int, db: Session = Depends(get_db)):
     lists = db.query(PunchList).filter(PunchList.project_id == project_id).all()
+    # Item and open counts for every list in one grouped query
+    counts = {
+        list_id: (total, open_count)
+        for list_id, total, open_count in db.query(
+            PunchItem.punch_list_id,
+            func.count(PunchItem.id),
+            func.sum(case((PunchItem.status.in_(["Open", "Assigned", "In Progress"]), 1), else_=0)),
+        ).filter(PunchItem.project_id == project_id).group_by(PunchItem.punch_list_id)
+    }
     result = []
     for pl in lists:
-        total = db.query(func.count(PunchItem.id)).filter(PunchItem.punch_list_id == pl.id).scalar()
-        open_count = db.query(func.count(PunchItem.id)).filter(
-            PunchItem.punch_list_id == pl.id, PunchItem.status.in_(["Open", "Assigned", "In Progress"])
-        ).scalar()
+        total, open_count = counts.get(pl.id, (0, 0))
         d = {c.name: getattr(pl, c.name) for c in pl.__table__.columns}
         d["item_count"] = total
         d["open_count"] = open_count
@@ -45,11 +56,15 @@ def create_punch_list(project_id: int, data: PunchListCreate, db: Session = Depe
 @router.get("/projects/{project_id}/punchlist/items", response_model=list[PunchItemRead])
 def list_punch_items(
     project_id: int,
+    response: Response,
     trade: str | None = Query(None),
     status: str | None = Query(None),
     priority: str | None = Query(None),
+    page: PageParams = Depends(page_params),
+    fields: list[str] | None = Depends(sparse_fields(PunchItemRead)),
     db: Session = Depends(get_db),
 ):
+    keys = [PunchItem.created_at, PunchItem.id]
     q = db.query(PunchItem).filter(PunchItem.project_id == project_id)
     if trade:
         q = q.filter(PunchItem.trade == trade)
@@ -57,7 +72,8 @@ def list_punch_items(
         q = q.filter(PunchItem.status == status)
     if priority:
         q = q.filter(PunchItem.priority == priority)
-    return q.order_by(PunchItem.created_at.desc()).all()
+    rows = keyset_page(load_fields(q, PunchItem, fields, keys), keys, page, response)
+    return fields_response(rows, fields, response) if fields else rows
 
 
 @router.post("/projects/{project_id}/punchlist/items", response_model=PunchItemRead, status_code=201)
@@ -111,6 +127,26 @@ def update_punch_item(project_id: int, item_id: int, data: PunchItemUpdate, db:
     return item
 
 
+@router.put("/projects/{project_id}/punchlist/items/{item_id}/photos/{which}", response_model=PunchItemRead)
+async def upload_punch_photo(
+    project_id: int,
+    item_id: int,
+    which: Literal["before", "after"],
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
+    item = db.query(PunchItem).filter(PunchItem.id == item_id, PunchItem.project_id == project_id).first()
+    if not item:
+        raise HTTPException(404, "Punch item not found")
+    blob = await save_upload(db, file, "photos", "photo.jpg")
+    attach_blob(item, blob, f"photo_{which}_path", f"photo_{which}_sha256")
+    db.commit()
+    db.refresh(item)
+    background_tasks.add_task(generate_derivatives, blob.sha256, blob.file_path)
+    return item
+
+
 @router.post("/projects/{project_id}/punchlist/items/{item_id}/complete", response_model=PunchItemRead)
 def complete_punch_item(project_id: int, item_id: int, data: PunchItemComplete, db: Session = Depends(get_db)):
     item = db.query(PunchItem).filter(PunchItem.id == item_id, PunchItem.project_id == project_id).first()
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from backend.database import get_db
+from backend.database import get_db, get_async_db
 from backend.models.schedule import Activity, ActivityDependency, Milestone, Decision
 from backend.schemas.schedule import (
     ActivityCreate, ActivityUpdate, ActivityRead,
@@ -11,6 +13,7 @@ from backend.schemas.schedule import (
 )
 from backend.schemas.analytics import WeatherImpactResult
 from backend.services.analytics import run_weather_impact
+from backend.utils.fast_json import schema_columns, row_dicts, rows_response
 
 router = APIRouter()
 
@@ -23,8 +26,11 @@ def _recalc_critical_path(project_id: int, db: Session) -> dict:
 
     act_map = {a.id: a for a in activities}
     pred_map: dict[int, list[int]] = {a.id: [] for a in activities}
+    succ_map: dict[int, list[int]] = {a.id: [] for a in activities}
     for d in deps:
         pred_map[d.activity_id].append(d.predecessor_id)
+        if d.predecessor_id in succ_map and d.activity_id not in succ_map[d.predecessor_id]:
+            succ_map[d.predecessor_id].append(d.activity_id)
 
     # Forward pass
     for a in activities:
@@ -51,8 +57,7 @@ def _recalc_critical_path(project_id: int, db: Session) -> dict:
     while changed:
         changed = False
         for a in activities:
-            succ_ids = [s.id for s in activities if a.id in pred_map[s.id]]
-            for sid in succ_ids:
+            for sid in succ_map[a.id]:
                 s = act_map[sid]
                 if s.late_start < a.late_finish:
                     a.late_finish = s.late_start
@@ -77,17 +82,39 @@ def _recalc_critical_path(project_id: int, db: Session) -> dict:
     }
 
 
-def _activity_to_read(a: Activity, db: Session) -> dict:
-    deps = db.query(ActivityDependency).filter(ActivityDependency.activity_id == a.id).all()
+def _predecessor_map(db: Session, project_id: int) -> dict[int, list[int]]:
+    """Predecessor ids of every activity in the project, in one query."""
+    preds: dict[int, list[int]] = {}
+    for activity_id, predecessor_id in db.query(
+        ActivityDependency.activity_id, ActivityDependency.predecessor_id
+    ).join(Activity, Activity.id == ActivityDependency.activity_id).filter(Activity.project_id == project_id):
+        preds.setdefault(activity_id, []).append(predecessor_id)
+    return preds
+
+
+def _activity_to_read(a: Activity, db: Session, preds: dict[int, list[int]] | None = None) -> dict:
+    if preds is None:
+        predecessor_ids = [
+            pid for (pid,) in db.query(ActivityDependency.predecessor_id).filter(ActivityDependency.activity_id == a.id)
+        ]
+    else:
+        predecessor_ids = preds.get(a.id, [])
     d = {c.name: getattr(a, c.name) for c in a.__table__.columns}
-    d["predecessor_ids"] = [dep.predecessor_id for dep in deps]
+    d["predecessor_ids"] = predecessor_ids
     return d
 
 
 @router.get("/projects/{project_id}/schedule/activities", response_model=list[ActivityRead])
-def list_activities(project_id: int, db: Session = Depends(get_db)):
-    acts = db.query(Activity).filter(Activity.project_id == project_id).order_by(Activity.sort_order).all()
-    return [_activity_to_read(a, db) for a in acts]
+async def list_activities(project_id: int, db: AsyncSession = Depends(get_async_db)):
+    # Schema columns as row tuples, returned without ORM objects or response_model revalidation
+    result = row_dicts(await db.execute(
+        select(*schema_columns(Activity, ActivityRead))
+        .where(Activity.project_id == project_id).order_by(Activity.sort_order)
+    ))
+    preds = await db.run_sync(_predecessor_map, project_id)
+    for d in result:
+        d["predecessor_ids"] = preds.get(d["id"], [])
+    return rows_response(result)
 
 
 @router.post("/projects/{project_id}/schedule/activities", response_model=ActivityRead, status_code=201)
@@ -143,13 +170,14 @@ def add_dependency(project_id: int, act_id: int, data: DependencyCreate, db: Ses
 @router.get("/projects/{project_id}/schedule/critical-path", response_model=CriticalPathResult)
 def get_critical_path(project_id: int, db: Session = Depends(get_db)):
     result = _recalc_critical_path(project_id, db)
-    acts = db.query(Activity).filter(Activity.project_id == project_id).order_by(Activity.sort_order).all()
-    return CriticalPathResult(
-        critical_path=result["critical_path"],
-        project_duration=result["project_duration"],
-        activities=[_activity_to_read(a, db) for a in acts],
-        near_critical=result["near_critical"],
-    )
+    activities = row_dicts(db.execute(
+        select(*schema_columns(Activity, ActivityRead))
+        .where(Activity.project_id == project_id).order_by(Activity.sort_order)
+    ))
+    preds = _predecessor_map(db, project_id)
+    for d in activities:
+        d["predecessor_ids"] = preds.get(d["id"], [])
+    return rows_response({**result, "activities": activities})
 
 
 @router.post("/projects/{project_id}/schedule/delay-impact")
@@ -171,8 +199,10 @@ def analyze_delay(project_id: int, data: DelayImpactRequest, db: Session = Depen
 
 
 @router.get("/projects/{project_id}/schedule/milestones", response_model=list[MilestoneRead])
-def list_milestones(project_id: int, db: Session = Depends(get_db)):
-    return db.query(Milestone).filter(Milestone.project_id == project_id).order_by(Milestone.target_date).all()
+async def list_milestones(project_id: int, db: AsyncSession = Depends(get_async_db)):
+    return (await db.scalars(
+        select(Milestone).where(Milestone.project_id == project_id).order_by(Milestone.target_date)
+    )).all()
 
 
 @router.post("/projects/{project_id}/schedule/milestones", response_model=MilestoneRead, status_code=201)
@@ -285,11 +315,11 @@ def weather_impact(project_id: int, db: Session = Depends(get_db)):
 
 # Decision Tracking (Selection Tracker)
 @router.get("/projects/{project_id}/schedule/decisions", response_model=list[DecisionRead])
-def list_decisions(project_id: int, status: str | None = None, db: Session = Depends(get_db)):
-    q = db.query(Decision).filter(Decision.project_id == project_id)
+async def list_decisions(project_id: int, status: str | None = None, db: AsyncSession = Depends(get_async_db)):
+    q = select(Decision).where(Decision.project_id == project_id)
     if status:
-        q = q.filter(Decision.status == status)
-    return q.order_by(Decision.due_date).all()
+        q = q.where(Decision.status == status)
+    return (await db.scalars(q.order_by(Decision.due_date))).all()
 
 
 @router.post("/projects/{project_id}/schedule/decisions", response_model=DecisionRead, status_code=201)
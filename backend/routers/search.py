@@ -0,0 +1,27 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+
+from backend.database import get_db
+from backend.schemas.search import SearchHit
+from backend.services.search import search
+from backend.utils.pagination import NEXT_CURSOR_HEADER, PageParams, page_params
+
+router = APIRouter()
+
+
+@router.get("/projects/{project_id}/search", response_model=list[SearchHit])
+def search_project(
+    project_id: int,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    types: list[Literal["document", "daily_log", "punch_item", "inspection"]] | None = Query(None),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+):
+    """Full-text search across the project's documents, daily logs, punch items and inspections, best match first."""
+    hits, next_cursor = search(db, project_id, q, types, page)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return hits
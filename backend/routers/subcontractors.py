@@ -1,7 +1,7 @@
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response, UploadFile, File
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, case
 from backend.database import get_db
 from backend.models.subcontractor import Subcontractor, SubcontractorPayment, LienWaiver
 from backend.schemas.subcontractor import (
@@ -11,14 +11,28 @@ from backend.schemas.subcontractor import (
 )
 from backend.schemas.analytics import PaymentAnalysisResult
 from backend.services.analytics import run_payment_analysis
+from backend.utils.file_storage import save_upload, attach_blob
+from backend.utils.pagination import PageParams, page_params, keyset_page
 
 router = APIRouter()
 
 
-def _enrich_sub(sub: Subcontractor, db: Session) -> dict:
-    payments = db.query(SubcontractorPayment).filter(SubcontractorPayment.subcontractor_id == sub.id).all()
-    total_paid = sum(p.net_amount for p in payments if p.paid_date)
-    total_retention = sum(p.retention_held for p in payments)
+def _payment_totals(db: Session, sub_ids: list[int]) -> dict[int, tuple[float, float]]:
+    """(total paid, total retention) per subcontractor, in one grouped query."""
+    if not sub_ids:
+        return {}
+    rows = db.query(
+        SubcontractorPayment.subcontractor_id,
+        func.sum(case((SubcontractorPayment.paid_date.isnot(None), SubcontractorPayment.net_amount), else_=0)),
+        func.sum(SubcontractorPayment.retention_held),
+    ).filter(SubcontractorPayment.subcontractor_id.in_(sub_ids)).group_by(SubcontractorPayment.subcontractor_id)
+    return {sub_id: (paid or 0, retention or 0) for sub_id, paid, retention in rows}
+
+
+def _enrich_sub(sub: Subcontractor, db: Session, totals: dict[int, tuple[float, float]] | None = None) -> dict:
+    if totals is None:
+        totals = _payment_totals(db, [sub.id])
+    total_paid, total_retention = totals.get(sub.id, (0, 0))
     balance = sub.contract_amount - total_paid - total_retention
     d = {c.name: getattr(sub, c.name) for c in sub.__table__.columns}
     d["total_paid"] = total_paid
@@ -30,7 +44,8 @@ def _enrich_sub(sub: Subcontractor, db: Session) -> dict:
 @router.get("/projects/{project_id}/subcontractors", response_model=list[SubcontractorRead])
 def list_subs(project_id: int, db: Session = Depends(get_db)):
     subs = db.query(Subcontractor).filter(Subcontractor.project_id == project_id).all()
-    return [_enrich_sub(s, db) for s in subs]
+    totals = _payment_totals(db, [s.id for s in subs])
+    return [_enrich_sub(s, db, totals) for s in subs]
 
 
 @router.get("/projects/{project_id}/subcontractors/payment-analysis", response_model=PaymentAnalysisResult)
@@ -38,6 +53,31 @@ def payment_analysis(project_id: int, db: Session = Depends(get_db)):
     return run_payment_analysis(db, project_id)
 
 
+@router.get("/projects/{project_id}/subcontractors/missing-waivers")
+def missing_waivers(project_id: int, db: Session = Depends(get_db)):
+    # Paid payments with no waiver, with their subcontractor, in one query
+    rows = db.query(SubcontractorPayment, Subcontractor.company_name).outerjoin(
+        Subcontractor, Subcontractor.id == SubcontractorPayment.subcontractor_id
+    ).outerjoin(
+        LienWaiver, LienWaiver.payment_id == SubcontractorPayment.id
+    ).filter(
+        SubcontractorPayment.project_id == project_id,
+        SubcontractorPayment.paid_date.isnot(None),
+        LienWaiver.id.is_(None),
+    ).order_by(SubcontractorPayment.id).all()
+    return [
+        {
+            "subcontractor_id": p.subcontractor_id,
+            "subcontractor_name": company_name or "Unknown",
+            "payment_id": p.id,
+            "invoice_number": p.invoice_number,
+            "amount": p.net_amount,
+            "paid_date": str(p.paid_date) if p.paid_date else None,
+        }
+        for p, company_name in rows
+    ]
+
+
 @router.post("/projects/{project_id}/subcontractors", response_model=SubcontractorRead, status_code=201)
 def create_sub(project_id: int, data: SubcontractorCreate, db: Session = Depends(get_db)):
     sub = Subcontractor(project_id=project_id, **data.model_dump())
@@ -77,8 +117,12 @@ def delete_sub(project_id: int, sub_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/projects/{project_id}/subcontractors/{sub_id}/payments", response_model=list[PaymentRead])
-def list_payments(project_id: int, sub_id: int, db: Session = Depends(get_db)):
-    return db.query(SubcontractorPayment).filter(SubcontractorPayment.subcontractor_id == sub_id).order_by(SubcontractorPayment.created_at.desc()).all()
+def list_payments(
+    project_id: int, sub_id: int, response: Response,
+    page: PageParams = Depends(page_params), db: Session = Depends(get_db),
+):
+    q = db.query(SubcontractorPayment).filter(SubcontractorPayment.subcontractor_id == sub_id)
+    return keyset_page(q, [SubcontractorPayment.created_at, SubcontractorPayment.id], page, response)
 
 
 @router.post("/projects/{project_id}/subcontractors/{sub_id}/payments", response_model=PaymentRead, status_code=201)
@@ -120,23 +164,16 @@ def add_waiver(project_id: int, sub_id: int, pmt_id: int, data: LienWaiverCreate
     return waiver
 
 
-@router.get("/projects/{project_id}/subcontractors/missing-waivers")
-def missing_waivers(project_id: int, db: Session = Depends(get_db)):
-    payments = db.query(SubcontractorPayment).filter(
-        SubcontractorPayment.project_id == project_id,
-        SubcontractorPayment.paid_date.isnot(None),
-    ).all()
-    missing = []
-    for p in payments:
-        waiver = db.query(LienWaiver).filter(LienWaiver.payment_id == p.id).first()
-        if not waiver:
-            sub = db.query(Subcontractor).filter(Subcontractor.id == p.subcontractor_id).first()
-            missing.append({
-                "subcontractor_id": p.subcontractor_id,
-                "subcontractor_name": sub.company_name if sub else "Unknown",
-                "payment_id": p.id,
-                "invoice_number": p.invoice_number,
-                "amount": p.net_amount,
-                "paid_date": str(p.paid_date) if p.paid_date else None,
-            })
-    return missing
+@router.put("/projects/{project_id}/subcontractors/{sub_id}/payments/{pmt_id}/waiver/file", response_model=LienWaiverRead)
+async def upload_waiver_file(project_id: int, sub_id: int, pmt_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    waiver = db.query(LienWaiver).join(SubcontractorPayment).filter(
+        LienWaiver.payment_id == pmt_id, SubcontractorPayment.subcontractor_id == sub_id
+    ).first()
+    if not waiver:
+        raise HTTPException(404, "Lien waiver not found")
+    attach_blob(waiver, await save_upload(db, file, "documents"))
+    if waiver.received_date is None:
+        waiver.received_date = date.today()
+    db.commit()
+    db.refresh(waiver)
+    return waiver
@@ -1,18 +1,22 @@
-from fastapi import APIRouter, UploadFile, File
-from backend.utils.file_storage import save_upload
+from fastapi import APIRouter, BackgroundTasks, Depends, UploadFile, File
+from sqlalchemy.orm import Session
+from backend.database import get_db
+from backend.services.images import generate_derivatives
+from backend.utils.file_storage import save_upload, static_url
 
 router = APIRouter()
 
 
 @router.post("/upload/photo")
-async def upload_photo(file: UploadFile = File(...)):
-    contents = await file.read()
-    path = save_upload(contents, file.filename or "photo.jpg", "photos")
-    return {"file_path": path}
+async def upload_photo(background_tasks: BackgroundTasks, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    blob = await save_upload(db, file, "photos", "photo.jpg")
+    db.commit()
+    background_tasks.add_task(generate_derivatives, blob.sha256, blob.file_path)
+    return {"file_path": blob.file_path, "url": static_url(blob.file_path), "file_size": blob.size, "sha256": blob.sha256}
 
 
 @router.post("/upload/document")
-async def upload_document(file: UploadFile = File(...)):
-    contents = await file.read()
-    path = save_upload(contents, file.filename or "file", "documents")
-    return {"file_path": path}
+async def upload_document(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    blob = await save_upload(db, file, "documents")
+    db.commit()
+    return {"file_path": blob.file_path, "url": static_url(blob.file_path), "file_size": blob.size, "sha256": blob.sha256}
@@ -1,3 +1,4 @@
+from datetime import date
 from pydantic import BaseModel
 
 
@@ -52,6 +53,7 @@ class KPIMetricResult(BaseModel):
     unit: str
     status: str  # on_track, at_risk, critical
     description: str = ""
+    trend: str = "stable"  # up, down, stable (vs. previous daily snapshot)
 
 
 class KPIResult(BaseModel):
@@ -61,6 +63,69 @@ class KPIResult(BaseModel):
     quality_kpis: list[KPIMetricResult]
 
 
+class EVMPeriodResult(BaseModel):
+    period_label: str
+    planned_value: float
+    earned_value: float | None = None  # None for periods after the data date
+    actual_cost: float | None = None
+    cumulative_pv: float
+    cumulative_ev: float | None = None
+    cumulative_ac: float | None = None
+    spi: float | None = None
+    cpi: float | None = None
+    eac: float | None = None
+    etc: float | None = None
+
+
+class EVMCategoryResult(BaseModel):
+    category_code: str
+    category_name: str
+    budget_at_completion: float
+    periods: list[EVMPeriodResult]
+
+
+class EarnedValueResult(BaseModel):
+    project_name: str
+    data_date: str
+    budget_at_completion: float
+    planned_value: float
+    earned_value: float
+    actual_cost: float
+    spi: float | None = None
+    cpi: float | None = None
+    eac: float
+    etc: float
+    periods: list[EVMPeriodResult]
+    categories: list[EVMCategoryResult]
+
+
+class TrendPoint(BaseModel):
+    snapshot_date: date
+    total_budget: float
+    total_committed: float
+    total_actual: float
+    total_forecast: float
+    planned_value: float
+    earned_value: float
+    spi: float | None = None
+    cpi: float | None = None
+    eac: float
+    percent_complete: float
+    first_pass_yield: float | None = None
+    open_punch_items: float
+
+
+class TrendResult(BaseModel):
+    project_id: int
+    data_points: int
+    returned_points: int
+    forecast_trend: str  # increasing, decreasing, stable, insufficient_data
+    forecast_change: float
+    actual_trend: str
+    actual_change: float
+    points: list[TrendPoint]
+
+
 class WeatherImpactActivity(BaseModel):
     activity_code: str
     activity_name: str
@@ -93,3 +158,47 @@ class PaymentAnalysisResult(BaseModel):
     total_retention: float
     total_balance: float
     subcontractors: list[PaymentAnalysisSubResult]
+
+
+class BidLevelingBidResult(BaseModel):
+    bid_id: int
+    contractor_name: str
+    amount: float
+    is_selected: bool
+    z_score: float | None = None
+    deviation_from_median_percent: float | None = None
+    deviation_from_reference_percent: float | None = None
+    flags: list[str] = []  # below_reference, low_outlier, high_outlier
+    missing_scope_suspected: bool = False
+
+
+class BidLevelingItemResult(BaseModel):
+    budget_item_id: int
+    item_code: str
+    description: str
+    category_code: str
+    current_budget: float
+    regional_average: float | None = None
+    reference_amount: float
+    bid_count: int
+    low_bid: float | None = None
+    high_bid: float | None = None
+    median_bid: float | None = None
+    mean_bid: float | None = None
+    spread: float | None = None
+    spread_percent: float | None = None
+    selected_amount: float | None = None
+    missing_scope_count: int = 0
+    bids: list[BidLevelingBidResult] = []
+
+
+class BidLevelingResult(BaseModel):
+    project_name: str
+    total_items: int
+    items_with_bids: int
+    items_without_bids: int
+    total_bids: int
+    missing_scope_count: int
+    total_low_bids: float
+    total_selected: float
+    items: list[BidLevelingItemResult]
@@ -50,15 +50,6 @@ class BudgetItemUpdate(BaseModel):
     notes: str | None = None
 
 
-class BudgetItemRead(BudgetItemBase):
-    id: int
-    project_id: int
-    bids: list[BidRead] = []
-    created_at: datetime
-    updated_at: datetime
-    model_config = {"from_attributes": True}
-
-
 class BidBase(BaseModel):
     contractor_name: str
     amount: float
@@ -85,6 +76,15 @@ class BidRead(BidBase):
     model_config = {"from_attributes": True}
 
 
+class BudgetItemRead(BudgetItemBase):
+    id: int
+    project_id: int
+    bids: list[BidRead] = []
+    created_at: datetime
+    updated_at: datetime
+    model_config = {"from_attributes": True}
+
+
 class CostEntryBase(BaseModel):
     entry_date: date
     amount: float
@@ -157,3 +157,45 @@ class CostSuggestionRead(BaseModel):
     type: str
     description_options: list[str]
     rationale: str
+
+
+class CostItemRead(BaseModel):
+    work_item_code: str
+    description: str
+    unit: str
+    region: str
+    category: str
+    labor_cost: float
+    material_cost: float
+    equipment_cost: float
+    labor_norm: float
+    labor_rate: float
+    direct_unit_cost: float = 0
+
+
+class CostItemMatch(CostItemRead):
+    score: float
+
+
+class EstimateCategoryRead(BaseModel):
+    category: str
+    item_count: int
+    labor_cost: float
+    material_cost: float
+    equipment_cost: float
+    total_cost: float
+
+
+class EstimateResult(BaseModel):
+    region: str | None = None
+    item_count: int
+    missing_count: int
+    missing_codes: list[str] = []
+    labor_total: float
+    material_total: float
+    equipment_total: float
+    overhead_total: float
+    profit_total: float
+    total_cost: float
+    labor_hours: float
+    categories: list[EstimateCategoryRead] = []
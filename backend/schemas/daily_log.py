@@ -1,5 +1,8 @@
 from datetime import date, datetime
-from pydantic import BaseModel
+from typing import Literal
+from pydantic import BaseModel, Field, computed_field, field_validator, model_validator
+from backend.services.images import derivative_urls
+from backend.utils.file_storage import static_url
 
 
 class CrewEntryBase(BaseModel):
@@ -41,10 +44,23 @@ class LogPhotoRead(BaseModel):
     id: int
     daily_log_id: int
     file_path: str
+    blob_sha256: str | None = None
     caption: str | None = None
     created_at: datetime
+    derivatives_rendered: bool | None = Field(None, exclude=True)
     model_config = {"from_attributes": True}
 
+    @computed_field
+    @property
+    def url(self) -> str | None:
+        return static_url(self.file_path)
+
+    @computed_field
+    @property
+    def derivatives(self) -> dict[str, str] | None:
+        """Thumbnail/medium WebP and JPEG URLs, once rendered."""
+        return derivative_urls(self.blob_sha256, self.derivatives_rendered)
+
 
 class DailyLogBase(BaseModel):
     log_date: date
@@ -93,3 +109,33 @@ class DailyLogDetail(DailyLogRead):
     crew_entries: list[CrewEntryRead] = []
     work_items: list[WorkItemRead] = []
     photos: list[LogPhotoRead] = []
+
+
+class DailyReportRequest(BaseModel):
+    """Logs to render: by id, or every log of a month ("YYYY-MM")."""
+    log_ids: list[int] = Field([], max_length=366)
+    month: str | None = Field(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$")
+    format: Literal["pdf", "zip"] = "pdf"
+
+    @field_validator("month")
+    @classmethod
+    def _real_month(cls, month: str | None) -> str | None:
+        if month is not None:
+            # The pattern admits year 0000, which has no dates
+            date(int(month[:4]), int(month[5:]), 1)
+        return month
+
+    @model_validator(mode="after")
+    def _one_selection(self):
+        if bool(self.log_ids) == bool(self.month):
+            raise ValueError("Give either log_ids or month")
+        return self
+
+
+class DailyReportJobRead(BaseModel):
+    id: str
+    status: str
+    format: str
+    filename: str
+    error: str | None = None
+    model_config = {"from_attributes": True}
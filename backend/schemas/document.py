@@ -35,7 +35,22 @@ class DocumentRead(DocumentBase):
     file_path: str
     file_type: str | None = None
     file_size: int | None = None
+    blob_sha256: str | None = None
     version: int = 1
+    parent_id: int | None = None
+    chain_id: int | None = None
+    is_latest: bool = True
     uploaded_by: str | None = None
     created_at: datetime
     model_config = {"from_attributes": True}
+
+
+class DocumentTextPage(BaseModel):
+    page: int
+    text: str
+
+
+class DocumentText(BaseModel):
+    status: str
+    page_count: int = 0
+    pages: list[DocumentTextPage] = []
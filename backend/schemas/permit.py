@@ -54,6 +54,7 @@ class PermitDocumentRead(PermitDocumentBase):
     id: int
     permit_id: int
     file_path: str | None = None
+    blob_sha256: str | None = None
     submitted_date: date | None = None
     status: str = "pending"
     version: int = 1
@@ -1,5 +1,6 @@
 from datetime import date, datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, computed_field
+from backend.services.images import derivative_urls
 
 
 class PunchListBase(BaseModel):
@@ -63,6 +64,8 @@ class PunchItemRead(PunchItemBase):
     assigned_date: date | None = None
     photo_before_path: str | None = None
     photo_after_path: str | None = None
+    photo_before_sha256: str | None = None
+    photo_after_sha256: str | None = None
     completed_by: str | None = None
     completed_date: date | None = None
     completion_notes: str | None = None
@@ -75,8 +78,20 @@ class PunchItemRead(PunchItemBase):
     created_by: str | None = None
     created_at: datetime
     updated_at: datetime
+    photo_before_rendered: bool | None = Field(None, exclude=True)
+    photo_after_rendered: bool | None = Field(None, exclude=True)
     model_config = {"from_attributes": True}
 
+    @computed_field
+    @property
+    def photo_before_derivatives(self) -> dict[str, str] | None:
+        return derivative_urls(self.photo_before_sha256, self.photo_before_rendered)
+
+    @computed_field
+    @property
+    def photo_after_derivatives(self) -> dict[str, str] | None:
+        return derivative_urls(self.photo_after_sha256, self.photo_after_rendered)
+
 
 class PunchItemComplete(BaseModel):
     completed_by: str
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    entity_type: str
+    entity_id: int
+    title: str
+    # HTML-escaped excerpt with matches wrapped in <mark>
+    snippet: str
+    score: float
@@ -97,5 +97,6 @@ class LienWaiverRead(LienWaiverBase):
     payment_id: int
     received_date: date | None = None
     file_path: str | None = None
+    blob_sha256: str | None = None
     created_at: datetime
     model_config = {"from_attributes": True}
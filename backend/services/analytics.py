@@ -15,6 +15,8 @@ from backend.schemas.analytics import (
     WeatherImpactActivity, WeatherImpactResult,
     PaymentAnalysisSubResult, PaymentAnalysisResult,
 )
+from backend.services.earned_value import run_earned_value
+from backend.services.snapshots import metric_trends
 
 
 def run_budget_variance(db: Session, project_id: int) -> BudgetVarianceResult:
@@ -140,15 +142,16 @@ def run_cash_flow_forecast(db: Session, project_id: int) -> CashFlowResult:
 def run_kpi_analysis(db: Session, project_id: int) -> KPIResult:
     """Calculate project KPIs using DDC ProjectKPIDashboard logic."""
     project = db.query(Project).filter(Project.id == project_id).first()
-    items = db.query(BudgetItem).filter(BudgetItem.project_id == project_id).all()
-    activities = db.query(Activity).filter(Activity.project_id == project_id).all()
+    activities = db.query(Activity.status).filter(Activity.project_id == project_id).all()
     inspections = db.query(Inspection).filter(Inspection.project_id == project_id).all()
     punch_items = db.query(PunchItem).filter(PunchItem.project_id == project_id).all()
+    evm = run_earned_value(db, project_id)
+    trends = metric_trends(db, project_id)
 
     # Schedule KPIs
     total_acts = len(activities)
     completed_acts = sum(1 for a in activities if a.status == "completed")
-    spi = completed_acts / total_acts if total_acts > 0 else 0
+    spi = evm.spi if evm.spi is not None else 1.0
     spi_status = "on_track" if spi >= 0.95 else ("at_risk" if spi >= 0.85 else "critical")
     pct_complete = round(completed_acts / total_acts * 100, 1) if total_acts > 0 else 0
 
@@ -157,34 +160,43 @@ def run_kpi_analysis(db: Session, project_id: int) -> KPIResult:
             name="Schedule Performance Index (SPI)",
             category="schedule", current_value=round(spi, 2), target_value=1.0,
             unit="ratio", status=spi_status,
-            description="SPI = Completed Activities / Total Activities"
+            description="SPI = Earned Value / Planned Value at the data date",
+            trend=trends.get("spi", "stable"),
         ),
         KPIMetricResult(
             name="Percent Complete",
             category="schedule", current_value=pct_complete, target_value=100,
             unit="%", status=spi_status,
+            trend=trends.get("percent_complete", "stable"),
         ),
     ]
 
     # Cost KPIs
-    total_budget = sum(i.current_budget for i in items)
-    total_actual = sum(i.actual_cost for i in items)
-    earned_value = sum(i.current_budget * (i.percent_complete / 100) for i in items)
-    cpi = earned_value / total_actual if total_actual > 0 else 1.0
+    cpi = evm.cpi if evm.cpi is not None else 1.0
     cpi_status = "on_track" if cpi >= 0.95 else ("at_risk" if cpi >= 0.85 else "critical")
-    budget_used = round(total_actual / total_budget * 100, 1) if total_budget > 0 else 0
+    total_budget = evm.budget_at_completion
+    budget_used = round(evm.actual_cost / total_budget * 100, 1) if total_budget > 0 else 0
 
     cost_kpis = [
         KPIMetricResult(
             name="Cost Performance Index (CPI)",
             category="cost", current_value=round(cpi, 2), target_value=1.0,
             unit="ratio", status=cpi_status,
-            description="CPI = Earned Value / Actual Cost"
+            description="CPI = Earned Value / Actual Cost",
+            trend=trends.get("cpi", "stable"),
         ),
         KPIMetricResult(
             name="Budget Utilization",
             category="cost", current_value=budget_used, target_value=100,
             unit="%", status=cpi_status,
+            trend=trends.get("total_actual", "stable"),
+        ),
+        KPIMetricResult(
+            name="Estimate at Completion (EAC)",
+            category="cost", current_value=evm.eac, target_value=total_budget,
+            unit="USD", status=cpi_status,
+            description="EAC = Budget at Completion / CPI",
+            trend=trends.get("eac", "stable"),
         ),
     ]
 
@@ -206,7 +218,8 @@ def run_kpi_analysis(db: Session, project_id: int) -> KPIResult:
             name="First Pass Yield (FPY)",
             category="quality", current_value=round(fpy * 100, 1), target_value=98,
             unit="%", status=fpy_status,
-            description="Inspection pass rate on first attempt"
+            description="Inspection pass rate on first attempt",
+            trend=trends.get("first_pass_yield", "stable"),
         ),
         KPIMetricResult(
             name="Rework Rate",
@@ -299,14 +312,22 @@ def run_payment_analysis(db: Session, project_id: int) -> PaymentAnalysisResult:
     total_retention = 0
     total_balance = 0
 
+    # Payments and waiver links for every subcontractor in two queries, grouped here
+    payments_by_sub: dict[int, list[SubcontractorPayment]] = {}
+    for p in db.query(SubcontractorPayment).join(
+        Subcontractor, Subcontractor.id == SubcontractorPayment.subcontractor_id
+    ).filter(Subcontractor.project_id == project_id):
+        payments_by_sub.setdefault(p.subcontractor_id, []).append(p)
+    waiver_payment_ids = {
+        payment_id for (payment_id,) in db.query(LienWaiver.payment_id).join(
+            SubcontractorPayment, SubcontractorPayment.id == LienWaiver.payment_id
+        ).join(
+            Subcontractor, Subcontractor.id == SubcontractorPayment.subcontractor_id
+        ).filter(Subcontractor.project_id == project_id)
+    }
+
     for sub in subs:
-        payments = db.query(SubcontractorPayment).filter(
-            SubcontractorPayment.subcontractor_id == sub.id
-        ).all()
-        paid_ids = {p.id for p in payments}
-        waivers = db.query(LienWaiver).filter(
-            LienWaiver.payment_id.in_(paid_ids)
-        ).all() if paid_ids else []
+        payments = payments_by_sub.get(sub.id, [])
 
         paid = sum(p.net_amount for p in payments if p.paid_date)
         retention = sum(p.retention_held for p in payments)
@@ -315,7 +336,6 @@ def run_payment_analysis(db: Session, project_id: int) -> PaymentAnalysisResult:
 
         # Count payments that should have waivers but don't
         paid_payments = [p for p in payments if p.paid_date]
-        waiver_payment_ids = {w.payment_id for w in waivers}
         missing = sum(1 for p in paid_payments if p.id not in waiver_payment_ids)
 
         sub_results.append(PaymentAnalysisSubResult(
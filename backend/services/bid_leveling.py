@@ -0,0 +1,190 @@
+"""Bid leveling — project-wide spread, median, z-score and missing-scope checks per budget item."""
+
+import threading
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from backend.models.project import Project
+from backend.models.budget import BudgetCategory, BudgetItem, Bid
+from backend.schemas.analytics import (
+    BidLevelingBidResult, BidLevelingItemResult, BidLevelingResult,
+)
+from backend.services.costs import CostService
+
+# A bid this far under the reference price (the item's budget) and under the median bid
+# usually leaves scope out (same threshold the bid leveling panel warns at).
+BELOW_REFERENCE_RATIO = 0.8
+# |z| beyond this among an item's bids marks an outlier; needs enough bids to mean anything.
+OUTLIER_Z = 1.5
+MIN_BIDS_FOR_OUTLIERS = 3
+# ...and must also be this far from the median: tightly grouped bids give tiny deviations huge z-scores
+OUTLIER_MIN_DEVIATION = 0.1
+
+# project_id -> (version key, result); bid writes also invalidate explicitly.
+_report_cache: dict[int, tuple[tuple, BidLevelingResult]] = {}
+_cache_lock = threading.Lock()
+
+
+def invalidate_bid_leveling(project_id: int) -> None:
+    with _cache_lock:
+        _report_cache.pop(project_id, None)
+
+
+def _project_version(db: Session, project_id: int) -> tuple:
+    """Cheap fingerprint of the bids and budget items the report is derived from."""
+    project_row = db.query(Project.updated_at).filter(Project.id == project_id).first()
+    bids_row = db.query(
+        func.count(Bid.id), func.max(Bid.id), func.sum(Bid.amount),
+        func.sum(case((Bid.is_selected.is_(True), 1), else_=0)),
+    ).filter(Bid.project_id == project_id).one()
+    items_row = db.query(
+        func.count(BudgetItem.id), func.max(BudgetItem.id), func.max(BudgetItem.updated_at),
+    ).filter(BudgetItem.project_id == project_id).one()
+    return (project_row[0] if project_row else None, tuple(bids_row), tuple(items_row))
+
+
+def _opt(value, digits: int = 2) -> float | None:
+    return None if value is None or pd.isna(value) else round(float(value), digits)
+
+
+def _compute_bid_leveling(db: Session, project_id: int) -> BidLevelingResult:
+    project = db.query(Project).filter(Project.id == project_id).first()
+    rows = db.query(
+        BudgetItem.id.label("budget_item_id"), BudgetItem.item_code, BudgetItem.description,
+        BudgetItem.current_budget, BudgetCategory.code.label("category_code"),
+        Bid.id.label("bid_id"), Bid.contractor_name, Bid.amount, Bid.is_selected,
+    ).join(
+        BudgetCategory, BudgetCategory.id == BudgetItem.category_id,
+    ).outerjoin(
+        Bid, Bid.budget_item_id == BudgetItem.id,
+    ).filter(
+        BudgetItem.project_id == project_id,
+    ).order_by(BudgetItem.id, Bid.amount).all()
+
+    df = pd.DataFrame(rows, columns=[
+        "budget_item_id", "item_code", "description", "current_budget", "category_code",
+        "bid_id", "contractor_name", "amount", "is_selected",
+    ])
+    df["current_budget"] = df["current_budget"].astype(float).fillna(0.0)
+    df["amount"] = df["amount"].astype(float)
+    df["is_selected"] = df["is_selected"].fillna(0).astype(bool)
+
+    # Regional average per category code from the cost service, item budget as fallback
+    state = project.state if project else None
+    city = project.city if project else None
+    regional = {}
+    for code in df["category_code"].unique():
+        average = next((s["amount"] for s in CostService.get_suggestions(code, state=state, city=city)
+                        if s["type"] == "average"), None)
+        regional[code] = average
+    df["regional_average"] = df["category_code"].map(regional).astype(float)
+    # Bids price one line item: compare them with the item's budget. Without one, the regional
+    # average (which prices the whole category) split evenly over the category's items.
+    items_in_category = df.groupby("category_code")["budget_item_id"].transform("nunique")
+    category_share = df["regional_average"] / items_in_category
+    df["reference_amount"] = df["current_budget"].where(df["current_budget"] > 0, category_share)
+
+    # Per-item statistics broadcast back onto the bids
+    grouped = df.groupby("budget_item_id", sort=False)["amount"]
+    df["bid_count"] = grouped.transform("count")
+    df["median_bid"] = grouped.transform("median")
+    df["mean_bid"] = grouped.transform("mean")
+    df["std_bid"] = grouped.transform("std", ddof=0)
+    df["low_bid"] = grouped.transform("min")
+    df["high_bid"] = grouped.transform("max")
+
+    has_bid = df["bid_id"].notna().to_numpy()
+    amount = df["amount"].to_numpy()
+    std = df["std_bid"].to_numpy()
+    z = np.full(len(df), np.nan)
+    np.divide(amount - df["mean_bid"].to_numpy(), std, out=z, where=has_bid & (std > 0))
+    df["z_score"] = z
+    median = df["median_bid"].to_numpy()
+    ref = df["reference_amount"].to_numpy()
+    dev_median = np.full(len(df), np.nan)
+    np.divide(amount - median, median, out=dev_median, where=has_bid & (median > 0))
+    dev_ref = np.full(len(df), np.nan)
+    np.divide(amount - ref, ref, out=dev_ref, where=has_bid & (ref > 0))
+    df["dev_median"] = dev_median * 100
+    df["dev_ref"] = dev_ref * 100
+
+    enough = df["bid_count"].to_numpy() >= MIN_BIDS_FOR_OUTLIERS
+    # Only bids under the middle of the field: when every bid is far under the reference, the
+    # reference is off, not the bids
+    df["below_reference"] = (
+        has_bid & (df["bid_count"].to_numpy() > 1) & (amount < ref * BELOW_REFERENCE_RATIO) & (amount < median)
+    )
+    far = np.abs(dev_median) >= OUTLIER_MIN_DEVIATION
+    df["low_outlier"] = enough & far & (z <= -OUTLIER_Z)
+    df["high_outlier"] = enough & far & (z >= OUTLIER_Z)
+    df["missing_scope"] = df["below_reference"] | df["low_outlier"]
+
+    items = []
+    for item_id, grp in df.groupby("budget_item_id", sort=False):
+        first = grp.iloc[0]
+        bids_df = grp[grp["bid_id"].notna()]
+        bids = [
+            BidLevelingBidResult(
+                bid_id=int(b.bid_id),
+                contractor_name=b.contractor_name,
+                amount=round(b.amount, 2),
+                is_selected=bool(b.is_selected),
+                z_score=_opt(b.z_score, 3),
+                deviation_from_median_percent=_opt(b.dev_median),
+                deviation_from_reference_percent=_opt(b.dev_ref),
+                flags=[f for f in ("below_reference", "low_outlier", "high_outlier") if getattr(b, f)],
+                missing_scope_suspected=bool(b.missing_scope),
+            )
+            for b in bids_df.itertuples(index=False)
+        ]
+        selected = bids_df.loc[bids_df["is_selected"], "amount"]
+        median_bid = first["median_bid"]
+        spread = first["high_bid"] - first["low_bid"] if bids else None
+        items.append(BidLevelingItemResult(
+            budget_item_id=int(item_id),
+            item_code=first["item_code"],
+            description=first["description"],
+            category_code=first["category_code"],
+            current_budget=round(first["current_budget"], 2),
+            regional_average=_opt(first["regional_average"]),
+            reference_amount=round(float(np.nan_to_num(first["reference_amount"])), 2),
+            bid_count=len(bids),
+            low_bid=_opt(first["low_bid"]),
+            high_bid=_opt(first["high_bid"]),
+            median_bid=_opt(median_bid),
+            mean_bid=_opt(first["mean_bid"]),
+            spread=_opt(spread),
+            spread_percent=_opt(spread / median_bid * 100) if bids and median_bid > 0 else None,
+            selected_amount=_opt(selected.iloc[0]) if len(selected) else None,
+            missing_scope_count=int(bids_df["missing_scope"].sum()),
+            bids=bids,
+        ))
+
+    with_bids = [i for i in items if i.bid_count]
+    return BidLevelingResult(
+        project_name=project.name if project else "",
+        total_items=len(items),
+        items_with_bids=len(with_bids),
+        items_without_bids=len(items) - len(with_bids),
+        total_bids=int(has_bid.sum()),
+        missing_scope_count=sum(i.missing_scope_count for i in items),
+        total_low_bids=round(sum(i.low_bid for i in with_bids), 2),
+        total_selected=round(sum(i.selected_amount or 0 for i in items), 2),
+        items=items,
+    )
+
+
+def run_bid_leveling(db: Session, project_id: int) -> BidLevelingResult:
+    """Project-wide bid leveling report, cached until bids or budget items change."""
+    version = _project_version(db, project_id)
+    with _cache_lock:
+        cached = _report_cache.get(project_id)
+    if cached and cached[0] == version:
+        return cached[1]
+    result = _compute_bid_leveling(db, project_id)
+    with _cache_lock:
+        _report_cache[project_id] = (version, result)
+    return result
@@ -0,0 +1,271 @@
+"""CWICR cost database — columnar, memory-mapped store indexed by work item code and region.
+
+A CWICR-style CSV/Parquet export is converted once into a directory of
+``.npy`` columns sorted by (code, region). Lookups binary-search the
+memory-mapped code column, so a request never materialises a DataFrame.
+The work item search index is built when the store is opened, which the
+app does at startup, so no request pays for it.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from backend.config import settings
+from backend.ddc_skills.work_item_index import WorkItemIndex
+
+NUMERIC_COLUMNS = ("labor_cost", "material_cost", "equipment_cost", "labor_norm", "labor_rate")
+KEY_COLUMNS = ("code_key", "region", "category")
+TEXT_COLUMNS = ("work_item_code", "description", "unit")
+DEFAULT_REGION = "DEFAULT"
+MANIFEST = "manifest.json"
+
+
+def _read_source(source: Path) -> pd.DataFrame:
+    if source.suffix.lower() in (".parquet", ".pq"):
+        return pd.read_parquet(source)
+    return pd.read_csv(source, dtype={"work_item_code": str})
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Coerce a raw CWICR export into the columns the store expects."""
+    df = df.rename(columns=lambda c: str(c).strip().lower())
+    if "work_item_code" not in df.columns:
+        if "code" in df.columns:
+            df = df.rename(columns={"code": "work_item_code"})
+        else:
+            raise ValueError("CWICR source needs a 'work_item_code' column")
+    df = df[df["work_item_code"].notna()].copy()
+    df["work_item_code"] = df["work_item_code"].astype(str).str.strip()
+    df["code_key"] = df["work_item_code"].str.upper()
+    if "region" in df.columns:
+        df["region"] = df["region"].fillna(DEFAULT_REGION).astype(str).str.strip().str.upper()
+    else:
+        df["region"] = DEFAULT_REGION
+    if "category" not in df.columns:
+        # Same convention as CWICRCostCalculator.calculate_estimate
+        df["category"] = df["work_item_code"].map(lambda c: c.split("-")[0] if "-" in c else "Other")
+    df["category"] = df["category"].fillna("Other").astype(str).str.upper()
+    for col in NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0) if col in df.columns else 0.0
+    for col in ("description", "unit"):
+        df[col] = df[col].fillna("").astype(str) if col in df.columns else ""
+    return df.sort_values(["code_key", "region"], kind="stable").reset_index(drop=True)
+
+
+def _category_stats(df: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Per category/region unit-cost statistics used by budget suggestions."""
+    direct = df["labor_cost"] + df["material_cost"] + df["equipment_cost"]
+    frame = df[["category", "region", "description"]].assign(direct=direct)
+    stats: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for (cat, region), grp in frame.groupby(["category", "region"], sort=False):
+        stats.setdefault(cat, {})[region] = {
+            "count": int(len(grp)),
+            "mean_unit_cost": float(grp["direct"].mean()),
+            "min_unit_cost": float(grp["direct"].min()),
+            "max_unit_cost": float(grp["direct"].max()),
+            "descriptions": [d for d in grp["description"].drop_duplicates().head(3) if d],
+        }
+    return stats
+
+
+def build_cost_database(source: str | Path, out_dir: str | Path) -> Path:
+    """Convert a CWICR CSV/Parquet file into the columnar store at out_dir."""
+    source, out_dir = Path(source), Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    df = _normalize(_read_source(source))
+
+    for col in NUMERIC_COLUMNS:
+        np.save(out_dir / f"{col}.npy", df[col].to_numpy(dtype=np.float64))
+    for col in KEY_COLUMNS:
+        encoded = df[col].str.encode("utf-8")
+        width = max(int(encoded.str.len().max() or 1), 1)
+        np.save(out_dir / f"{col}.npy", encoded.to_numpy().astype(f"S{width}"))
+    for col in TEXT_COLUMNS:
+        encoded = [s.encode("utf-8") for s in df[col]]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        (out_dir / f"{col}.bin").write_bytes(b"".join(encoded))
+        np.save(out_dir / f"{col}.offsets.npy", offsets)
+
+    manifest = {
+        "rows": int(len(df)),
+        "source": str(source),
+        "source_mtime": source.stat().st_mtime,
+        "category_stats": _category_stats(df),
+    }
+    (out_dir / MANIFEST).write_text(json.dumps(manifest))
+    return out_dir
+
+
+class CostDatabase:
+    """Read-only view over a built CWICR store; all columns are memory-mapped."""
+
+    def __init__(self, store_dir: str | Path):
+        self.store_dir = Path(store_dir)
+        manifest = json.loads((self.store_dir / MANIFEST).read_text())
+        self.rows: int = manifest["rows"]
+        self.category_stats: Dict[str, Dict[str, Dict[str, Any]]] = manifest["category_stats"]
+        self._num = {c: np.load(self.store_dir / f"{c}.npy", mmap_mode="r") for c in NUMERIC_COLUMNS}
+        self._keys = {c: np.load(self.store_dir / f"{c}.npy", mmap_mode="r") for c in KEY_COLUMNS}
+        self._text = {c: self._load_text(c) for c in TEXT_COLUMNS}
+        self.regions = frozenset(np.char.decode(np.unique(self._keys["region"]), "utf-8").tolist())
+        self._index = WorkItemIndex(
+            [self.text("work_item_code", i) for i in range(self.rows)],
+            [self.text("description", i) for i in range(self.rows)],
+        )
+
+    def _load_text(self, col: str):
+        offsets = np.load(self.store_dir / f"{col}.offsets.npy", mmap_mode="r")
+        blob_path = self.store_dir / f"{col}.bin"
+        blob = np.memmap(blob_path, dtype=np.uint8, mode="r") if blob_path.stat().st_size else np.empty(0, np.uint8)
+        return offsets, blob
+
+    def text(self, col: str, row: int) -> str:
+        offsets, blob = self._text[col]
+        return bytes(blob[offsets[row]:offsets[row + 1]]).decode("utf-8")
+
+    def code_range(self, code: str) -> tuple[int, int]:
+        """Row span [lo, hi) holding every region's entry for an exact code."""
+        codes = self._keys["code_key"]
+        key = code.strip().upper().encode("utf-8")
+        return int(np.searchsorted(codes, key, "left")), int(np.searchsorted(codes, key, "right"))
+
+    def prefix_range(self, prefix: str) -> tuple[int, int]:
+        """Row span [lo, hi) whose codes start with prefix."""
+        codes = self._keys["code_key"]
+        key = prefix.strip().upper().encode("utf-8")
+        return int(np.searchsorted(codes, key, "left")), int(np.searchsorted(codes, key + b"\xff", "left"))
+
+    def find_row(self, code: str, region: Optional[str] = None) -> Optional[int]:
+        """Row for code in region, falling back to the default region, then any region."""
+        lo, hi = self.code_range(code)
+        if lo == hi:
+            return None
+        regions = self._keys["region"][lo:hi]
+        for candidate in (region, DEFAULT_REGION):
+            if candidate:
+                hits = np.flatnonzero(regions == candidate.strip().upper().encode("utf-8"))
+                if hits.size:
+                    return lo + int(hits[0])
+        return lo
+
+    def row(self, i: int) -> Dict[str, Any]:
+        rec: Dict[str, Any] = {c: self.text(c, i) for c in TEXT_COLUMNS}
+        rec["region"] = self._keys["region"][i].decode("utf-8")
+        rec["category"] = self._keys["category"][i].decode("utf-8")
+        rec.update({c: float(self._num[c][i]) for c in NUMERIC_COLUMNS})
+        return rec
+
+    def unit_cost(self, code: str, region: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        i = self.find_row(code, region)
+        if i is None:
+            return None
+        rec = self.row(i)
+        rec["direct_unit_cost"] = rec["labor_cost"] + rec["material_cost"] + rec["equipment_cost"]
+        return rec
+
+    def _stats_for(self, category: str) -> Dict[str, Dict[str, Any]]:
+        # Budget codes like "02-FOUND" match either a full category or its leading segment
+        key = category.upper()
+        return self.category_stats.get(key) or self.category_stats.get(key.split("-")[0]) or {}
+
+    def regional_stats(self, category: str, *regions: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Stats for the first matching region, falling back to the default region."""
+        by_region = self._stats_for(category)
+        for region in (*regions, DEFAULT_REGION):
+            if region and region.upper() in by_region:
+                return by_region[region.upper()]
+        return None
+
+    def regional_factor(self, category: str, *regions: Optional[str]) -> Optional[float]:
+        """Ratio of the first matching region's mean unit cost to the default region's."""
+        by_region = self._stats_for(category)
+        base = by_region.get(DEFAULT_REGION)
+        if not base or not base["mean_unit_cost"]:
+            return None
+        for region in regions:
+            if region and region.upper() in by_region:
+                return by_region[region.upper()]["mean_unit_cost"] / base["mean_unit_cost"]
+        return None
+
+    def search(self, query: str, limit: int = 10) -> list[Dict[str, Any]]:
+        """Ranked partial matches over codes and descriptions (one row per code)."""
+        results, seen = [], set()
+        # Rows repeat per region, so over-fetch before de-duplicating by code
+        for pos, score in self._index.search(query, limit * 4):
+            code_key = self._keys["code_key"][pos]
+            if code_key in seen:
+                continue
+            seen.add(code_key)
+            results.append({**self.row(pos), "score": score})
+            if len(results) >= limit:
+                break
+        return results
+
+    def canonical_region(self, region: Optional[str]) -> str:
+        """region as stored, or the default region if the database has no rows for it."""
+        region = (region or "").strip().upper()
+        return region if region in self.regions else DEFAULT_REGION
+
+    def catalog_frame(self, *regions: Optional[str]) -> pd.DataFrame:
+        """One row per code, priced for the first matching region, then the default region.
+
+        Codes with no row in any requested region fall back to their first
+        stored region, as ``find_row`` does.
+        """
+        region_col = self._keys["region"]
+        priority = np.full(self.rows, len(regions) + 1, dtype=np.int8)
+        for rank, region in reversed(list(enumerate((*regions, DEFAULT_REGION)))):
+            if region:
+                priority[region_col == region.strip().upper().encode("utf-8")] = rank
+        codes = self._keys["code_key"]
+        order = np.lexsort((np.arange(self.rows), priority, codes))
+        _, first = np.unique(codes[order], return_index=True)
+        rows = np.sort(order[first])
+
+        frame = pd.DataFrame({c: np.asarray(self._num[c][rows]) for c in NUMERIC_COLUMNS})
+        for col in TEXT_COLUMNS:
+            frame[col] = [self.text(col, int(i)) for i in rows]
+        frame["region"] = np.char.decode(np.asarray(region_col[rows]), "utf-8")
+        frame["category"] = np.char.decode(np.asarray(self._keys["category"][rows]), "utf-8")
+        return frame
+
+    def column(self, col: str) -> np.ndarray:
+        """Memory-mapped numeric or key column (no copy)."""
+        return self._num[col] if col in self._num else self._keys[col]
+
+
+_database: Optional[CostDatabase] = None
+_database_lock = threading.Lock()
+
+
+def get_cost_database() -> Optional[CostDatabase]:
+    """Process-wide store, built from settings.cost_database_source on first use.
+
+    Returns None when no CWICR source is configured so callers can fall back
+    to the built-in category table.
+    """
+    global _database
+    if _database is not None:
+        return _database
+    with _database_lock:
+        if _database is not None:
+            return _database
+        store = Path(settings.cost_database_dir)
+        source = Path(settings.cost_database_source) if settings.cost_database_source else None
+        manifest = store / MANIFEST
+        if source and source.exists():
+            stale = not manifest.exists() or (
+                json.loads(manifest.read_text()).get("source_mtime") != source.stat().st_mtime
+            )
+            if stale:
+                build_cost_database(source, store)
+        if not manifest.exists():
+            return None
+        _database = CostDatabase(store)
+        return _database
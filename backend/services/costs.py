@@ -1,6 +1,13 @@
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+import pandas as pd
+
+from backend.ddc_skills.cost_calculator import CWICRCostCalculator
+from backend.services.cost_database import CostDatabase, get_cost_database
+
 @dataclass
 class CostSuggestion:
     label: str
@@ -70,18 +77,58 @@ CATEGORY_METADATA = {
     },
 }
 
+# Calculators kept by _calculator_for (least recently used are dropped); each
+# holds a full catalog frame
+CALCULATOR_CACHE_SIZE = 8
+
+# (cost database, region) -> calculator over that region's catalog. Building the
+# frame and index is the expensive part of an estimate, so it is done once.
+# Regions the database has no rows for share the default region's calculator.
+_calculators: "OrderedDict[tuple, CWICRCostCalculator]" = OrderedDict()
+_calculators_lock = threading.Lock()
+
+
+def _calculator_for(cost_db: CostDatabase, region: Optional[str]) -> CWICRCostCalculator:
+    key = (id(cost_db), cost_db.canonical_region(region))
+    with _calculators_lock:
+        calc = _calculators.get(key)
+        if calc is None:
+            # Drop calculators built against a previous database instance
+            for stale in [k for k in _calculators if k[0] != id(cost_db)]:
+                del _calculators[stale]
+            calc = CWICRCostCalculator(cost_db.catalog_frame(key[1]))
+            _calculators[key] = calc
+            while len(_calculators) > CALCULATOR_CACHE_SIZE:
+                _calculators.popitem(last=False)
+        else:
+            _calculators.move_to_end(key)
+        return calc
+
+
 class CostService:
     @staticmethod
     def get_suggestions(category_code: str, state: Optional[str] = None, city: Optional[str] = None) -> List[Dict]:
-        factor = REGIONAL_FACTORS.get(state, REGIONAL_FACTORS["default"]) if state else 1.0
-        
-        if city and city.lower() in ["san francisco", "new york", "seattle"]:
-            factor *= 1.2
-            
         meta = CATEGORY_METADATA.get(category_code)
         if not meta:
             return []
-            
+
+        descriptions = meta["descriptions"]
+        cost_db = get_cost_database()
+        db_factor = None
+        if cost_db:
+            regions = (f"{state}:{city}" if state and city else None, state)
+            db_factor = cost_db.regional_factor(category_code, *regions)
+            stats = cost_db.regional_stats(category_code, *regions)
+            if stats and stats["descriptions"]:
+                descriptions = stats["descriptions"]
+
+        if db_factor is not None:
+            factor = db_factor
+        else:
+            factor = REGIONAL_FACTORS.get(state, REGIONAL_FACTORS["default"]) if state else 1.0
+            if city and city.lower() in ["san francisco", "new york", "seattle"]:
+                factor *= 1.2
+
         avg = meta["avg"] * factor
         low = meta["range"][0] * factor
         high = meta["range"][1] * factor
@@ -94,21 +141,78 @@ class CostService:
                 "label": "Budget", 
                 "amount": round(low, -2), 
                 "type": "low",
-                "description_options": meta["descriptions"],
+                "description_options": descriptions,
                 "rationale": f"Minimum viable cost{loc_str}. {meta['logic']}"
             },
             {
                 "label": "Standard", 
                 "amount": round(avg, -2), 
                 "type": "average",
-                "description_options": meta["descriptions"],
+                "description_options": descriptions,
                 "rationale": f"Median market rate{loc_str}. {meta['logic']}"
             },
             {
                 "label": "Premium", 
                 "amount": round(high, -2), 
                 "type": "high",
-                "description_options": meta["descriptions"],
+                "description_options": descriptions,
                 "rationale": f"High-end specifications{loc_str}. {meta['logic']}"
             },
         ]
+
+    @staticmethod
+    def get_unit_cost(work_item_code: str, region: Optional[str] = None) -> Optional[Dict]:
+        """Unit cost for a CWICR work item, or None if no cost database is loaded."""
+        cost_db = get_cost_database()
+        if not cost_db:
+            return None
+        return cost_db.unit_cost(work_item_code, region)
+
+    @staticmethod
+    def search_work_items(query: str, limit: int = 10) -> List[Dict]:
+        """Ranked CWICR work items matching a partial code or description."""
+        cost_db = get_cost_database()
+        if not cost_db:
+            return []
+        return cost_db.search(query, limit)
+
+    @staticmethod
+    def estimate_takeoff(qto: pd.DataFrame, code_column: str = "work_item_code",
+                         quantity_column: str = "quantity",
+                         region: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Priced QTO lines for a region, or None if no cost database is loaded."""
+        cost_db = get_cost_database()
+        if not cost_db:
+            return None
+        calc = _calculator_for(cost_db, region)
+        return calc.price_lines(qto[code_column], qto[quantity_column])
+
+    @staticmethod
+    def summarize_estimate(lines: pd.DataFrame, max_missing: int = 100) -> Dict:
+        """Totals, per-category subtotals and unmatched codes for priced QTO lines."""
+        totals = lines[["labor_cost", "material_cost", "equipment_cost",
+                        "overhead_cost", "profit_cost", "total_cost"]].sum()
+        codes = lines["work_item_code"]
+        by_category = lines.groupby(CWICRCostCalculator._category_of(codes), sort=True).agg(
+            item_count=("total_cost", "size"),
+            labor_cost=("labor_cost", "sum"),
+            material_cost=("material_cost", "sum"),
+            equipment_cost=("equipment_cost", "sum"),
+            total_cost=("total_cost", "sum"),
+        ).round(2)
+        missing = lines["status"] == "missing_data"
+        return {
+            "item_count": int(len(lines)),
+            "missing_count": int(missing.sum()),
+            "missing_codes": codes[missing].drop_duplicates().head(max_missing).tolist(),
+            "labor_total": round(float(totals["labor_cost"]), 2),
+            "material_total": round(float(totals["material_cost"]), 2),
+            "equipment_total": round(float(totals["equipment_cost"]), 2),
+            "overhead_total": round(float(totals["overhead_cost"]), 2),
+            "profit_total": round(float(totals["profit_cost"]), 2),
+            "total_cost": round(float(totals["total_cost"]), 2),
+            "labor_hours": round(float(lines["labor_hours"].sum()), 2),
+            "categories": [
+                {"category": cat, **row} for cat, row in by_category.to_dict("index").items()
+            ],
+        }
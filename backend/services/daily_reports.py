@@ -0,0 +1,305 @@
+"""Daily report PDFs, rendered in a process pool and cached in storage.
+
+A report request (one log, a list of logs or a calendar month) becomes a
+job whose id hashes the project, the format and each log's id and
+``updated_at``; ``updated_at`` moves whenever a log or its crew, work items
+or photos change. An unchanged request therefore gets the same id, and its
+output is served from storage (``exports/daily-reports/<project>/<job>/``)
+without rendering again. Several logs come out as one PDF with a page break
+between days, or as a ZIP of the single-day reports, which are cached like
+single-day requests. ReportLab runs in a process pool, as page layout is
+CPU-bound.
+
+Job state lives in the process that created the job; a finished job is
+found in storage by any server process. Cached files are deleted by the
+storage garbage collector after its grace period and rendered again when
+next requested.
+ReportLab is an optional dependency (``pip install buildflow[pdf]``).
+"""
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import re
+import shutil
+import threading
+import uuid
+import zipfile
+from calendar import monthrange
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import date
+from xml.sax.saxutils import escape
+
+from sqlalchemy.orm import Session, selectinload
+
+from backend.config import settings
+from backend.models.daily_log import DailyLog
+from backend.models.project import Project
+from backend.utils.file_storage import CHUNK_SIZE, get_upload_path
+from backend.utils.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+REPORT_PREFIX = "exports/daily-reports"
+# Finished and failed jobs remembered per process
+MAX_JOBS = 1000
+# Work item statuses reported as work completed; the others are listed as delays
+COMPLETED_STATUSES = {"completed", "partial"}
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_jobs: OrderedDict[str, "ReportJob"] = OrderedDict()
+_JOB_ID = re.compile(r"[0-9a-f]{20}")
+
+
+@dataclass
+class ReportJob:
+    id: str
+    project_id: int
+    format: str
+    filename: str
+    key: str
+    status: str = "pending"  # pending, running, done, failed
+    error: str | None = None
+    project_name: str = ""
+    # (key, filename, [(log date, report data)]) of each PDF to render; a PDF job's only part is its output
+    parts: list[tuple[str, str, list]] = field(default_factory=list, repr=False)
+
+
+def render_pdf(project_name: str, reports: list[tuple[date, dict]], output_path: str) -> str:
+    """Render (log date, report data) reports into one PDF. Runs in a worker process."""
+    from backend.ddc_skills.daily_report import DailyReportGenerator
+
+    generator = DailyReportGenerator({
+        'project_name': project_name,
+        # The app records daily logs in imperial units
+        'temp_unit': 'F',
+        'wind_unit': 'mph',
+        'date_format': '%m/%d/%Y',
+    })
+    return generator.generate_reports(reports, output_path)
+
+
+def _text(value: str | None) -> str:
+    """Free text as Paragraph markup, keeping line breaks."""
+    return escape(value or "").replace("\n", "<br/>")
+
+
+def _lines(value: str | None) -> list[str]:
+    return [escape(line.strip().lstrip("-*• ")) for line in (value or "").splitlines() if line.strip()]
+
+
+def _number(value: float | None) -> int | None:
+    return None if value is None else round(value)
+
+
+def report_data(log: DailyLog) -> dict:
+    """The DailyReportGenerator data of a log (with crew entries and work items loaded)."""
+    condition = log.weather_condition or "-"
+    if log.weather_impact:
+        condition += f" ({log.weather_impact} impact)"
+    trades = [
+        {
+            "trade": f"{crew.trade} ({crew.company_name})" if crew.company_name else crew.trade,
+            # Daily logs record actual crews only
+            "planned_count": "-",
+            "actual_count": crew.headcount or 0,
+            "actual_hours": crew.hours_worked or 0,
+        }
+        for crew in log.crew_entries
+    ]
+    completed, delayed = [], []
+    for item in log.work_items:
+        entry = {"trade": escape(item.trade or ""), "description": escape(item.description), "notes": escape(item.notes or "")}
+        if item.status in COMPLETED_STATUSES:
+            if item.status != "completed":
+                entry["notes"] = ", ".join(filter(None, [item.status, entry["notes"]]))
+            completed.append(entry)
+        else:
+            delayed.append({"category": entry["trade"] or item.status.title(), "description": entry["description"]})
+    return {
+        "report_number": log.report_number or f"DCR-{log.log_date:%Y-%j}",
+        "weather": {
+            "temp": _number(log.weather_temp),
+            "description": escape(condition),
+            "humidity": _number(log.weather_humidity),
+            "wind_speed": _number(log.weather_wind),
+            "icon": log.weather_condition or "",
+        },
+        "workforce": {
+            "trades": trades,
+            "total_workers": sum(t["actual_count"] for t in trades),
+            "total_hours": sum(t["actual_hours"] for t in trades),
+            "total_planned": "-",
+        },
+        "summary": _text(log.work_summary),
+        "work_completed": completed,
+        "work_planned": [{"description": line} for line in _lines(log.work_planned)],
+        "issues": delayed + [{"description": line} for line in _lines(log.issues)],
+        "safety": {"incidents": log.safety_incidents or 0, "notes": _text(log.safety_notes)},
+        "prepared_by": escape(log.prepared_by) if log.prepared_by else "_________________",
+        # The render is a function of the log version only
+        "prepared_at": log.updated_at,
+    }
+
+
+def _job_id(project_id: int, fmt: str, logs: list[DailyLog]) -> str:
+    versions = ";".join(f"{log.id}:{log.updated_at.isoformat()}" for log in logs)
+    return hashlib.sha256(f"{project_id}|{fmt}|{versions}".encode()).hexdigest()[:20]
+
+
+def _key(project_id: int, job_id: str, filename: str) -> str:
+    return f"{REPORT_PREFIX}/{project_id}/{job_id}/{filename}"
+
+
+def _log_part(project_id: int, log: DailyLog) -> tuple[str, str, list]:
+    filename = f"daily-report-{log.log_date.isoformat()}.pdf"
+    return _key(project_id, _job_id(project_id, "pdf", [log]), filename), filename, [(log.log_date, report_data(log))]
+
+
+def _remember(job: ReportJob) -> ReportJob:
+    _jobs[job.id] = job
+    _jobs.move_to_end(job.id)
+    while len(_jobs) > MAX_JOBS:
+        oldest = next(iter(_jobs.values()))
+        if oldest.status in ("pending", "running"):
+            break
+        _jobs.popitem(last=False)
+    return job
+
+
+def request_reports(
+    db: Session, project_id: int, log_ids: list[int], month: str | None, fmt: str,
+) -> ReportJob | None:
+    """The job rendering the given logs (or all logs of month, "YYYY-MM"); None if there are none.
+
+    The job's status is "pending" if it must be started with run_job.
+    """
+    project = db.get(Project, project_id)
+    if project is None:
+        return None
+    q = db.query(DailyLog).filter(DailyLog.project_id == project_id)
+    if month:
+        year, mon = map(int, month.split("-"))
+        q = q.filter(DailyLog.log_date.between(date(year, mon, 1), date(year, mon, monthrange(year, mon)[1])))
+    else:
+        q = q.filter(DailyLog.id.in_(log_ids))
+    logs = q.options(selectinload(DailyLog.crew_entries), selectinload(DailyLog.work_items)).order_by(DailyLog.log_date).all()
+    if not logs:
+        return None
+
+    job_id = _job_id(project_id, fmt, logs)
+    existing = _jobs.get(job_id)
+    if existing is not None and existing.status in ("pending", "running"):
+        return existing
+    if len(logs) == 1 and fmt == "pdf":
+        key, filename, reports = _log_part(project_id, logs[0])
+        parts = [(key, filename, reports)]
+    else:
+        span = month or (
+            f"{logs[0].log_date.isoformat()}-to-{logs[-1].log_date.isoformat()}" if len(logs) > 1 else logs[0].log_date.isoformat()
+        )
+        filename = f"daily-reports-{span}.{fmt}"
+        key = _key(project_id, job_id, filename)
+        if fmt == "zip":
+            parts = [_log_part(project_id, log) for log in logs]
+        else:
+            parts = [(key, filename, [(log.log_date, report_data(log)) for log in logs])]
+    job = ReportJob(
+        id=job_id, project_id=project_id, format=fmt, filename=filename, key=key,
+        project_name=project.name, parts=parts,
+    )
+    if get_storage().exists(key):
+        job.status, job.parts = "done", []
+    return _remember(job)
+
+
+def get_job(project_id: int, job_id: str) -> ReportJob | None:
+    """A job of this process, or a finished one found in storage."""
+    job = _jobs.get(job_id)
+    if job is not None:
+        return job if job.project_id == project_id else None
+    if not _JOB_ID.fullmatch(job_id):
+        return None
+    for obj in get_storage().list(f"{REPORT_PREFIX}/{project_id}/{job_id}/"):
+        filename = obj.key.rsplit("/", 1)[-1]
+        return ReportJob(
+            id=job_id, project_id=project_id, format=filename.rsplit(".", 1)[-1],
+            filename=filename, key=obj.key, status="done",
+        )
+    return None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the server process holds threads and open DB connections
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.report_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+async def _render(project_name: str, reports: list, key: str) -> None:
+    storage = get_storage()
+    if await asyncio.to_thread(storage.exists, key):
+        return
+    output = get_upload_path("tmp") / f"{uuid.uuid4().hex}.pdf"
+    try:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(_get_pool(), render_pdf, project_name, reports, str(output))
+        await storage.put(key, str(output))
+    finally:
+        output.unlink(missing_ok=True)
+
+
+def _write_zip(entries: list[tuple[str, str]], path: str) -> None:
+    storage = get_storage()
+    # PDFs are compressed already
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for arcname, key in entries:
+            with storage.open(key) as source, archive.open(arcname, "w", force_zip64=True) as dest:
+                shutil.copyfileobj(source, dest, CHUNK_SIZE)
+
+
+async def run_job(job: ReportJob) -> None:
+    """Render a pending job's PDFs (and ZIP) into storage."""
+    if job.status != "pending":
+        return
+    job.status = "running"
+    try:
+        await asyncio.gather(*(_render(job.project_name, reports, key) for key, _, reports in job.parts))
+        if job.format == "zip":
+            archive = get_upload_path("tmp") / f"{uuid.uuid4().hex}.zip"
+            try:
+                await asyncio.to_thread(_write_zip, [(filename, key) for key, filename, _ in job.parts], str(archive))
+                await get_storage().put(job.key, str(archive))
+            finally:
+                archive.unlink(missing_ok=True)
+    except ImportError as exc:
+        job.status, job.error = "failed", f"PDF export needs reportlab (pip install buildflow[pdf]): {exc}"
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool next time
+        logger.exception("Report worker crashed rendering job %s", job.id)
+        shutdown()
+        job.status, job.error = "failed", "Report rendering crashed"
+    except Exception:
+        logger.exception("Rendering daily report job %s failed", job.id)
+        job.status, job.error = "failed", "Report rendering failed"
+    else:
+        job.status = "done"
+    finally:
+        job.parts = []
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
@@ -0,0 +1,165 @@
+"""Document version chains and compact storage of superseded versions.
+
+Uploading a revision of a document adds a row on top of its chain: it
+points at the version it replaces (``parent_id``), every version shares the
+chain id (the first version's id), and only the newest has ``is_latest``,
+so document lists read just the latest versions through
+``ix_documents_project_latest`` and a chain's history is one range of
+``ix_documents_chain_version``.
+
+Files are content-addressed blobs, so re-uploading an unchanged revision
+stores nothing new. Once a version is superseded, its file is recompressed
+with gzip in the background when that saves at least ``MIN_SAVING`` and
+nothing else still uses it; it is then served as is with
+``Content-Encoding: gzip``. (Binary deltas against the previous revision
+are not used: plan sets are PDFs and DWGs whose content is deflate-compressed
+already, so a small edit changes most of the bytes, and a delta could not be
+served with ranges or presigned URLs straight from storage.)
+"""
+
+import asyncio
+import gzip
+import logging
+import os
+import shutil
+import uuid
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal
+from backend.models.blob import Blob
+from backend.models.document import Document
+from backend.models.search import reindex
+from backend.utils.file_storage import BLOB_REFERENCES, PATH_REFERENCES, CHUNK_SIZE, get_upload_path
+from backend.utils.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+# Compressed formats gzip cannot shrink
+INCOMPRESSIBLE_SUFFIXES = {
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".zip", ".gz", ".7z", ".rar",
+    ".docx", ".xlsx", ".pptx", ".mp4", ".mov", ".mp3",
+}
+MIN_SAVING = 0.1
+
+
+def chain_id(doc: Document) -> int:
+    return doc.chain_id or doc.id
+
+
+def latest_version(db: Session, doc: Document) -> Document:
+    if doc.is_latest or doc.chain_id is None:
+        return doc
+    return db.query(Document).filter(Document.chain_id == doc.chain_id).order_by(Document.version.desc()).first()
+
+
+def version_history(db: Session, doc: Document) -> list[Document]:
+    """Every version of doc's chain, newest first."""
+    if doc.chain_id is None:
+        return [doc]
+    return db.query(Document).filter(Document.chain_id == doc.chain_id).order_by(Document.version.desc()).all()
+
+
+def supersede(db: Session, latest: Document) -> bool:
+    """Mark the latest version as replaced; False if another upload replaced it first.
+
+    The replaced version leaves the search index.
+    """
+    if not db.query(Document).filter(Document.id == latest.id, Document.is_latest.is_(True)).update(
+        {"is_latest": False, "chain_id": chain_id(latest)}, synchronize_session="fetch",
+    ):
+        return False
+    # A bulk update bypasses the flush hook
+    reindex(db, [latest])
+    return True
+
+
+def unlink_version(db: Session, doc: Document) -> None:
+    """Close the gap a deleted version leaves in its chain (call before deleting it)."""
+    child = db.query(Document).filter(Document.parent_id == doc.id).first()
+    if child is not None:
+        child.parent_id = doc.parent_id
+    if doc.is_latest and doc.parent_id is not None:
+        db.get(Document, doc.parent_id).is_latest = True
+
+
+def _in_use(db: Session, sha256: str, key: str) -> bool:
+    """Whether anything but superseded document versions points at the blob."""
+    for model, _, ref_attr in BLOB_REFERENCES:
+        q = select(getattr(model, ref_attr)).where(getattr(model, ref_attr) == sha256)
+        if model is Document:
+            q = q.where(Document.is_latest.is_(True))
+        if db.execute(q.limit(1)).first():
+            return True
+    return any(
+        db.execute(select(getattr(model, path_attr)).where(getattr(model, path_attr) == key).limit(1)).first()
+        for model, path_attr in PATH_REFERENCES
+    )
+
+
+def _gzip_file(source: str, dest: str) -> int:
+    with open(source, "rb") as f, open(dest, "wb") as raw:
+        # mtime=0 keeps the output a pure function of the content
+        with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0) as out:
+            shutil.copyfileobj(f, out, CHUNK_SIZE)
+    return os.path.getsize(dest)
+
+
+def _compressible(sha256: str) -> tuple[str, int] | None:
+    """(key, size) of a blob that may be compressed, None if it is compressed already or in use."""
+    with SessionLocal() as db:
+        blob = db.get(Blob, sha256)
+        if blob is None or blob.content_encoding:
+            return None
+        key = blob.file_path
+        if os.path.splitext(key)[1].lower() in INCOMPRESSIBLE_SUFFIXES or _in_use(db, sha256, key):
+            return None
+        return key, blob.size
+
+
+def _point_at_compressed(sha256: str, key: str, new_key: str) -> bool:
+    """Move the blob and the rows using it from key to new_key; False if the blob changed meanwhile."""
+    with SessionLocal() as db:
+        moved = db.execute(update(Blob).where(Blob.sha256 == sha256, Blob.file_path == key).values(
+            file_path=new_key, content_encoding="gzip",
+        )).rowcount
+        if not moved:
+            db.rollback()
+            return False
+        for model, path_attr, ref_attr in BLOB_REFERENCES:
+            db.execute(update(model).where(getattr(model, ref_attr) == sha256).values({path_attr: new_key}))
+        db.commit()
+        return True
+
+
+async def compress_superseded(sha256: str | None) -> None:
+    """Store a superseded version's blob gzip-compressed, if it shrinks and nothing else uses it."""
+    if not sha256:
+        return
+    found = await asyncio.to_thread(_compressible, sha256)
+    if found is None:
+        return
+    key, original_size = found
+
+    storage = get_storage()
+    compressed = get_upload_path("tmp") / f"{uuid.uuid4().hex}.gz"
+    try:
+        async with storage.local_path(key) as path:
+            size = await asyncio.to_thread(_gzip_file, path, str(compressed))
+        if size > original_size * (1 - MIN_SAVING):
+            return
+        new_key = f"{key}.gz"
+        await storage.put(new_key, str(compressed), content_encoding="gzip")
+    except FileNotFoundError:
+        logger.warning("Blob file missing, not compressed: %s", key)
+        return
+    finally:
+        compressed.unlink(missing_ok=True)
+
+    if not await asyncio.to_thread(_point_at_compressed, sha256, key, new_key):
+        # Changed meanwhile (compressed by another worker, or restored by an upload)
+        await asyncio.to_thread(storage.delete, new_key)
+        return
+    await asyncio.to_thread(storage.delete, key)
+    logger.info("Compressed superseded version %s: %d -> %d bytes", key, original_size, size)
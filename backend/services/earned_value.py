@@ -0,0 +1,267 @@
+"""Earned value engine — time-phased PV/EV/AC S-curves per project and category."""
+
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.models.project import Project
+from backend.models.budget import BudgetCategory, BudgetItem, CostEntry
+from backend.models.schedule import Activity
+from backend.schemas.analytics import (
+    EVMPeriodResult, EVMCategoryResult, EarnedValueResult,
+)
+
+# project_id -> (version key, result). Curves only change when the schedule,
+# budget or cost entries do, so the KPI endpoint can reuse them.
+_curve_cache: dict[int, tuple[tuple, EarnedValueResult]] = {}
+_cache_lock = threading.Lock()
+
+
+def _project_version(db: Session, project_id: int) -> tuple:
+    """Cheap fingerprint of everything the curves are derived from."""
+    project_row = db.query(Project.updated_at).filter(Project.id == project_id).first()
+    items_row = db.query(
+        func.count(BudgetItem.id), func.max(BudgetItem.id), func.max(BudgetItem.updated_at),
+    ).filter(BudgetItem.project_id == project_id).one()
+    cats_row = db.query(
+        func.count(BudgetCategory.id), func.max(BudgetCategory.id),
+    ).filter(BudgetCategory.project_id == project_id).one()
+    acts_row = db.query(
+        func.count(Activity.id), func.max(Activity.id), func.max(Activity.updated_at),
+    ).filter(Activity.project_id == project_id).one()
+    costs_row = db.query(
+        func.count(CostEntry.id), func.max(CostEntry.id), func.max(CostEntry.updated_at),
+    ).filter(CostEntry.project_id == project_id).one()
+    return (
+        date.today(),
+        project_row[0] if project_row else None,
+        tuple(items_row), tuple(cats_row), tuple(acts_row), tuple(costs_row),
+    )
+
+
+def _month_starts(start: date, end: date) -> list[date]:
+    """First-of-month dates covering start..end inclusive."""
+    months = []
+    current = date(start.year, start.month, 1)
+    while current <= end:
+        months.append(current)
+        if current.month == 12:
+            current = date(current.year + 1, 1, 1)
+        else:
+            current = date(current.year, current.month + 1, 1)
+    return months
+
+
+def _linear_progress(t: np.ndarray, starts: np.ndarray, finishes: np.ndarray) -> np.ndarray:
+    """Fraction of each window [start, finish) elapsed at each time t -> (n_windows, n_times)."""
+    span = np.maximum(finishes - starts, 1.0)
+    return np.clip((t[None, :] - starts[:, None]) / span[:, None], 0.0, 1.0)
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """Elementwise num/den with NaN where the denominator is zero."""
+    out = np.full(num.shape, np.nan)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def _opt(value: float, digits: int = 2) -> float | None:
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def _build_periods(
+    labels: list[str], pv: np.ndarray, ev: np.ndarray, ac: np.ndarray,
+    bac: float, data_idx: int,
+) -> list[EVMPeriodResult]:
+    """Turn cumulative 1-D curves into period results; EV/AC stop at the data date."""
+    pv_period = np.diff(pv, prepend=0.0)
+    ev_period = np.diff(ev, prepend=0.0)
+    ac_period = np.diff(ac, prepend=0.0)
+    spi = _ratio(ev, pv)
+    cpi = _ratio(ev, ac)
+    # EAC = BAC / CPI; without a usable CPI the remaining work is assumed at budget.
+    valid = np.nan_to_num(cpi) > 0
+    eac = np.where(valid, bac / np.where(valid, cpi, 1.0), ac + bac - ev)
+    etc = eac - ac
+
+    periods = []
+    for i, label in enumerate(labels):
+        actual = i <= data_idx
+        periods.append(EVMPeriodResult(
+            period_label=label,
+            planned_value=round(float(pv_period[i]), 2),
+            earned_value=round(float(ev_period[i]), 2) if actual else None,
+            actual_cost=round(float(ac_period[i]), 2) if actual else None,
+            cumulative_pv=round(float(pv[i]), 2),
+            cumulative_ev=round(float(ev[i]), 2) if actual else None,
+            cumulative_ac=round(float(ac[i]), 2) if actual else None,
+            spi=_opt(spi[i], 3) if actual else None,
+            cpi=_opt(cpi[i], 3) if actual else None,
+            eac=_opt(eac[i]) if actual else None,
+            etc=_opt(etc[i]) if actual else None,
+        ))
+    return periods
+
+
+def _compute_earned_value(db: Session, project_id: int) -> EarnedValueResult:
+    project = db.query(Project).filter(Project.id == project_id).first()
+    categories = db.query(BudgetCategory).filter(
+        BudgetCategory.project_id == project_id
+    ).order_by(BudgetCategory.sort_order).all()
+    items = db.query(BudgetItem).filter(BudgetItem.project_id == project_id).all()
+    activities = db.query(Activity).filter(Activity.project_id == project_id).all()
+    entries = db.query(
+        CostEntry.entry_date, CostEntry.amount, BudgetItem.category_id,
+    ).join(BudgetItem, BudgetItem.id == CostEntry.budget_item_id).filter(
+        CostEntry.project_id == project_id, CostEntry.entry_type == "actual",
+    ).all()
+
+    today = date.today()
+    project_start = project.start_date if project and project.start_date else today
+
+    # --- Schedule windows (planned and actual) as day ordinals ---
+    n_acts = len(activities)
+    plan_start = np.empty(n_acts)
+    plan_finish = np.empty(n_acts)
+    act_start = np.empty(n_acts)
+    act_finish = np.empty(n_acts)
+    earned_pct = np.empty(n_acts)
+    weights = np.empty(n_acts)
+    base = project_start.toordinal()
+    today_ord = today.toordinal()
+    for i, a in enumerate(activities):
+        ps = a.planned_start.toordinal() if a.planned_start else base + a.early_start
+        pf = a.planned_finish.toordinal() + 1 if a.planned_finish else base + a.early_finish
+        plan_start[i], plan_finish[i] = ps, max(pf, ps + 1)
+        pct = 1.0 if a.status == "completed" else (a.percent_complete or 0) / 100
+        earned_pct[i] = pct
+        as_ = a.actual_start.toordinal() if a.actual_start else ps
+        if a.actual_finish:
+            af = a.actual_finish.toordinal() + 1
+        elif pct > 0:
+            af = max(today_ord + 1, as_ + 1)
+        else:
+            af = pf
+        act_start[i], act_finish[i] = as_, max(af, as_ + 1)
+        weights[i] = max(a.duration_days or 0, 0)
+    if n_acts and weights.sum() == 0:
+        weights[:] = 1.0
+    if n_acts:
+        weights = weights / weights.sum()
+
+    # --- Period grid ---
+    bounds = [project_start, today]
+    if project and project.target_end_date:
+        bounds.append(project.target_end_date)
+    if n_acts:
+        bounds.append(date.fromordinal(int(plan_start.min())))
+        bounds.append(date.fromordinal(int(plan_finish.max()) - 1))
+    if entries:
+        bounds.extend(e.entry_date for e in entries)
+    months = _month_starts(min(bounds), max(bounds))
+    n_periods = len(months)
+    starts = np.array([m.toordinal() for m in months], dtype=float)
+    ends = np.append(starts[1:], (months[-1] + timedelta(days=32)).replace(day=1).toordinal())
+    data_idx = int(np.searchsorted(starts, today_ord, side="right") - 1)
+    t_eval = ends.copy()
+    t_eval[data_idx] = today_ord + 1
+    labels = [m.strftime("%b %Y") for m in months]
+
+    # --- Schedule-driven fractions (shared curve shape) ---
+    if n_acts:
+        pv_frac = weights @ _linear_progress(t_eval, plan_start, plan_finish)
+        ev_frac = weights @ (earned_pct[:, None] * _linear_progress(t_eval, act_start, act_finish))
+    else:
+        # No schedule: spread the budget linearly between project start and end.
+        end = project.target_end_date if project and project.target_end_date else project_start + timedelta(days=270)
+        end_ord = end.toordinal() + 1
+        pv_frac = _linear_progress(t_eval, np.array([float(base)]), np.array([float(end_ord)]))[0]
+        ev_frac = np.zeros(n_periods)
+    sched_pct_today = float(ev_frac[data_idx])
+    if sched_pct_today > 0:
+        ev_shape = ev_frac / sched_pct_today
+    else:
+        ev_shape = (np.arange(n_periods) >= data_idx).astype(float)
+
+    # --- Per-category budget, progress and actuals ---
+    cat_index = {c.id: i for i, c in enumerate(categories)}
+    n_cats = len(categories)
+    bac_c = np.zeros(n_cats)
+    earned_c = np.zeros(n_cats)
+    item_actual_c = np.zeros(n_cats)
+    for it in items:
+        ci = cat_index.get(it.category_id)
+        if ci is None:
+            continue
+        bac_c[ci] += it.current_budget
+        earned_c[ci] += it.current_budget * (it.percent_complete or 0) / 100
+        item_actual_c[ci] += it.actual_cost
+    if earned_c.sum() > 0:
+        pct_c = _ratio(earned_c, bac_c)
+        pct_c = np.nan_to_num(pct_c)
+    else:
+        pct_c = np.full(n_cats, sched_pct_today)
+
+    ac_matrix = np.zeros((n_cats, n_periods))
+    if entries:
+        e_cat = np.array([cat_index.get(e.category_id, -1) for e in entries])
+        e_ord = np.array([e.entry_date.toordinal() for e in entries], dtype=float)
+        e_amt = np.array([e.amount for e in entries], dtype=float)
+        e_per = np.clip(np.searchsorted(starts, e_ord, side="right") - 1, 0, n_periods - 1)
+        keep = e_cat >= 0
+        np.add.at(ac_matrix, (e_cat[keep], e_per[keep]), e_amt[keep])
+    # Actual cost recorded on items without dated entries lands on the data date.
+    residual = np.maximum(item_actual_c - ac_matrix.sum(axis=1), 0.0)
+    ac_matrix[:, data_idx] += residual
+
+    pv_cum = bac_c[:, None] * pv_frac[None, :]
+    ev_cum = (bac_c * pct_c)[:, None] * ev_shape[None, :]
+    ac_cum = np.cumsum(ac_matrix, axis=1)
+
+    cat_results = [
+        EVMCategoryResult(
+            category_code=c.code,
+            category_name=c.name,
+            budget_at_completion=round(float(bac_c[i]), 2),
+            periods=_build_periods(labels, pv_cum[i], ev_cum[i], ac_cum[i], float(bac_c[i]), data_idx),
+        )
+        for i, c in enumerate(categories)
+    ]
+
+    bac = float(bac_c.sum())
+    pv_tot = pv_cum.sum(axis=0)
+    ev_tot = ev_cum.sum(axis=0)
+    ac_tot = ac_cum.sum(axis=0)
+    periods = _build_periods(labels, pv_tot, ev_tot, ac_tot, bac, data_idx)
+    current = periods[data_idx]
+
+    return EarnedValueResult(
+        project_name=project.name if project else "",
+        data_date=str(today),
+        budget_at_completion=round(bac, 2),
+        planned_value=current.cumulative_pv,
+        earned_value=current.cumulative_ev or 0,
+        actual_cost=current.cumulative_ac or 0,
+        spi=current.spi,
+        cpi=current.cpi,
+        eac=current.eac if current.eac is not None else round(bac, 2),
+        etc=current.etc if current.etc is not None else round(bac, 2),
+        periods=periods,
+        categories=cat_results,
+    )
+
+
+def run_earned_value(db: Session, project_id: int) -> EarnedValueResult:
+    """Time-phased earned value analysis, cached until the project data changes."""
+    version = _project_version(db, project_id)
+    with _cache_lock:
+        cached = _curve_cache.get(project_id)
+    if cached and cached[0] == version:
+        return cached[1]
+    result = _compute_earned_value(db, project_id)
+    with _cache_lock:
+        _curve_cache[project_id] = (version, result)
+    return result
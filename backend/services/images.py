@@ -0,0 +1,161 @@
+"""Photo derivatives: thumbnails and medium-size copies of uploaded photos.
+
+After a photo upload the blob is rendered in a process pool (Pillow
+decoding and resampling is CPU-bound and would hold the GIL) into one WebP
+and one JPEG per size in ``IMAGE_DERIVATIVE_SIZES``. They are stored under
+the keys ``derived/<sha[:2]>/<sha>-<px>.webp|jpg``. The EXIF orientation is
+applied to the pixels and all metadata (including GPS) is dropped.
+Derivatives are keyed by the blob's hash and size, so a photo uploaded twice is
+rendered once, and the files never change once written. Once they are
+stored the blob's ``derived_at`` is set; photo rows load that flag with the
+row, so building their URLs never asks storage whether the files exist.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+from sqlalchemy import update
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.models.blob import Blob
+from backend.utils.file_storage import get_upload_path
+from backend.utils.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _derived_key(sha256: str, name: str) -> str:
+    return f"derived/{sha256[:2]}/{name}"
+
+
+def _sizes() -> list[int]:
+    return sorted(set(settings.image_derivative_sizes.values()), reverse=True)
+
+
+def derivative_sha256(key: str) -> str:
+    """The blob hash a derivative key belongs to."""
+    return key.rsplit("/", 1)[-1].split("-", 1)[0]
+
+
+def render_derivatives(source: str, dest_dir: str, sha256: str, sizes: list[int], quality: int) -> list[str]:
+    """Write WebP and JPEG copies of source at each max edge in sizes (largest first).
+
+    Runs in a worker process. Returns the names of the files written, in
+    order, or none if source is not an image Pillow can read.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(source) as original:
+            # JPEG can decode straight to a reduced scale, far cheaper than a full decode
+            original.draft("RGB", (sizes[0], sizes[0]))
+            image = ImageOps.exif_transpose(original)
+    except (UnidentifiedImageError, OSError):
+        return []
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if image.mode in ("LA", "PA") or "transparency" in image.info else "RGB")
+
+    os.makedirs(dest_dir, exist_ok=True)
+    written = []
+    for px in sizes:
+        # Each size is resampled from the previous, larger one
+        image.thumbnail((px, px), Image.Resampling.LANCZOS)
+        for fmt, ext, frame in (
+            ("WEBP", "webp", image),
+            ("JPEG", "jpg", image if image.mode == "RGB" else image.convert("RGB")),
+        ):
+            name = f"{sha256}-{px}.{ext}"
+            frame.save(os.path.join(dest_dir, name), fmt, quality=quality)
+            written.append(name)
+    return written
+
+
+def derivatives_stored(sha256: str) -> bool:
+    """Whether storage holds a blob's derivatives at the configured sizes (a storage lookup)."""
+    # The smallest JPEG is stored last
+    return get_storage().exists(_derived_key(sha256, f"{sha256}-{_sizes()[-1]}.jpg"))
+
+
+def derivative_urls(sha256: str | None, rendered: bool | None) -> dict[str, str] | None:
+    """Static URLs of a blob's derivatives, or None until they have been rendered.
+
+    rendered is the referencing row's flag (``derivatives_rendered``).
+    Keys are the configured size names (WebP) plus ``<name>_jpeg``.
+    """
+    if not sha256 or not rendered:
+        return None
+    storage = get_storage()
+    urls = {}
+    for name, px in settings.image_derivative_sizes.items():
+        urls[name] = storage.url(_derived_key(sha256, f"{sha256}-{px}.webp"))
+        urls[f"{name}_jpeg"] = storage.url(_derived_key(sha256, f"{sha256}-{px}.jpg"))
+    return urls
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the server process holds threads and open DB connections
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.image_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _mark_rendered(sha256: str) -> None:
+    with SessionLocal() as db:
+        db.execute(update(Blob).where(Blob.sha256 == sha256).values(derived_at=datetime.utcnow()))
+        db.commit()
+
+
+async def generate_derivatives(sha256: str, source: str) -> None:
+    """Render a photo blob's derivatives (source is its key) in the process pool (no-op if they already exist)."""
+    if await asyncio.to_thread(derivatives_stored, sha256):
+        await asyncio.to_thread(_mark_rendered, sha256)
+        return
+    storage = get_storage()
+    loop = asyncio.get_running_loop()
+    work_dir = get_upload_path(f"tmp/{uuid.uuid4().hex}")
+    try:
+        async with storage.local_path(source) as path:
+            written = await loop.run_in_executor(
+                _get_pool(), render_derivatives,
+                path, str(work_dir), sha256, _sizes(), settings.image_quality,
+            )
+        for name in written:
+            await storage.put(_derived_key(sha256, name), str(work_dir / name))
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory on a huge image); start a fresh pool next time
+        logger.exception("Image worker crashed rendering %s", source)
+        shutdown()
+        return
+    except Exception:
+        logger.exception("Rendering derivatives of %s failed", source)
+        return
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    if not written:
+        logger.warning("Not an image, no derivatives rendered: %s", source)
+        return
+    await asyncio.to_thread(_mark_rendered, sha256)
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
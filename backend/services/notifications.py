@@ -1,6 +1,7 @@
 """Smart Notification Service — proactive alerts across all modules."""
 
 from datetime import date, timedelta
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from backend.models.project import Project
 from backend.models.budget import BudgetItem
@@ -129,6 +130,18 @@ def generate_notifications(db: Session, project_id: int) -> NotificationList:
 
     # --- Subcontractor alerts ---
     subs = db.query(Subcontractor).filter(Subcontractor.project_id == project_id).all()
+    # Paid payments without a lien waiver, counted per subcontractor in one query
+    missing_waivers = dict(db.query(
+        SubcontractorPayment.subcontractor_id, func.count(SubcontractorPayment.id),
+    ).join(
+        Subcontractor, Subcontractor.id == SubcontractorPayment.subcontractor_id
+    ).outerjoin(
+        LienWaiver, LienWaiver.payment_id == SubcontractorPayment.id
+    ).filter(
+        Subcontractor.project_id == project_id,
+        SubcontractorPayment.paid_date.isnot(None),
+        LienWaiver.id.is_(None),
+    ).group_by(SubcontractorPayment.subcontractor_id).all())
     for sub in subs:
         if sub.insurance_expiry:
             try:
@@ -148,18 +161,11 @@ def generate_notifications(db: Session, project_id: int) -> NotificationList:
                 pass
 
         # Check for missing lien waivers
-        payments = db.query(SubcontractorPayment).filter(
-            SubcontractorPayment.subcontractor_id == sub.id,
-            SubcontractorPayment.paid_date.isnot(None),
-        ).all()
-        paid_ids = {p.id for p in payments}
-        waivers = db.query(LienWaiver).filter(LienWaiver.payment_id.in_(paid_ids)).all() if paid_ids else []
-        waiver_payment_ids = {w.payment_id for w in waivers}
-        missing = [p for p in payments if p.id not in waiver_payment_ids]
+        missing = missing_waivers.get(sub.id, 0)
         if missing:
             _add("subcontractors", "warning",
                  f"Missing Waivers: {sub.company_name}",
-                 f"{len(missing)} payments without lien waivers.",
+                 f"{missing} payments without lien waivers.",
                  "/subcontractors")
 
     # Sort: critical first, then warning, then info
@@ -0,0 +1,126 @@
+"""Ranked full-text search over a project's documents, daily logs, punch items and inspections.
+
+The query text is reduced to its words, all of which must match (the last
+one as a prefix, so results follow the user's typing). Titles weigh more
+than bodies: BM25 with a 10x title weight on SQLite, ``ts_rank_cd`` over a
+tsvector with title at weight A and body at weight B on PostgreSQL. Results
+are ordered by score, then index key, and paged by keyset on that pair.
+Snippets are only built for the rows of the page.
+"""
+
+import html
+import re
+
+from sqlalchemy import BigInteger, Float, bindparam, column, text
+from sqlalchemy.orm import Session
+
+from backend.schemas.search import SearchHit
+from backend.utils.pagination import DEFAULT_PAGE_SIZE, PageParams, decode_cursor, encode_cursor
+
+MAX_TERMS = 16
+# Highlight markers; the snippet is HTML-escaped and they become <mark> tags
+_START, _STOP = "\x02", "\x03"
+_CURSOR_KEYS = (column("score", Float), column("key", BigInteger))
+
+_SQLITE_PAGE = """
+SELECT key, entity_type, entity_id, title, score FROM (
+    SELECT rowid AS key, entity_type, entity_id, title, bm25(search_index, 0, 0, 0, 10.0, 1.0) AS score
+    FROM search_index
+    WHERE search_index MATCH :query AND project_id = :project_id {types}
+)
+{after}
+ORDER BY score, key
+LIMIT :limit
+"""
+
+_SQLITE_SNIPPETS = """
+SELECT rowid, snippet(search_index, -1, char(2), char(3), '…', 24)
+FROM search_index
+WHERE search_index MATCH :query AND rowid IN :keys
+"""
+
+_PG_PAGE = """
+SELECT key, entity_type, entity_id, title, score,
+       ts_headline('english', title || E'\n' || body, query, :headline) AS snippet
+FROM (
+    SELECT id AS key, entity_type, entity_id, title, body, query,
+           (-ts_rank_cd(tsv, query))::float8 AS score
+    FROM search_index, to_tsquery('english', :query) AS query
+    WHERE project_id = :project_id AND tsv @@ query {types}
+) hits
+{after}
+ORDER BY score, key
+LIMIT :limit
+"""
+_PG_HEADLINE = f"StartSel={_START}, StopSel={_STOP}, MaxWords=24, MinWords=8, MaxFragments=2"
+
+
+def query_terms(q: str) -> list[str]:
+    return re.findall(r"\w+", q.lower())[:MAX_TERMS]
+
+
+def _fts5_query(terms: list[str]) -> str:
+    return " ".join(f'"{t}"' for t in terms) + "*"
+
+
+def _tsquery(terms: list[str]) -> str:
+    return " & ".join(terms) + ":*"
+
+
+def _highlight(snippet: str | None) -> str:
+    return html.escape(snippet or "").replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+def search(
+    db: Session, project_id: int, q: str, types: list[str] | None, page: PageParams
+) -> tuple[list[SearchHit], str | None]:
+    """One page of hits for q in a project, best first, and the cursor for the next page."""
+    terms = query_terms(q)
+    if not terms:
+        return [], None
+    # Search results are always paged
+    limit = page.limit or DEFAULT_PAGE_SIZE
+    params = {"project_id": project_id, "limit": limit + 1}
+    type_filter = after = ""
+    if types:
+        type_filter = "AND entity_type IN :types"
+        params["types"] = list(types)
+    if page.cursor:
+        # (score, key) row values: SQLite compares them like PostgreSQL
+        after = "WHERE (score, key) > (:after_score, :after_key)"
+        params["after_score"], params["after_key"] = decode_cursor(page.cursor, _CURSOR_KEYS)
+
+    postgres = db.get_bind().dialect.name == "postgresql"
+    sql = (_PG_PAGE if postgres else _SQLITE_PAGE).format(types=type_filter, after=after)
+    stmt = text(sql)
+    if types:
+        stmt = stmt.bindparams(bindparam("types", expanding=True))
+    if postgres:
+        params.update(query=_tsquery(terms), headline=_PG_HEADLINE)
+    else:
+        params["query"] = _fts5_query(terms)
+    rows = db.execute(stmt, params).mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor((rows[-1]["score"], rows[-1]["key"]))
+    if postgres:
+        snippets = {row["key"]: row["snippet"] for row in rows}
+    elif rows:
+        stmt = text(_SQLITE_SNIPPETS).bindparams(bindparam("keys", expanding=True))
+        snippets = dict(db.execute(stmt, {"query": params["query"], "keys": [row["key"] for row in rows]}).all())
+    else:
+        snippets = {}
+
+    hits = [
+        SearchHit(
+            entity_type=row["entity_type"],
+            entity_id=row["entity_id"],
+            title=row["title"],
+            snippet=_highlight(snippets.get(row["key"])),
+            score=-row["score"],
+        )
+        for row in rows
+    ]
+    return hits, next_cursor
@@ -0,0 +1,193 @@
+"""Project history snapshots — daily budget/KPI rollups and downsampled trends."""
+
+import asyncio
+import logging
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import case, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.database import SessionLocal, is_unique_violation
+from backend.models.project import Project
+from backend.models.budget import BudgetItem
+from backend.models.schedule import Activity
+from backend.models.permit import Inspection
+from backend.models.punchlist import PunchItem
+from backend.models.history import ProjectSnapshot
+from backend.schemas.analytics import TrendPoint, TrendResult
+from backend.services.earned_value import run_earned_value
+
+logger = logging.getLogger(__name__)
+
+TREND_FIELDS = (
+    "total_budget", "total_committed", "total_actual", "total_forecast",
+    "planned_value", "earned_value", "spi", "cpi", "eac",
+    "percent_complete", "first_pass_yield", "open_punch_items",
+)
+
+
+def record_snapshot(db: Session, project_id: int, snapshot_date: date | None = None) -> ProjectSnapshot:
+    """Write (or overwrite) the rollup row for one project and day."""
+    snapshot_date = snapshot_date or date.today()
+    budget = db.query(
+        func.coalesce(func.sum(BudgetItem.current_budget), 0),
+        func.coalesce(func.sum(BudgetItem.committed_cost), 0),
+        func.coalesce(func.sum(BudgetItem.actual_cost), 0),
+        func.coalesce(func.sum(BudgetItem.forecast_cost), 0),
+    ).filter(BudgetItem.project_id == project_id).one()
+    total_acts, completed_acts = db.query(
+        func.count(Activity.id),
+        func.coalesce(func.sum(case((Activity.status == "completed", 1), else_=0)), 0),
+    ).filter(Activity.project_id == project_id).one()
+    total_insp, passed_insp = db.query(
+        func.count(Inspection.id),
+        func.coalesce(func.sum(case((Inspection.result == "pass", 1), else_=0)), 0),
+    ).filter(Inspection.project_id == project_id, Inspection.result.isnot(None)).one()
+    open_punch = db.query(func.count(PunchItem.id)).filter(
+        PunchItem.project_id == project_id,
+        PunchItem.status.notin_(["Verified", "Completed"]),
+    ).scalar()
+    evm = run_earned_value(db, project_id)
+
+    values = dict(
+        total_budget=budget[0], total_committed=budget[1],
+        total_actual=budget[2], total_forecast=budget[3],
+        planned_value=evm.planned_value, earned_value=evm.earned_value,
+        spi=evm.spi, cpi=evm.cpi, eac=evm.eac,
+        percent_complete=round(completed_acts / total_acts * 100, 1) if total_acts else 0,
+        first_pass_yield=round(passed_insp / total_insp * 100, 1) if total_insp else None,
+        open_punch_items=open_punch,
+    )
+
+    # Upsert; a concurrent writer (cron + in-process job) may insert the row first.
+    for attempt in range(2):
+        snap = db.query(ProjectSnapshot).filter(
+            ProjectSnapshot.project_id == project_id,
+            ProjectSnapshot.snapshot_date == snapshot_date,
+        ).first()
+        if not snap:
+            snap = ProjectSnapshot(project_id=project_id, snapshot_date=snapshot_date)
+            db.add(snap)
+        for key, val in values.items():
+            setattr(snap, key, val)
+        try:
+            db.commit()
+            return snap
+        except IntegrityError as exc:
+            db.rollback()
+            if attempt or not is_unique_violation(exc):
+                raise
+    return snap
+
+
+def record_all_snapshots(snapshot_date: date | None = None) -> int:
+    """Snapshot every active project; returns the number of rows written.
+
+    A project that fails is logged and skipped so the others are still recorded.
+    """
+    db = SessionLocal()
+    try:
+        ids = [pid for (pid,) in db.query(Project.id).filter(Project.status == "active").all()]
+        written = 0
+        for pid in ids:
+            try:
+                record_snapshot(db, pid, snapshot_date)
+            except Exception:
+                db.rollback()
+                logger.exception("Snapshot of project %d failed", pid)
+                continue
+            written += 1
+        return written
+    finally:
+        db.close()
+
+
+async def snapshot_loop():
+    """Background job: snapshot all projects, then repeat every interval."""
+    interval = settings.snapshot_interval_hours * 3600
+    while True:
+        try:
+            count = await asyncio.to_thread(record_all_snapshots)
+            logger.info("Recorded %d project snapshots", count)
+        except Exception:
+            logger.exception("Project snapshot job failed")
+        await asyncio.sleep(interval)
+
+
+def _downsample(df: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """Average consecutive rows into at most max_points buckets, keeping each bucket's last date."""
+    if len(df) <= max_points:
+        return df
+    bucket_size = -(-len(df) // max_points)
+    grouped = df.groupby(df.index // bucket_size)
+    out = grouped[list(TREND_FIELDS)].mean()
+    out.insert(0, "snapshot_date", grouped["snapshot_date"].last())
+    return out
+
+
+def _trend(previous: float | None, recent: float | None) -> str:
+    """Same 2% band as ProjectKPIDashboard._calculate_trend."""
+    if previous is None or recent is None or pd.isna(previous) or pd.isna(recent):
+        return "stable"
+    if recent > previous * 1.02:
+        return "up"
+    if recent < previous * 0.98:
+        return "down"
+    return "stable"
+
+
+def get_trends(
+    db: Session, project_id: int,
+    start: date | None = None, end: date | None = None, max_points: int = 200,
+) -> TrendResult:
+    """Read a snapshot range and downsample it for charting."""
+    q = db.query(
+        ProjectSnapshot.snapshot_date,
+        *[getattr(ProjectSnapshot, f) for f in TREND_FIELDS],
+    ).filter(ProjectSnapshot.project_id == project_id)
+    if start:
+        q = q.filter(ProjectSnapshot.snapshot_date >= start)
+    if end:
+        q = q.filter(ProjectSnapshot.snapshot_date <= end)
+    rows = q.order_by(ProjectSnapshot.snapshot_date).all()
+
+    df = pd.DataFrame(rows, columns=["snapshot_date", *TREND_FIELDS])
+    sampled = _downsample(df, max(max_points, 2)).astype(object)
+    sampled = sampled.where(pd.notna(sampled), None)
+    points = [TrendPoint(**rec) for rec in sampled.to_dict("records")]
+
+    directions = {"up": "increasing", "down": "decreasing", "stable": "stable"}
+    if len(df) >= 2:
+        first, last = df.iloc[0], df.iloc[-1]
+        forecast_trend = directions[_trend(first["total_forecast"], last["total_forecast"])]
+        actual_trend = directions[_trend(first["total_actual"], last["total_actual"])]
+        forecast_change = round(float(last["total_forecast"] - first["total_forecast"]), 2)
+        actual_change = round(float(last["total_actual"] - first["total_actual"]), 2)
+    else:
+        forecast_trend = actual_trend = "insufficient_data"
+        forecast_change = actual_change = 0.0
+
+    return TrendResult(
+        project_id=project_id,
+        data_points=len(df),
+        returned_points=len(points),
+        forecast_trend=forecast_trend,
+        forecast_change=forecast_change,
+        actual_trend=actual_trend,
+        actual_change=actual_change,
+        points=points,
+    )
+
+
+def metric_trends(db: Session, project_id: int) -> dict[str, str]:
+    """Up/down/stable for each snapshot metric, comparing the two latest days."""
+    rows = db.query(ProjectSnapshot).filter(
+        ProjectSnapshot.project_id == project_id
+    ).order_by(ProjectSnapshot.snapshot_date.desc()).limit(2).all()
+    if len(rows) < 2:
+        return {}
+    recent, previous = rows
+    return {f: _trend(getattr(previous, f), getattr(recent, f)) for f in TREND_FIELDS}
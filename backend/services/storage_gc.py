@@ -0,0 +1,251 @@
+"""Garbage collection of uploaded files nothing points at any more.
+
+Deleting a document, a daily log (and its photos), a project or any other
+row with a file only removes the row; the blob it referenced is left with
+one reference fewer. ``collect_garbage`` reconciles storage with the
+database in batches and deletes what is orphaned:
+
+- blobs that no row references, by hash (the ``BLOB_REFERENCES`` columns,
+  recounted to repair a drifted ``ref_count``) or by path (those columns
+  plus cost entry receipts and bid proposals, which store paths only),
+  together with their extracted text;
+- files under ``blobs/`` without a blob row, and photo derivatives under
+  ``derived/`` whose blob is gone;
+- cached daily report PDFs and ZIPs (rendered again when next requested);
+- on local disk, files in the ``photos/`` and ``documents/`` folders of
+  uploads saved before blobs existed that no row references, and temporary
+  files under ``tmp/`` left by interrupted uploads.
+
+Nothing is deleted before ``STORAGE_GC_GRACE_HOURS`` have passed since a
+blob lost its last reference (``Blob.orphaned_at``) or since the file was
+written, so uploads still being attached and files written by in-flight
+requests are left alone. A blob row is only deleted if it is still
+unreferenced at that moment, and its file only after that is committed.
+Runs in-process every ``STORAGE_GC_INTERVAL_HOURS`` and from
+``scripts/collect_garbage.py`` (with ``--dry-run`` for a report only).
+"""
+
+import asyncio
+import logging
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.models.blob import Blob, BlobText
+from backend.services.daily_reports import REPORT_PREFIX
+from backend.services.images import derivative_sha256
+from backend.utils.file_storage import BLOB_REFERENCES, PATH_REFERENCES
+from backend.utils.storage import LocalStorage, Storage, StoredObject, get_storage, storage_key
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+# Upload folders from before the blob store, on local disk
+LEGACY_FOLDERS = ("photos/", "documents/")
+
+
+@dataclass
+class GarbageReport:
+    dry_run: bool
+    # (kind, key, size) of every file deleted, or that would be with dry_run
+    removed: list[tuple[str, str, int]] = field(default_factory=list)
+    blob_rows: int = 0
+    ref_counts_fixed: int = 0
+    # Orphans left alone because they are still inside the grace period
+    in_grace: int = 0
+
+    def totals(self) -> dict[str, tuple[int, int]]:
+        """(files, bytes) per kind."""
+        totals: dict[str, tuple[int, int]] = {}
+        for kind, _, size in self.removed:
+            files, total = totals.get(kind, (0, 0))
+            totals[kind] = (files + 1, total + size)
+        return totals
+
+    def summary(self) -> str:
+        prefix = "[dry run] would remove" if self.dry_run else "Removed"
+        parts = [f"{files} {kind} ({total / 1024 / 1024:.1f} MB)" for kind, (files, total) in self.totals().items()]
+        return (
+            f"{prefix} {', '.join(parts) or 'nothing'}; {self.blob_rows} blob rows, "
+            f"{self.ref_counts_fixed} ref counts fixed, {self.in_grace} orphans in the grace period"
+        )
+
+
+def _batches(items: Iterable, size: int) -> Iterator[list]:
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+def _referenced_paths(db: Session, batch_size: int) -> set[str]:
+    columns = [getattr(model, path_attr) for model, path_attr, _ in BLOB_REFERENCES]
+    columns += [getattr(model, path_attr) for model, path_attr in PATH_REFERENCES]
+    paths = set()
+    for column in columns:
+        rows = db.execute(select(column).where(column.isnot(None)).execution_options(yield_per=batch_size))
+        paths.update(storage_key(path) or path for (path,) in rows)
+    return paths
+
+
+def _reference_counts(db: Session, shas: list[str]) -> Counter:
+    counts = Counter()
+    for model, _, ref_attr in BLOB_REFERENCES:
+        column = getattr(model, ref_attr)
+        counts.update(dict(db.execute(
+            select(column, func.count()).where(column.in_(shas)).group_by(column)
+        ).all()))
+    return counts
+
+
+def _collect_blobs(
+    db: Session, storage: Storage, paths: set[str], cutoff: datetime, report: GarbageReport, batch_size: int,
+) -> set[str]:
+    """Delete unreferenced blob rows and files; returns the hashes removed."""
+    removed, after = set(), ""
+    now = datetime.utcnow()
+    while True:
+        blobs = db.execute(
+            select(Blob.sha256, Blob.file_path, Blob.size, Blob.ref_count, Blob.orphaned_at)
+            .where(Blob.sha256 > after).order_by(Blob.sha256).limit(batch_size)
+        ).all()
+        if not blobs:
+            return removed
+        after = blobs[-1].sha256
+        counts = _reference_counts(db, [blob.sha256 for blob in blobs])
+        doomed = []
+        for blob in blobs:
+            refs = counts[blob.sha256]
+            orphaned_at = blob.orphaned_at
+            if refs != blob.ref_count:
+                report.ref_counts_fixed += 1
+                orphaned_at = None if refs else orphaned_at or now
+                if not report.dry_run:
+                    db.execute(update(Blob).where(Blob.sha256 == blob.sha256).values(
+                        ref_count=refs, orphaned_at=orphaned_at,
+                    ))
+            key = storage_key(blob.file_path) or blob.file_path
+            if refs or key in paths:
+                if not key.startswith("blobs/"):
+                    # A blob still at its pre-blob-store path
+                    paths.add(key)
+                continue
+            if orphaned_at is None or orphaned_at > cutoff:
+                report.in_grace += 1
+                continue
+            doomed.append((blob.sha256, key, blob.size))
+
+        gone = []
+        for sha, key, size in doomed:
+            if report.dry_run:
+                gone.append((sha, key, size))
+                continue
+            with db.begin_nested() as savepoint:
+                db.execute(delete(BlobText).where(BlobText.sha256 == sha))
+                # Only if nothing referenced it since it was counted
+                deleted = db.execute(delete(Blob).where(
+                    Blob.sha256 == sha, Blob.ref_count <= 0, Blob.orphaned_at <= cutoff,
+                )).rowcount
+                if deleted:
+                    gone.append((sha, key, size))
+                else:
+                    savepoint.rollback()
+        if not report.dry_run:
+            db.commit()
+        for sha, key, size in gone:
+            if not report.dry_run:
+                storage.delete(key)
+            removed.add(sha)
+            report.blob_rows += 1
+            report.removed.append(("blobs", key, size))
+
+
+def _expired(objects: Iterable[StoredObject], cutoff: datetime) -> Iterator[StoredObject]:
+    # Dotfiles are placeholders like .gitkeep
+    return (obj for obj in objects if obj.modified <= cutoff and not Path(obj.key).name.startswith("."))
+
+
+def _orphan_objects(
+    db: Session, objects: Iterable[StoredObject], sha_of, removed: set[str], cutoff: datetime, batch_size: int,
+) -> Iterator[StoredObject]:
+    """Objects older than cutoff whose blob (by sha_of(key)) has no row or was just removed."""
+    for batch in _batches(_expired(objects, cutoff), batch_size):
+        shas = {sha_of(obj.key) for obj in batch}
+        known = {sha for (sha,) in db.execute(select(Blob.sha256).where(Blob.sha256.in_(shas)))} - removed
+        yield from (obj for obj in batch if sha_of(obj.key) not in known)
+
+
+def _remove(storage: Storage, objects: Iterable[StoredObject], kind: str, report: GarbageReport) -> None:
+    for obj in objects:
+        if not report.dry_run:
+            storage.delete(obj.key)
+        report.removed.append((kind, obj.key, obj.size))
+
+
+def _prune_empty_dirs(root: Path, cutoff: datetime) -> None:
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        path = Path(dirpath)
+        modified = datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).replace(tzinfo=None)
+        if path != root and not dirnames and not filenames and modified <= cutoff:
+            try:
+                path.rmdir()
+            except OSError:
+                # Something was written to it in the meantime
+                pass
+
+
+def collect_garbage(
+    dry_run: bool = False, grace_hours: float | None = None, batch_size: int = BATCH_SIZE,
+) -> GarbageReport:
+    """Delete orphaned uploads older than the grace period (report only with dry_run)."""
+    grace = settings.storage_gc_grace_hours if grace_hours is None else grace_hours
+    cutoff = datetime.utcnow() - timedelta(hours=grace)
+    report = GarbageReport(dry_run=dry_run)
+    storage, local = get_storage(), LocalStorage(settings.upload_dir)
+
+    with SessionLocal() as db:
+        paths = _referenced_paths(db, batch_size)
+        removed = _collect_blobs(db, storage, paths, cutoff, report, batch_size)
+
+        def blob_sha(key: str) -> str:
+            return Path(key).name.split(".", 1)[0]
+
+        # Files of the blobs just removed are reported already
+        stray = (
+            obj for obj in _orphan_objects(db, storage.list("blobs/"), blob_sha, set(), cutoff, batch_size)
+            if obj.key not in paths and blob_sha(obj.key) not in removed
+        )
+        _remove(storage, stray, "stray files", report)
+        derived = _orphan_objects(db, storage.list("derived/"), derivative_sha256, removed, cutoff, batch_size)
+        _remove(storage, derived, "derivatives", report)
+    _remove(storage, _expired(storage.list(f"{REPORT_PREFIX}/"), cutoff), "cached reports", report)
+
+    for folder in LEGACY_FOLDERS:
+        legacy = (obj for obj in _expired(local.list(folder), cutoff) if obj.key not in paths)
+        _remove(local, legacy, "legacy uploads", report)
+    _remove(local, _expired(local.list("tmp/"), cutoff), "temp files", report)
+    if not dry_run:
+        _prune_empty_dirs(local.root / "tmp", cutoff)
+        _prune_empty_dirs(local.root / REPORT_PREFIX, cutoff)
+    return report
+
+
+async def storage_gc_loop():
+    """Background job: collect garbage, then repeat every interval."""
+    interval = settings.storage_gc_interval_hours * 3600
+    while True:
+        try:
+            report = await asyncio.to_thread(collect_garbage)
+            logger.info(report.summary())
+        except Exception:
+            logger.exception("Storage garbage collection failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,243 @@
+"""Text extraction from uploaded PDF, DOCX and XLSX documents.
+
+After a document upload its blob is parsed in a process pool (parsing is
+CPU-bound and a malformed file must not take the server down) into a list
+of pages: PDF pages, DOCX pages as Word last laid them out (or split at
+explicit page breaks), one page per XLSX sheet. Each file gets
+``TEXT_EXTRACTION_TIMEOUT`` seconds. The result is stored per content hash as
+a ``BlobText`` whatever the outcome, so the same file uploaded again, or
+attached to several documents, is only ever extracted once. Documents
+pointing at the blob are then re-indexed for search with the text.
+
+PDF support needs the ``pypdf`` package (``pip install buildflow[extract]``).
+Scanned PDFs without a text layer come out empty; there is no OCR.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import signal
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from xml.etree.ElementTree import iterparse
+
+from sqlalchemy.exc import IntegrityError
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.models.blob import Blob, BlobText
+from backend.models.document import Document
+from backend.models.search import reindex
+from backend.utils.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+# Hashes being extracted by this process, so concurrent uploads of one file share the work
+_in_progress: set[str] = set()
+
+
+class ExtractionTimeout(Exception):
+    pass
+
+
+def _pdf_pages(path: str) -> list[str]:
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    if reader.is_encrypted:
+        # Many PDFs are "encrypted" with an empty user password only to restrict editing
+        reader.decrypt("")
+    return [page.extract_text() or "" for page in reader.pages]
+
+
+def _docx_pages(path: str) -> list[str]:
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as xml:
+        pages, lines, line = [], [], []
+        for event, elem in iterparse(xml, events=("start", "end")):
+            if event == "start":
+                if elem.tag == f"{_W}lastRenderedPageBreak" or (
+                    elem.tag == f"{_W}br" and elem.get(f"{_W}type") == "page"
+                ):
+                    # Word marks explicit breaks with both; only start a page once
+                    if lines or line:
+                        if line:
+                            lines.append("".join(line))
+                        pages.append("\n".join(lines))
+                        lines, line = [], []
+                continue
+            if elem.tag == f"{_W}t":
+                line.append(elem.text or "")
+            elif elem.tag == f"{_W}tab":
+                line.append("\t")
+            elif elem.tag == f"{_W}p":
+                lines.append("".join(line))
+                line = []
+                elem.clear()
+        if line:
+            lines.append("".join(line))
+        pages.append("\n".join(lines))
+    return pages
+
+
+def _xlsx_pages(path: str) -> list[str]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        pages = []
+        for sheet in workbook.worksheets:
+            rows = (
+                "\t".join("" if v is None else str(v) for v in row)
+                for row in sheet.iter_rows(values_only=True)
+                if any(v is not None for v in row)
+            )
+            pages.append("\n".join([sheet.title, *rows]))
+        return pages
+    finally:
+        workbook.close()
+
+
+EXTRACTORS = {".pdf": _pdf_pages, ".docx": _docx_pages, ".xlsx": _xlsx_pages}
+
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout
+
+
+def extract_pages(path: str, timeout: int, max_chars: int) -> tuple[str, list[str]]:
+    """(status, pages) for the file at path.
+
+    Runs in a worker process, where the timeout is enforced with SIGALRM
+    (where the platform has it). Missing optional parsers raise ImportError.
+    """
+    extractor = EXTRACTORS.get(Path(path).suffix.lower())
+    if extractor is None:
+        return "unsupported", []
+    alarm = hasattr(signal, "setitimer")
+    if alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        pages = extractor(path)
+    except ExtractionTimeout:
+        return "timeout", []
+    except ImportError:
+        raise
+    except Exception as exc:
+        # Damaged or unusual files are common; one line is enough
+        logger.warning("Extracting text from %s failed: %r", path, exc)
+        return "failed", []
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    kept, total = [], 0
+    for page in pages:
+        if total + len(page) > max_chars:
+            kept.append(page[:max_chars - total])
+            break
+        kept.append(page)
+        total += len(page)
+    return ("ok" if any(p.strip() for p in kept) else "empty"), kept
+
+
+def can_extract(path: str) -> bool:
+    return Path(path).suffix.lower() in EXTRACTORS
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Recycle workers now and then; parsers can hold on to a lot of memory after a large file
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.text_extraction_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=50,
+            )
+        return _pool
+
+
+def _extractable_key(sha256: str) -> str | None:
+    """Key of a blob whose text is still to be extracted, None if there is nothing to do."""
+    with SessionLocal() as db:
+        if db.get(BlobText, sha256) is not None:
+            return None
+        blob = db.get(Blob, sha256)
+        # Compressed blobs are superseded document versions, extracted when they were uploaded
+        if blob is None or blob.content_encoding or not can_extract(blob.file_path):
+            return None
+        return blob.file_path
+
+
+def _store_text(sha256: str, status: str, pages: list[str]) -> None:
+    with SessionLocal() as db:
+        ok = status == "ok"
+        db.add(BlobText(
+            sha256=sha256, status=status,
+            page_count=len(pages) if ok else 0, content=BlobText.compress(pages) if ok else None,
+        ))
+        try:
+            db.flush()
+        except IntegrityError:
+            # Extracted concurrently by another server process
+            return
+        reindex(db, db.query(Document).filter(Document.blob_sha256 == sha256).all())
+        db.commit()
+
+
+async def extract_blob_text(sha256: str) -> None:
+    """Extract a blob's text in the process pool and index it (no-op if done before)."""
+    if sha256 in _in_progress:
+        return
+    _in_progress.add(sha256)
+    try:
+        key = await asyncio.to_thread(_extractable_key, sha256)
+        if key is None:
+            return
+        async with get_storage().local_path(key) as path:
+            status, pages = await _run(path)
+        if status is None:
+            return
+        await asyncio.to_thread(_store_text, sha256, status, pages)
+    finally:
+        _in_progress.discard(sha256)
+
+
+async def _run(path: str) -> tuple[str | None, list[str]]:
+    loop = asyncio.get_running_loop()
+    timeout = settings.text_extraction_timeout
+    try:
+        # The worker enforces the timeout itself; this is the backstop for a parser stuck in C code
+        return await asyncio.wait_for(
+            loop.run_in_executor(_get_pool(), extract_pages, path, timeout, settings.text_extraction_max_chars),
+            timeout + 30,
+        )
+    except asyncio.TimeoutError:
+        logger.error("Text extraction of %s did not finish; restarting the worker pool", path)
+        shutdown()
+        return "timeout", []
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory); start a fresh pool next time
+        logger.exception("Text extraction worker crashed on %s", path)
+        shutdown()
+        return "failed", []
+    except ImportError as exc:
+        # Not recorded, so the file is extracted once the parser is installed
+        logger.warning("Cannot extract text from %s: %s (pip install buildflow[extract])", path, exc)
+        return None, []
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
@@ -0,0 +1,179 @@
+"""File downloads: conditional and ranged single files, streamed ZIP bundles.
+
+``file_download`` wraps Starlette's ``FileResponse``, which already answers
+``Range`` / ``If-Range`` with 206 and hands the file to the server via the
+ASGI ``pathsend`` extension (sendfile) where the server supports it. On top
+of that it answers ``If-None-Match`` / ``If-Modified-Since`` with 304. For
+blobs it uses the content hash as a strong ETag, which is stable across
+servers and copies, unlike the default mtime/size tag. ``stored_download``
+serves a storage key that way with local storage, and with S3 redirects to a
+presigned URL instead, where S3 answers the range and conditional requests.
+Files stored gzip-compressed (superseded document versions) are sent as they
+are with ``Content-Encoding: gzip``, and decompressed on the fly only for the
+rare client that does not accept gzip.
+
+``zip_stream`` writes a ZIP archive straight into the response as each
+file is read. Entries are stored uncompressed (documents and photos are
+already compressed formats) with data descriptors, so nothing is buffered
+beyond one chunk and no temporary file is written.
+"""
+
+import gzip
+import mimetypes
+import os
+import zipfile
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Iterator
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+
+from backend.utils.http_cache import accepts
+from backend.utils.storage import LocalStorage, get_storage
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class LargeFileResponse(FileResponse):
+    # Fewer, larger reads for multi-hundred-MB plan sets when pathsend is unavailable
+    chunk_size = CHUNK_SIZE
+
+
+def content_disposition(filename: str, disposition: str = "attachment") -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+
+def _not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return if_none_match.strip() == "*" or etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def file_download(
+    request: Request, path: str, filename: str, sha256: str | None = None, inline: bool = False,
+    content_encoding: str | None = None,
+) -> Response:
+    """Serve a stored file with validators, conditional 304s and Range support."""
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(404, "File not found on disk")
+    # The same URL can point at a new version later, so always revalidate
+    headers = {"Cache-Control": "private, no-cache"}
+    if sha256:
+        headers["ETag"] = f'"{sha256}-{content_encoding}"' if content_encoding else f'"{sha256}"'
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+        headers["Vary"] = "Accept-Encoding"
+    response = LargeFileResponse(
+        path, filename=filename, stat_result=stat_result, headers=headers,
+        content_disposition_type="inline" if inline else "attachment",
+    )
+    if _not_modified(request, response.headers["etag"], stat_result.st_mtime):
+        headers = {k: response.headers[k] for k in ("etag", "last-modified", "cache-control")}
+        return Response(status_code=304, headers=headers)
+    return response
+
+
+def stored_download(
+    request: Request, key: str, filename: str, sha256: str | None = None, inline: bool = False,
+    content_encoding: str | None = None,
+) -> Response:
+    """Download of a file in storage: served from disk, or a redirect to the bucket."""
+    storage = get_storage()
+    disposition = content_disposition(filename, "inline" if inline else "attachment")
+    if content_encoding and not accepts(request.headers.get("accept-encoding", ""), content_encoding):
+        try:
+            source = storage.open(key)
+        except FileNotFoundError:
+            raise HTTPException(404, "File not found on disk")
+        return StreamingResponse(
+            _decoded_chunks(source, content_encoding),
+            media_type=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+            headers={"Content-Disposition": disposition, "Cache-Control": "private, no-cache", "Vary": "Accept-Encoding"},
+        )
+    if isinstance(storage, LocalStorage):
+        return file_download(request, str(storage.path(key)), filename, sha256, inline, content_encoding)
+    # The presigned URL expires, so the redirect itself must not be cached
+    return RedirectResponse(storage.url(key, disposition), status_code=307, headers={"Cache-Control": "no-store"})
+
+
+class _ZipSink:
+    """Write-only, unseekable file object that collects what zipfile writes."""
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+
+    def write(self, data) -> int:
+        self.buffer += data
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+def _modified(source) -> datetime:
+    try:
+        return datetime.fromtimestamp(os.fstat(source.fileno()).st_mtime)
+    except (AttributeError, OSError):
+        # Object storage stream
+        return datetime.now()
+
+
+def _decoded(source, content_encoding: str | None):
+    """Reader of a stored file's original bytes."""
+    if content_encoding == "gzip":
+        return gzip.GzipFile(fileobj=source)
+    return source
+
+
+def _decoded_chunks(source, content_encoding: str) -> Iterator[bytes]:
+    with source, _decoded(source, content_encoding) as reader:
+        while chunk := reader.read(CHUNK_SIZE):
+            yield chunk
+
+
+def _zip_chunks(entries: Iterable[tuple[str, str, str | None]]) -> Iterator[bytes]:
+    storage = get_storage()
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        for arcname, key, content_encoding in entries:
+            try:
+                source = storage.open(key)
+            except FileNotFoundError:
+                continue
+            with source:
+                mtime = _modified(source)
+                reader = _decoded(source, content_encoding)
+                with archive.open(zipfile.ZipInfo(arcname, mtime.timetuple()[:6]), "w", force_zip64=True) as dest:
+                    while chunk := reader.read(CHUNK_SIZE):
+                        dest.write(chunk)
+                        yield sink.take()
+    # Central directory
+    yield sink.take()
+
+
+def zip_stream(entries: Iterable[tuple[str, str, str | None]], filename: str) -> StreamingResponse:
+    """Stream (name in archive, storage key, content encoding) entries as a ZIP download; missing files are skipped."""
+    return StreamingResponse(
+        _zip_chunks(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": content_disposition(filename)},
+    )
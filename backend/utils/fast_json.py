@@ -0,0 +1,36 @@
+"""Fast JSON path for large lists read straight from our own tables.
+
+A normal endpoint returns ORM objects or dicts that FastAPI validates
+against the ``response_model`` before Pydantic serialises them. For big
+lists of plain column values (thousands of activities) that costs far
+more than the query: instrumented attribute access, a dict per row, and
+revalidating data that came from the database. The schema already
+describes it.
+
+Endpoints on this path select the schema's columns as row tuples, add any
+derived fields, and return ``rows_response(...)``. The rows are encoded
+directly with orjson and FastAPI's validation is skipped. The route keeps
+its ``response_model`` for the OpenAPI docs. Only use this for data that
+is already in schema shape (column values, no computed coercions).
+"""
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def schema_columns(model, schema: type[BaseModel]) -> list:
+    """Table columns of model named by the schema's fields, in schema order."""
+    columns = model.__table__.columns
+    return [columns[name] for name in schema.model_fields if name in columns]
+
+
+def row_dicts(rows) -> list[dict]:
+    """Result rows (tuples) as dicts keyed by column name."""
+    keys = list(rows.keys())
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def rows_response(content, headers: dict | None = None) -> Response:
+    """Encode trusted, schema-shaped data with orjson, bypassing response_model validation."""
+    return Response(orjson.dumps(content), media_type="application/json", headers=headers)
@@ -0,0 +1,49 @@
+"""Sparse fieldsets for list endpoints.
+
+``?fields=id,name,created_at`` narrows a list to the named fields of its
+read schema. The query loads only those columns (plus the pagination keys)
+via ``load_only``, so large ``Text`` columns are never fetched or
+materialised unless asked for. Without ``fields`` the endpoint returns its
+full schema as before.
+"""
+
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+from backend.utils.fast_json import rows_response
+
+
+def sparse_fields(schema: type[BaseModel]):
+    """Dependency parsing ``?fields=`` against the columns of a read schema."""
+    # Excluded fields are inputs of computed ones, not part of the response
+    allowed = {name for name, field in schema.model_fields.items() if not field.exclude}
+
+    def dependency(
+        fields: str | None = Query(None, description=f"Comma-separated subset of {schema.__name__} fields"),
+    ) -> list[str] | None:
+        if not fields:
+            return None
+        names = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = [f for f in names if f not in allowed]
+        if unknown:
+            raise HTTPException(400, f"Unknown fields: {', '.join(unknown)}")
+        return names or None
+
+    return dependency
+
+
+def load_fields(query, model, fields: list[str] | None, keys=()):
+    """Restrict an ORM query to the given fields plus key columns (e.g. pagination keys)."""
+    if fields is None:
+        return query
+    columns = inspect(model).column_attrs
+    names = dict.fromkeys([*fields, *(k.key for k in keys)])
+    return query.options(load_only(*(getattr(model, n) for n in names if n in columns)))
+
+
+def fields_response(rows, fields: list[str], response: Response) -> Response:
+    """Serialise only the requested fields, keeping headers already set on response."""
+    content = [{f: getattr(row, f) for f in fields} for row in rows]
+    return rows_response(content, headers=dict(response.headers))
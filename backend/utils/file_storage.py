@@ -1,17 +1,174 @@
+"""Upload storage.
+
+Uploads are streamed to a temporary file while their SHA-256 is computed,
+then stored once per content as a ``Blob`` under the key
+``blobs/<sha[:2]>/<sha><ext>`` in the configured storage (see
+``backend.utils.storage``). Uploading the same file again
+(to documents, a permit and a daily log, say) resolves to the existing blob
+without rewriting it. Rows that reference a blob (see ``BlobRef``) carry
+its key in ``file_path`` and ``blob_sha256`` (other columns are listed in the
+model's ``__blob_refs__``), and the blob's ``ref_count`` follows them
+through inserts, updates and deletes.
+"""
+
+import asyncio
+import hashlib
 import os
+import shutil
 import uuid
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
+
+import aiofiles
+import aiofiles.os
+from fastapi import HTTPException, UploadFile
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
 from backend.config import settings
+from backend.models.blob import Blob, BlobRef
+from backend.models.budget import Bid, CostEntry
+from backend.models.daily_log import DailyLogPhoto
+from backend.models.document import Document
+from backend.models.permit import PermitDocument
+from backend.models.punchlist import PunchItem
+from backend.models.subcontractor import LienWaiver
+from backend.utils.storage import get_storage
+
+CHUNK_SIZE = 1024 * 1024
+
+# (model, file path column, blob reference column) of every kind of row that points at a blob
+BLOB_REFERENCES = [
+    (Document, "file_path", "blob_sha256"),
+    (DailyLogPhoto, "file_path", "blob_sha256"),
+    (PermitDocument, "file_path", "blob_sha256"),
+    (LienWaiver, "file_path", "blob_sha256"),
+    (PunchItem, "photo_before_path", "photo_before_sha256"),
+    (PunchItem, "photo_after_path", "photo_after_sha256"),
+]
+
+# (model, file path column) of rows that store an uploaded file's path without a blob reference
+PATH_REFERENCES = [
+    (CostEntry, "receipt_path"),
+    (Bid, "proposal_path"),
+]
+
+
+@dataclass
+class StoredUpload:
+    path: str
+    size: int
+    sha256: str
+    suffix: str
+
+
+def _upload_limit(kind: str) -> tuple[int, int]:
+    """(MB, bytes) an upload of kind may have under ``UPLOAD_MAX_MB``; 0 for no limit."""
+    limit_mb = settings.upload_max_mb.get(kind, settings.upload_max_mb.get("default", 0))
+    return limit_mb, limit_mb * 1024 * 1024
+
+
+def check_upload_size(file: UploadFile, kind: str) -> None:
+    """Reject with 413 an upload read in place (not stored) that is over the kind's limit."""
+    limit_mb, limit = _upload_limit(kind)
+    size = file.size
+    if size is None:
+        size = file.file.seek(0, os.SEEK_END)
+        file.file.seek(0)
+    if limit and size > limit:
+        raise HTTPException(413, f"File exceeds the {limit_mb} MB limit for {kind}")
+
+
+async def stream_upload(file: UploadFile, kind: str = "documents", default_name: str = "file") -> StoredUpload:
+    """Copy an upload to a temporary file in chunks, hashing it on the way.
+
+    Uploads larger than the kind's limit in ``UPLOAD_MAX_MB`` are rejected
+    with 413 as soon as the limit is crossed, and the partial file is removed.
+    """
+    limit_mb, limit = _upload_limit(kind)
+    if limit and file.size is not None and file.size > limit:
+        raise HTTPException(413, f"File exceeds the {limit_mb} MB limit for {kind}")
+
+    partial = get_upload_path("tmp") / f"{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(partial, "wb") as out:
+            while chunk := await file.read(CHUNK_SIZE):
+                size += len(chunk)
+                if limit and size > limit:
+                    raise HTTPException(413, f"File exceeds the {limit_mb} MB limit for {kind}")
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        if await aiofiles.os.path.exists(partial):
+            await aiofiles.os.remove(partial)
+        raise
+    suffix = Path(file.filename or default_name).suffix.lower()
+    return StoredUpload(path=str(partial), size=size, sha256=digest.hexdigest(), suffix=suffix)
+
+
+def blob_key(sha256: str, suffix: str) -> str:
+    return f"blobs/{sha256[:2]}/{sha256}{suffix}"
+
+
+async def store_blob(db: Session, stored: StoredUpload) -> Blob:
+    """The blob for a streamed upload, storing the temp file only if it is new content."""
+    storage = get_storage()
+    blob = db.get(Blob, stored.sha256)
+    if blob is not None and blob.orphaned_at is not None:
+        # Restart the grace period so the garbage collector leaves it alone until the upload is attached
+        blob.orphaned_at = datetime.utcnow()
+    if blob is not None and await asyncio.to_thread(storage.exists, blob.file_path):
+        os.remove(stored.path)
+        return blob
+
+    key = blob_key(stored.sha256, stored.suffix)
+    await storage.put(key, stored.path)
+    if blob is not None:
+        # Row survived but the file went missing; the upload restores it
+        blob.file_path = key
+        blob.content_encoding = None
+        return blob
+    try:
+        with db.begin_nested():
+            blob = Blob(sha256=stored.sha256, file_path=key, size=stored.size, ref_count=0)
+            db.add(blob)
+    except IntegrityError:
+        # Same content stored concurrently by another request
+        blob = db.get(Blob, stored.sha256)
+    return blob
+
+
+async def import_file(db: Session, path: str) -> Blob:
+    """Move an existing local file into the blob store (uploads saved before blobs existed)."""
+    partial = get_upload_path("tmp") / f"{uuid.uuid4().hex}.part"
+    shutil.move(path, partial)
+    digest = hashlib.sha256()
+    size = 0
+    with open(partial, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            size += len(chunk)
+            digest.update(chunk)
+    stored = StoredUpload(path=str(partial), size=size, sha256=digest.hexdigest(), suffix=Path(path).suffix.lower())
+    return await store_blob(db, stored)
+
+
+async def save_upload(db: Session, file: UploadFile, kind: str = "documents", default_name: str = "file") -> Blob:
+    """Stream an upload into the blob store."""
+    return await store_blob(db, await stream_upload(file, kind, default_name))
+
+
+def attach_blob(row: BlobRef, blob: Blob, path_attr: str = "file_path", ref_attr: str = "blob_sha256") -> None:
+    """Point a row's file at a blob (the ref count is adjusted on flush)."""
+    setattr(row, path_attr, blob.file_path)
+    setattr(row, ref_attr, blob.sha256)
 
 
-def save_upload(file_bytes: bytes, filename: str, subfolder: str = "documents") -> str:
-    upload_dir = Path(settings.upload_dir) / subfolder
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    ext = Path(filename).suffix
-    unique_name = f"{uuid.uuid4().hex}{ext}"
-    dest = upload_dir / unique_name
-    dest.write_bytes(file_bytes)
-    return str(dest)
+def static_url(key: str | None) -> str | None:
+    """Browser URL of a stored file (under /static, or presigned for S3)."""
+    return get_storage().url(key) if key else None
 
 
 def get_upload_path(subfolder: str) -> Path:
@@ -0,0 +1,162 @@
+"""Response compression and cache headers.
+
+``CompressionMiddleware`` compresses responses above a size threshold:
+brotli when the client accepts it and the optional ``brotli`` package is
+installed, gzip otherwise. It reuses Starlette's gzip responder (the
+``GZipResponder``/``IdentityResponder`` classes of Starlette 0.46+), which
+handles streaming bodies and leaves ``206`` partial responses and responses
+that already carry a ``Content-Encoding`` untouched. Only text-like media
+types (JSON, text, XML, SVG) are compressed, and never file downloads
+(responses with a ``Content-Disposition``), which keep their
+``Content-Length``, strong ``ETag`` and range semantics even when they are
+text.
+
+``CachedStaticFiles`` serves ``/static``. Uploads are stored under their
+SHA-256 (older ones under random UUIDs), photo derivatives under the hash
+and size, and none are rewritten in place, so they are served as
+``immutable`` for a year. Other files must revalidate. Starlette answers
+``If-None-Match`` / ``If-Modified-Since`` with ``304`` and keeps the
+``Cache-Control`` header on it.
+
+Both are configurable per route by path prefix (``COMPRESS_ROUTES``,
+``CACHE_ROUTES``). The longest matching prefix wins.
+"""
+
+import os
+import re
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only
+    brotli = None
+
+_UPLOAD_NAME = re.compile(r"^([0-9a-f]{32}|[0-9a-f]{64}(-\d+)?)(\.[A-Za-z0-9]+)?$")
+
+
+def route_rule(path: str, rules: dict, default=None):
+    """Value of the longest path prefix in rules matching path, else default."""
+    matches = [prefix for prefix in rules if path.startswith(prefix)]
+    return rules[max(matches, key=len)] if matches else default
+
+
+def accepts(accept_encoding: str, coding: str) -> bool:
+    """Whether an Accept-Encoding header allows coding (ignores q=0 entries)."""
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        if name.strip() == coding:
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+# Only text-like bodies are worth compressing; documents, photos and archives are compressed already
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+
+
+class CompressibleOnly:
+    """Responder mixin that passes through downloads and any content type outside COMPRESSIBLE_TYPES."""
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+            # A compressed full download would share the identity ETag that If-Range checks against
+            if "content-disposition" in headers or not media_type.startswith(COMPRESSIBLE_TYPES):
+                self.exclude_content_types = (*self.exclude_content_types, media_type)
+        await super().send_with_compression(message)
+
+
+class GZipOnlyCompressible(CompressibleOnly, GZipResponder):
+    pass
+
+
+class BrotliResponder(CompressibleOnly, IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int = 4) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if more_body:
+            return self.compressor.process(body) + self.compressor.flush()
+        return self.compressor.process(body) + self.compressor.finish()
+
+
+class CompressionMiddleware:
+    """Compress responses of at least minimum_size bytes (per-route overrides in routes, 0 = never)."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        compresslevel: int = 6,
+        brotli_quality: int = 4,
+        routes: dict[str, int] | None = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.brotli_quality = brotli_quality
+        self.routes = routes or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        minimum_size = route_rule(scope["path"], self.routes, self.minimum_size)
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        responder: ASGIApp = self.app
+        if minimum_size > 0:
+            if brotli is not None and accepts(accept_encoding, "br"):
+                responder = BrotliResponder(self.app, minimum_size, self.brotli_quality)
+            elif accepts(accept_encoding, "gzip"):
+                responder = GZipOnlyCompressible(self.app, minimum_size, compresslevel=self.compresslevel)
+        await responder(scope, receive, send)
+
+
+class CacheControlMiddleware:
+    """Set Cache-Control on successful GET responses of routes listed in rules.
+
+    Responses that set their own Cache-Control keep it.
+    """
+
+    def __init__(self, app: ASGIApp, rules: dict[str, str]) -> None:
+        self.app = app
+        self.rules = rules
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        value = route_rule(scope["path"], self.rules) if scope["type"] == "http" else None
+        if value is None or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cache_control(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] in (200, 203, 204):
+                headers = MutableHeaders(scope=message)
+                headers.setdefault("Cache-Control", value)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cache_control)
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles with long-lived immutable caching for hash- and UUID-named uploads."""
+
+    def __init__(self, *args, max_age: int = 31536000, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.max_age = max_age
+
+    def cache_control(self, name: str) -> str:
+        if self.max_age > 0 and _UPLOAD_NAME.match(name):
+            return f"public, max-age={self.max_age}, immutable"
+        return "no-cache"
+
+    def file_response(self, full_path, stat_result, scope: Scope, status_code: int = 200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers.setdefault("Cache-Control", self.cache_control(os.path.basename(full_path)))
+        return response
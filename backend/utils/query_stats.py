@@ -0,0 +1,130 @@
+"""Per-request database query statistics and N+1 detection.
+
+Cursor-execute hooks on both engines time every statement and add it to
+the ``QueryStats`` of the current request. The stats object lives in a
+context variable, so it follows sync endpoints into the threadpool and
+async ones through the greenlet bridge. The HTTP middleware in main.py
+reports the totals as a ``Server-Timing`` header and keeps the most recent
+requests for ``GET /api/debug/queries``.
+
+The same statement text executed many times in one request is the
+signature of an N+1 loop; such requests are logged as warnings. ``collect``
+contexts nest: an enclosing one (e.g. the tests' ``query_stats`` fixture)
+also counts the statements of the requests made inside it.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+SLOWEST_KEPT = 5
+
+_current: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+_recent: deque = deque(maxlen=settings.query_stats_history)
+_recent_lock = threading.Lock()
+
+
+@dataclass
+class QueryStats:
+    label: str = ""
+    count: int = 0
+    total_ms: float = 0.0
+    slowest: list[tuple[float, str]] = field(default_factory=list)
+    statements: Counter = field(default_factory=Counter)
+    # Enclosing collect() stats, which record this one's statements too
+    parent: "QueryStats | None" = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.statements[statement] += 1
+            self.slowest.append((elapsed_ms, statement))
+            self.slowest.sort(key=lambda s: -s[0])
+            del self.slowest[SLOWEST_KEPT:]
+        if self.parent is not None:
+            self.parent.record(statement, elapsed_ms)
+
+    def repeated(self, threshold: int | None = None) -> list[tuple[str, int]]:
+        """Statements executed at least threshold times (likely N+1 loops)."""
+        threshold = threshold or settings.query_repeat_threshold
+        return [(s, n) for s, n in self.statements.most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_ms:.1f};desc="{self.count} queries"'
+
+    def to_dict(self) -> dict:
+        return {
+            "request": self.label,
+            "query_count": self.count,
+            "db_ms": round(self.total_ms, 2),
+            "slowest": [{"ms": round(ms, 2), "statement": s} for ms, s in self.slowest],
+            "repeated": [{"count": n, "statement": s} for s, n in self.repeated()],
+        }
+
+
+@contextmanager
+def collect(label: str = ""):
+    """Record every statement executed in this context into a fresh QueryStats."""
+    stats = QueryStats(label=label, parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def remember(stats: QueryStats) -> None:
+    """Keep a finished request for the debug endpoint and flag N+1 patterns."""
+    with _recent_lock:
+        _recent.append(stats.to_dict())
+    repeated = stats.repeated()
+    if repeated:
+        statement, n = repeated[0]
+        logger.warning(
+            "%s ran %d queries; one statement repeated %d times (possible N+1): %s",
+            stats.label, stats.count, n, " ".join(statement.split())[:200],
+        )
+
+
+def recent() -> list[dict]:
+    with _recent_lock:
+        return list(reversed(_recent))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, (time.perf_counter() - started) * 1000)
+
+
+def _handle_error(context):
+    if context.connection is not None:
+        starts = context.connection.info.get("query_start")
+        if starts:
+            starts.pop()
+
+
+def install(engine) -> None:
+    """Attach the timing hooks to a sync engine (or an AsyncEngine's sync_engine)."""
+    engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
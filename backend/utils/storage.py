@@ -0,0 +1,320 @@
+"""Where uploaded files live: the local upload directory or an S3-compatible bucket.
+
+Files are addressed by key, a relative POSIX path such as
+``blobs/ab/<sha256>.pdf`` or ``derived/ab/<sha256>-320.webp``; that key is
+what ``Blob.file_path`` and the rows pointing at a blob store. (Uploads
+saved before keys were used store the path they were written to, upload_dir
+joined with the folder and name: absolute, or relative to the working
+directory like ``backend/static/photos/<uuid>.jpg`` with the default
+``UPLOAD_DIR``. ``storage_key`` maps both to keys; the local driver reads
+them through it, and ``scripts/migrate_storage.py`` rewrites them.)
+
+``STORAGE_BACKEND=local`` keeps files under ``UPLOAD_DIR``, served by the
+``/static`` mount and streamed by the API. ``STORAGE_BACKEND=s3`` puts them
+in ``S3_BUCKET`` (AWS, MinIO, R2, ...): uploads go up as concurrent
+multipart uploads and downloads are redirected to short-lived presigned
+URLs, so file bytes never pass through the API workers and any number of
+API nodes can share the files. The S3 driver needs ``boto3``
+(``pip install buildflow[s3]``).
+"""
+
+import asyncio
+import mimetypes
+import os
+import shutil
+import threading
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Iterator
+from urllib.parse import quote
+
+from backend.config import settings
+
+
+def storage_key(path: str, root: str | os.PathLike | None = None) -> str | None:
+    """The key of a stored path under root (default upload_dir), None if it lies outside root.
+
+    Keys are returned as they are; legacy paths are made relative to root.
+    """
+    root = Path(settings.upload_dir if root is None else root)
+    stored = Path(path)
+    if not stored.is_absolute():
+        if not root.is_absolute():
+            # Written as upload_dir/<folder>/<name> with the same relative upload_dir
+            try:
+                return stored.relative_to(root).as_posix()
+            except ValueError:
+                pass
+        # Relative to the working directory it was written from, or already a key
+        stored = Path.cwd() / stored
+        if not stored.resolve().is_relative_to(root.resolve()):
+            return path
+    try:
+        return stored.resolve().relative_to(root.resolve()).as_posix()
+    except ValueError:
+        return None
+
+
+@dataclass
+class StoredObject:
+    key: str
+    size: int
+    modified: datetime  # naive UTC
+
+
+class Storage:
+    """Interface of the storage drivers."""
+
+    # True if url() hands out direct download links the API should redirect to
+    presigned = False
+
+    async def put(self, key: str, path: str, move: bool = True, content_encoding: str | None = None) -> None:
+        """Store the local file at path under key (moving it unless move is False).
+
+        content_encoding ("gzip") marks a compressed file, for drivers that keep it as metadata.
+        """
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def open(self, key: str) -> BinaryIO:
+        """Binary reader for a stored file; FileNotFoundError if it is missing."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Remove a stored file (no error if it is already gone)."""
+        raise NotImplementedError
+
+    def list(self, prefix: str = "") -> Iterator[StoredObject]:
+        raise NotImplementedError
+
+    def url(self, key: str, disposition: str | None = None) -> str | None:
+        """Browser URL of a stored file, None if it has none; disposition is a Content-Disposition to serve it with."""
+        raise NotImplementedError
+
+    def local_path(self, key: str):
+        """Async context manager giving a local file with the stored content, for tools that need a path."""
+        raise NotImplementedError
+
+
+class LocalStorage(Storage):
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        # Paths of older rows are mapped to keys; ones outside root are taken as they are
+        return self.root / (storage_key(key, self.root) or key)
+
+    async def put(self, key: str, path: str, move: bool = True, content_encoding: str | None = None) -> None:
+        dest = self.path(key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if move:
+            os.replace(path, dest)
+        else:
+            await asyncio.to_thread(shutil.copyfile, path, dest)
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).is_file()
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self.path(key), "rb")
+
+    def delete(self, key: str) -> None:
+        self.path(key).unlink(missing_ok=True)
+
+    def list(self, prefix: str = "") -> Iterator[StoredObject]:
+        base = self.root / prefix
+        for dirpath, _, filenames in os.walk(base):
+            for name in filenames:
+                full = Path(dirpath) / name
+                try:
+                    st = full.stat()
+                except FileNotFoundError:
+                    continue
+                modified = datetime.fromtimestamp(st.st_mtime, timezone.utc).replace(tzinfo=None)
+                yield StoredObject(full.relative_to(self.root).as_posix(), st.st_size, modified)
+
+    def url(self, key: str, disposition: str | None = None) -> str | None:
+        # Served by the /static mount (downloads with a disposition go through the API instead)
+        try:
+            return "/static/" + quote(self.path(key).resolve().relative_to(self.root.resolve()).as_posix())
+        except ValueError:
+            return None
+
+    @asynccontextmanager
+    async def local_path(self, key: str) -> AsyncIterator[str]:
+        yield str(self.path(key))
+
+
+class S3Storage(Storage):
+    presigned = True
+
+    def __init__(
+        self, bucket: str, prefix: str = "", endpoint_url: str = "", region: str = "",
+        access_key: str = "", secret_key: str = "", part_size_mb: int = 16, concurrency: int = 4,
+        url_expiry: int = 3600, public_url: str = "",
+    ):
+        import boto3
+        from botocore.config import Config
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.part_size = max(part_size_mb, 5) * 1024 * 1024  # S3's minimum part size is 5 MiB
+        self.concurrency = concurrency
+        self.url_expiry = url_expiry
+        self.public_url = public_url.rstrip("/")
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key or None,
+            aws_secret_access_key=secret_key or None,
+            # MinIO and most S3-compatible servers only do path-style addressing
+            config=Config(
+                s3={"addressing_style": "path" if endpoint_url else "auto"},
+                max_pool_connections=max(10, concurrency * 2),
+            ),
+        )
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    def _object_args(self, key: str, content_encoding: str | None = None) -> dict:
+        # Keys are content-addressed, so an object never changes once written
+        args = {
+            "Bucket": self.bucket,
+            "Key": self._key(key),
+            "CacheControl": f"public, max-age={settings.static_max_age}, immutable",
+        }
+        content_type, _ = mimetypes.guess_type(key)
+        if content_type:
+            args["ContentType"] = content_type
+        if content_encoding:
+            # Served with Content-Encoding, so browsers decompress presigned downloads themselves
+            args["ContentEncoding"] = content_encoding
+        return args
+
+    async def put(self, key: str, path: str, move: bool = True, content_encoding: str | None = None) -> None:
+        size = os.path.getsize(path)
+        if size <= self.part_size:
+            await asyncio.to_thread(self._put_object, key, path, content_encoding)
+        else:
+            await self._multipart_upload(key, path, size, content_encoding)
+        if move:
+            os.remove(path)
+
+    def _put_object(self, key: str, path: str, content_encoding: str | None) -> None:
+        with open(path, "rb") as f:
+            self.client.put_object(Body=f, **self._object_args(key, content_encoding))
+
+    async def _multipart_upload(self, key: str, path: str, size: int, content_encoding: str | None) -> None:
+        upload = await asyncio.to_thread(
+            self.client.create_multipart_upload, **self._object_args(key, content_encoding),
+        )
+        upload_id = upload["UploadId"]
+        limit = asyncio.Semaphore(self.concurrency)
+
+        def send(number: int, offset: int) -> dict:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                body = f.read(self.part_size)
+            part = self.client.upload_part(
+                Bucket=self.bucket, Key=self._key(key), UploadId=upload_id, PartNumber=number, Body=body,
+            )
+            return {"PartNumber": number, "ETag": part["ETag"]}
+
+        async def send_part(number: int, offset: int) -> dict:
+            async with limit:
+                return await asyncio.to_thread(send, number, offset)
+
+        try:
+            parts = await asyncio.gather(*(
+                send_part(number, offset)
+                for number, offset in enumerate(range(0, size, self.part_size), start=1)
+            ))
+            await asyncio.to_thread(
+                self.client.complete_multipart_upload,
+                Bucket=self.bucket, Key=self._key(key), UploadId=upload_id, MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            # Parts of an unfinished upload are billed until aborted
+            await asyncio.to_thread(
+                self.client.abort_multipart_upload, Bucket=self.bucket, Key=self._key(key), UploadId=upload_id,
+            )
+            raise
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+            return True
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def open(self, key: str) -> BinaryIO:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._key(key))["Body"]
+        except self.client.exceptions.NoSuchKey:
+            raise FileNotFoundError(key)
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def list(self, prefix: str = "") -> Iterator[StoredObject]:
+        pages = self.client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=self._key(prefix))
+        for page in pages:
+            for obj in page.get("Contents", []):
+                key = obj["Key"][len(self.prefix):]
+                yield StoredObject(key, obj["Size"], obj["LastModified"].replace(tzinfo=None))
+
+    def url(self, key: str, disposition: str | None = None) -> str | None:
+        if self.public_url and disposition is None:
+            # Public bucket or CDN in front of it: stable URLs that browsers can cache
+            return f"{self.public_url}/{quote(self._key(key))}"
+        params = {"Bucket": self.bucket, "Key": self._key(key)}
+        if disposition is not None:
+            params["ResponseContentDisposition"] = disposition
+        return self.client.generate_presigned_url("get_object", Params=params, ExpiresIn=self.url_expiry)
+
+    @asynccontextmanager
+    async def local_path(self, key: str) -> AsyncIterator[str]:
+        tmp_dir = Path(settings.upload_dir) / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        path = tmp_dir / f"{uuid.uuid4().hex}{Path(key).suffix}"
+        try:
+            await asyncio.to_thread(self.client.download_file, self.bucket, self._key(key), str(path))
+            yield str(path)
+        finally:
+            path.unlink(missing_ok=True)
+
+
+_storage: Storage | None = None
+_storage_lock = threading.Lock()
+
+
+def create_storage(backend: str) -> Storage:
+    if backend == "local":
+        return LocalStorage(settings.upload_dir)
+    if backend == "s3":
+        return S3Storage(
+            settings.s3_bucket, settings.s3_prefix, settings.s3_endpoint_url, settings.s3_region,
+            settings.s3_access_key, settings.s3_secret_key, settings.s3_part_size_mb,
+            settings.s3_upload_concurrency, settings.s3_url_expiry, settings.s3_public_url,
+        )
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def get_storage() -> Storage:
+    """The configured storage driver (``STORAGE_BACKEND``)."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            _storage = create_storage(settings.storage_backend)
+        return _storage
@@ -1,5 +1,30 @@
 import axios from 'axios'
+import { useInfiniteQuery, type QueryKey } from '@tanstack/react-query'
 
 const api = axios.create({ baseURL: '/api/v1' })
 
+export const PAGE_SIZE = 50
+
+export interface Page<T> {
+  rows: T[]
+  next?: string
+}
+
+// One page of a keyset-paginated list; `next` is the X-Next-Cursor of the page after it
+export async function getPage<T = any>(url: string, params: Record<string, any> = {}, cursor?: string): Promise<Page<T>> {
+  const r = await api.get<T[]>(url, { params: { ...params, limit: PAGE_SIZE, ...(cursor ? { cursor } : {}) } })
+  return { rows: r.data, next: r.headers['x-next-cursor'] }
+}
+
+// A list loaded a page at a time; fetchNextPage() appends the next page to `rows`
+export function usePagedList<T = any>(queryKey: QueryKey, url: string, params: Record<string, any> = {}) {
+  const query = useInfiniteQuery({
+    queryKey,
+    queryFn: ({ pageParam }) => getPage<T>(url, params, pageParam),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: last => last.next,
+  })
+  return { ...query, rows: query.data?.pages.flatMap(p => p.rows) }
+}
+
 export default api
@@ -39,6 +39,7 @@ export default function BudgetPage({ projectId }: { projectId: number }) {
 
   const { data: items } = useQuery<BudgetItem[]>({
     queryKey: ['budget-items', projectId],
+    // The whole list: totals and category groups need every item
     queryFn: () => api.get(`/projects/${projectId}/budget/items`).then(r => r.data),
   })
 
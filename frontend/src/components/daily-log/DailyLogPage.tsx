@@ -1,8 +1,9 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { useMutation, useQueryClient } from '@tanstack/react-query'
 import { useState } from 'react'
-import api from '../../api/client'
+import api, { usePagedList } from '../../api/client'
 import type { DailyLog } from '../../types'
 import StatusBadge from '../shared/StatusBadge'
+import LoadMore from '../shared/LoadMore'
 import { TRADES } from '../../utils/constants'
 import { BookOpen, Plus, CloudSun, Trash2 } from 'lucide-react'
 
@@ -10,10 +11,10 @@ export default function DailyLogPage({ projectId }: { projectId: number }) {
   const qc = useQueryClient()
   const [showForm, setShowForm] = useState(false)
 
-  const { data: logs } = useQuery<DailyLog[]>({
-    queryKey: ['daily-logs', projectId],
-    queryFn: () => api.get(`/projects/${projectId}/daily-logs`).then(r => r.data),
-  })
+  const { rows: logs, ...logPages } = usePagedList<DailyLog>(
+    ['daily-logs', projectId], `/projects/${projectId}/daily-logs`,
+    { fields: 'id,log_date,weather_temp,weather_condition,weather_impact,work_summary,issues' },
+  )
 
   const addLog = useMutation({
     mutationFn: (data: any) => api.post(`/projects/${projectId}/daily-logs`, data),
@@ -183,6 +184,7 @@ export default function DailyLogPage({ projectId }: { projectId: number }) {
           </div>
         ))}
       </div>
+      <LoadMore {...logPages} />
 
       {(!logs || logs.length === 0) && !showForm && (
         <div className="text-center py-12 text-gray-500">
@@ -1,7 +1,8 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { useMutation, useQueryClient } from '@tanstack/react-query'
 import { useRef } from 'react'
-import api from '../../api/client'
+import api, { usePagedList } from '../../api/client'
 import type { DocRecord } from '../../types'
+import LoadMore from '../shared/LoadMore'
 import { FolderOpen, Upload, FileText, Download, Trash2 } from 'lucide-react'
 
 function formatBytes(bytes: number | undefined): string {
@@ -15,10 +16,9 @@ export default function DocumentsPage({ projectId }: { projectId: number }) {
   const qc = useQueryClient()
   const fileRef = useRef<HTMLInputElement>(null)
 
-  const { data: docs } = useQuery<DocRecord[]>({
-    queryKey: ['documents', projectId],
-    queryFn: () => api.get(`/projects/${projectId}/documents`).then(r => r.data),
-  })
+  const { rows: docs, ...docPages } = usePagedList<DocRecord>(
+    ['documents', projectId], `/projects/${projectId}/documents`, { fields: 'id,name,file_type,file_size,created_at' },
+  )
 
   const uploadDoc = useMutation({
     mutationFn: async (file: File) => {
@@ -103,6 +103,7 @@ export default function DocumentsPage({ projectId }: { projectId: number }) {
               ))}
             </tbody>
           </table>
+          {docPages.hasNextPage && <div className="py-3 border-t"><LoadMore {...docPages} /></div>}
         </div>
       ) : (
         <div className="text-center py-12 text-gray-500">
@@ -1,8 +1,9 @@
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { useState } from 'react'
-import api from '../../api/client'
+import api, { usePagedList } from '../../api/client'
 import type { PunchItem } from '../../types'
 import StatusBadge from '../shared/StatusBadge'
+import LoadMore from '../shared/LoadMore'
 import { TRADES, PRIORITIES } from '../../utils/constants'
 import { ClipboardCheck, Plus, Camera, Filter, Trash2 } from 'lucide-react'
 
@@ -16,10 +17,10 @@ export default function PunchListPage({ projectId }: { projectId: number }) {
   if (filterTrade) params.set('trade', filterTrade)
   if (filterStatus) params.set('status', filterStatus)
 
-  const { data: items } = useQuery<PunchItem[]>({
-    queryKey: ['punch-items', projectId, filterTrade, filterStatus],
-    queryFn: () => api.get(`/projects/${projectId}/punchlist/items?${params}`).then(r => r.data),
-  })
+  const { rows: items, ...itemPages } = usePagedList<PunchItem>(
+    ['punch-items', projectId, filterTrade, filterStatus], `/projects/${projectId}/punchlist/items`,
+    { ...Object.fromEntries(params), fields: 'id,description,location,trade,priority,status,assigned_to' },
+  )
 
   const { data: stats } = useQuery({
     queryKey: ['punch-stats', projectId],
@@ -170,6 +171,7 @@ export default function PunchListPage({ projectId }: { projectId: number }) {
           </div>
         ))}
       </div>
+      <LoadMore {...itemPages} />
 
       {(!items || items.length === 0) && !showForm && (
         <div className="text-center py-12 text-gray-500">
@@ -0,0 +1,20 @@
+interface Props {
+  hasNextPage: boolean
+  isFetchingNextPage: boolean
+  fetchNextPage: () => unknown
+}
+
+export default function LoadMore({ hasNextPage, isFetchingNextPage, fetchNextPage }: Props) {
+  if (!hasNextPage) return null
+  return (
+    <div className="text-center">
+      <button
+        onClick={() => fetchNextPage()}
+        disabled={isFetchingNextPage}
+        className="text-sm text-blue-600 border border-blue-200 rounded-lg px-4 py-2 hover:bg-blue-50 disabled:opacity-50"
+      >
+        {isFetchingNextPage ? 'Loading...' : 'Load more'}
+      </button>
+    </div>
+  )
+}
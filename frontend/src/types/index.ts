@@ -93,7 +93,8 @@ export interface PunchItem {
   id: number; project_id: number; punch_list_id: number; description: string;
   location: string; trade: string; priority: string; status: string;
   assigned_to?: string; due_date?: string; photo_before_path?: string;
-  photo_after_path?: string; back_charge: boolean; back_charge_amount: number;
+  photo_after_path?: string; photo_before_derivatives?: Record<string, string> | null;
+  photo_after_derivatives?: Record<string, string> | null; back_charge: boolean; back_charge_amount: number;
 }
 
 export interface DailyLog {
@@ -102,6 +103,11 @@ export interface DailyLog {
   safety_incidents: number; crew_entries: CrewEntry[]; work_items: WorkItem[];
 }
 
+export interface DailyReportJob {
+  id: string; status: 'pending' | 'running' | 'done' | 'failed'; format: 'pdf' | 'zip';
+  filename: string; error?: string;
+}
+
 export interface CrewEntry {
   id: number; trade: string; company_name?: string; headcount: number; hours_worked: number;
 }
@@ -112,8 +118,9 @@ export interface WorkItem {
 
 export interface DocRecord {
   id: number; project_id: number; name: string; file_path: string;
-  file_type?: string; file_size?: number; category_id?: number;
-  description?: string; created_at: string;
+  file_type?: string; file_size?: number; blob_sha256?: string; category_id?: number;
+  description?: string; version: number; parent_id?: number; chain_id?: number; is_latest: boolean;
+  created_at: string;
 }
 
 export interface Subcontractor {
@@ -138,3 +145,8 @@ export interface DashboardSummary {
   recent_activity: { module: string; action: string; description: string; created_at: string }[];
   weather?: { temp?: number; condition?: string; humidity?: number; wind_speed?: number };
 }
+
+export interface SearchHit {
+  entity_type: 'document' | 'daily_log' | 'punch_item' | 'inspection'; entity_id: number;
+  title: string; snippet: string; score: number;
+}
@@ -0,0 +1,140 @@
+"""Compare concurrent throughput of the async read endpoints against sync/threadpool equivalents.
+
+Each pair runs the same queries: the sync route gets a Session from get_db
+in FastAPI's threadpool, the async route is the real endpoint on
+get_async_db. Requests go through the ASGI app in-process, so the numbers
+reflect the server side only. Only endpoints whose time is spent waiting on
+the database are async; the pandas-based analytics endpoints stay sync, as
+they would block the event loop.
+
+    DATABASE_URL=postgresql+psycopg://user@db/buildflow \\
+        python scripts/benchmark_async.py --project 1 --concurrency 100 --requests 2000
+
+Point DATABASE_URL at the database to measure. Against a local SQLite file
+the queries take microseconds and aiosqlite adds a thread hop per
+statement, so the sync path can come out ahead; on Postgres the async
+path is ahead, and more so the longer requests wait on the database.
+"""
+import sys
+import os
+import argparse
+import asyncio
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import anyio
+import httpx
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from backend.database import get_db, init_db
+from backend.main import app
+from backend.models.budget import BudgetCategory, BudgetItem
+from backend.models.project import Project
+from backend.models.schedule import Activity, ActivityDependency, Decision, Milestone
+
+
+def _columns(obj) -> dict:
+    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+
+
+# Sync baselines mounted only for the benchmark
+@app.get("/bench/sync/projects/{project_id}/budget/summary")
+def _sync_budget_summary(project_id: int, db: Session = Depends(get_db)):
+    project = db.get(Project, project_id)
+    items = db.query(BudgetItem).filter(BudgetItem.project_id == project_id).all()
+    total_budget = sum(i.current_budget for i in items) or (project.total_budget if project else 0)
+    total_forecast = sum(i.forecast_cost for i in items)
+    cats = db.query(BudgetCategory).filter(BudgetCategory.project_id == project_id).order_by(BudgetCategory.sort_order).all()
+    return {
+        "total_budget": total_budget,
+        "total_committed": sum(i.committed_cost for i in items),
+        "total_actual": sum(i.actual_cost for i in items),
+        "total_forecast": total_forecast,
+        "variance": total_budget - total_forecast,
+        "categories": [
+            {
+                "id": c.id, "name": c.name, "code": c.code, "budgeted": c.budgeted_amount,
+                "forecast": sum(i.forecast_cost for i in items if i.category_id == c.id),
+            }
+            for c in cats
+        ],
+    }
+
+
+@app.get("/bench/sync/projects/{project_id}/schedule/activities")
+def _sync_activities(project_id: int, db: Session = Depends(get_db)):
+    acts = db.query(Activity).filter(Activity.project_id == project_id).order_by(Activity.sort_order).all()
+    deps = (
+        db.query(ActivityDependency.activity_id, ActivityDependency.predecessor_id)
+        .join(Activity, Activity.id == ActivityDependency.activity_id)
+        .filter(Activity.project_id == project_id).all()
+    )
+    preds: dict[int, list[int]] = {}
+    for activity_id, predecessor_id in deps:
+        preds.setdefault(activity_id, []).append(predecessor_id)
+    return [{**_columns(a), "predecessor_ids": preds.get(a.id, [])} for a in acts]
+
+
+@app.get("/bench/sync/projects/{project_id}/schedule/milestones")
+def _sync_milestones(project_id: int, db: Session = Depends(get_db)):
+    return [
+        _columns(m)
+        for m in db.query(Milestone).filter(Milestone.project_id == project_id).order_by(Milestone.target_date).all()
+    ]
+
+
+@app.get("/bench/sync/projects/{project_id}/schedule/decisions")
+def _sync_decisions(project_id: int, db: Session = Depends(get_db)):
+    return [
+        _columns(d)
+        for d in db.query(Decision).filter(Decision.project_id == project_id).order_by(Decision.due_date).all()
+    ]
+
+
+PAIRS = {
+    "budget summary": "/projects/{pid}/budget/summary",
+    "activities": "/projects/{pid}/schedule/activities",
+    "milestones": "/projects/{pid}/schedule/milestones",
+    "decisions": "/projects/{pid}/schedule/decisions",
+}
+
+
+async def _run(client: httpx.AsyncClient, url: str, total: int, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            r = await client.get(url)
+            r.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return total / (time.perf_counter() - start)
+
+
+async def main(project_id: int, total: int, concurrency: int, threads: int) -> None:
+    anyio.to_thread.current_default_thread_limiter().total_tokens = threads
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{total} requests, concurrency {concurrency}, threadpool {threads}\n")
+        print(f"{'endpoint':15} {'sync req/s':>12} {'async req/s':>12} {'gain':>7}")
+        for name, path in PAIRS.items():
+            url = path.format(pid=project_id)
+            # Warm caches and connection pools on both paths first
+            await _run(client, "/bench/sync" + url, 20, 5)
+            await _run(client, "/api/v1" + url, 20, 5)
+            sync_rps = await _run(client, "/bench/sync" + url, total, concurrency)
+            async_rps = await _run(client, "/api/v1" + url, total, concurrency)
+            print(f"{name:15} {sync_rps:12.1f} {async_rps:12.1f} {async_rps / sync_rps:6.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=40, help="threadpool size for sync routes (Starlette default 40)")
+    args = parser.parse_args()
+    init_db()
+    asyncio.run(main(args.project, args.requests, args.concurrency, args.threads))
@@ -0,0 +1,113 @@
+"""Compare the row-tuple/orjson list path against ORM objects + response_model validation.
+
+Seeds a throwaway project with --rows activities and times two routes over
+the same data through the ASGI app in-process:
+
+- before: ORM objects, a ``{c.name: getattr(...)}`` dict per row, and
+  FastAPI validating the list against ``list[ActivityRead]`` before Pydantic
+  serialises it (the previous implementation of the endpoint).
+- after: the real ``/schedule/activities`` endpoint, which selects the
+  schema columns as row tuples and encodes them with orjson
+  (backend/utils/fast_json.py).
+
+    python scripts/benchmark_serialization.py --rows 5000 --repeat 20
+"""
+import sys
+import os
+import argparse
+import json
+import statistics
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'bench.db')}"
+os.environ["SNAPSHOT_INTERVAL_HOURS"] = "0"
+
+from datetime import date, timedelta
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database import SessionLocal, get_async_db
+from backend.main import app
+from backend.models.project import Project
+from backend.models.schedule import Activity, ActivityDependency
+from backend.schemas.schedule import ActivityRead
+
+
+# Previous implementation, mounted only for the benchmark
+@app.get("/bench/before/projects/{project_id}/schedule/activities", response_model=list[ActivityRead])
+async def _activities_before(project_id: int, db: AsyncSession = Depends(get_async_db)):
+    acts = (await db.scalars(
+        select(Activity).where(Activity.project_id == project_id).order_by(Activity.sort_order)
+    )).all()
+    deps = await db.execute(
+        select(ActivityDependency.activity_id, ActivityDependency.predecessor_id)
+        .join(Activity, Activity.id == ActivityDependency.activity_id)
+        .where(Activity.project_id == project_id)
+    )
+    preds: dict[int, list[int]] = {}
+    for activity_id, predecessor_id in deps:
+        preds.setdefault(activity_id, []).append(predecessor_id)
+    result = []
+    for a in acts:
+        d = {c.name: getattr(a, c.name) for c in a.__table__.columns}
+        d["predecessor_ids"] = preds.get(a.id, [])
+        result.append(d)
+    return result
+
+
+def seed(rows: int) -> int:
+    db = SessionLocal()
+    start = date.today()
+    project = Project(name="Benchmark", start_date=start)
+    db.add(project)
+    db.flush()
+    acts = [
+        Activity(project_id=project.id, activity_code=f"A{i:05d}", name=f"Activity {i}", duration_days=3,
+                 planned_start=start + timedelta(days=i % 365), planned_finish=start + timedelta(days=i % 365 + 3),
+                 notes="Coordinate with the framing crew before starting.", sort_order=i)
+        for i in range(rows)
+    ]
+    db.add_all(acts)
+    db.flush()
+    db.add_all([ActivityDependency(activity_id=acts[i].id, predecessor_id=acts[i - 1].id) for i in range(1, rows, 2)])
+    db.commit()
+    project_id = project.id
+    db.close()
+    return project_id
+
+
+def timed(client: TestClient, url: str, repeat: int) -> tuple[float, bytes]:
+    body = client.get(url).content  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.text
+    return statistics.median(samples), body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        pid = seed(args.rows)
+        before_ms, before = timed(client, f"/bench/before/projects/{pid}/schedule/activities", args.repeat)
+        after_ms, after = timed(client, f"/api/v1/projects/{pid}/schedule/activities", args.repeat)
+
+    same = json.loads(before) == json.loads(after)
+    print(f"{args.rows} activities, {len(after) / 1e6:.2f} MB payload, identical output: {same}")
+    print(f"before (ORM + dicts + response_model): {before_ms:8.1f} ms")
+    print(f"after  (row tuples + orjson):          {after_ms:8.1f} ms   ({before_ms / after_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
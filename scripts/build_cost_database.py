@@ -0,0 +1,14 @@
+"""Build the memory-mapped CWICR cost database from a CSV or Parquet export."""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.config import settings
+from backend.services.cost_database import build_cost_database, CostDatabase
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else settings.cost_database_source
+    if not source:
+        sys.exit("Usage: build_cost_database.py <cwicr.csv|cwicr.parquet> (or set COST_DATABASE_SOURCE)")
+    out = build_cost_database(source, settings.cost_database_dir)
+    print(f"Built cost database with {CostDatabase(out).rows} rows at {out}")
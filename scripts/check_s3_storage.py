@@ -0,0 +1,98 @@
+"""Exercise the S3 storage driver against a real S3-compatible server (MinIO locally).
+
+    docker compose up -d minio
+    S3_ENDPOINT_URL=http://localhost:9000 S3_ACCESS_KEY=buildflow S3_SECRET_KEY=buildflow-secret \\
+        python scripts/check_s3_storage.py
+
+Uses ``S3_BUCKET`` (default ``buildflow-check``, created if missing) under
+a throwaway key prefix, and removes what it wrote. Exits non-zero on the
+first failed check.
+"""
+import sys
+import os
+import asyncio
+import hashlib
+import tempfile
+import urllib.request
+import uuid
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.config import settings
+from backend.utils.downloads import content_disposition
+from backend.utils.storage import S3Storage
+
+
+def check(name: str, ok: bool) -> None:
+    print(f"{'ok  ' if ok else 'FAIL'} {name}")
+    if not ok:
+        sys.exit(1)
+
+
+def write_temp(data: bytes, suffix: str) -> str:
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return path
+
+
+async def run(storage: S3Storage) -> None:
+    small = os.urandom(64 * 1024)
+    large = os.urandom(12 * 1024 * 1024 + 123)  # three 5 MiB parts
+
+    small_path = write_temp(small, ".jpg")
+    await storage.put("blobs/aa/small.jpg", small_path)
+    check("put moves the local file", not os.path.exists(small_path))
+    check("exists after put", storage.exists("blobs/aa/small.jpg"))
+    check("missing key does not exist", not storage.exists("blobs/aa/missing.jpg"))
+
+    large_path = write_temp(large, ".pdf")
+    await storage.put("blobs/bb/large.pdf", large_path, move=False)
+    check("put with move=False keeps the local file", os.path.exists(large_path))
+    os.remove(large_path)
+    with storage.open("blobs/bb/large.pdf") as body:
+        check("multipart upload round-trips", hashlib.sha256(body.read()).digest() == hashlib.sha256(large).digest())
+    uploads = storage.client.list_multipart_uploads(Bucket=storage.bucket, Prefix=storage.prefix).get("Uploads", [])
+    check("no multipart upload left open", not uploads)
+
+    url = storage.url("blobs/bb/large.pdf", content_disposition("Plan set.pdf"))
+    with urllib.request.urlopen(urllib.request.Request(url, headers={"Range": "bytes=0-99"})) as resp:
+        check("presigned URL serves ranges", resp.status == 206 and resp.read() == large[:100])
+        check("presigned URL sets the download name", "Plan%20set.pdf" in resp.headers.get("Content-Disposition", ""))
+    with urllib.request.urlopen(storage.url("blobs/aa/small.jpg")) as resp:
+        check("content type from the key", resp.headers.get("Content-Type") == "image/jpeg")
+
+    async with storage.local_path("blobs/aa/small.jpg") as path:
+        with open(path, "rb") as f:
+            check("local_path downloads a copy", f.read() == small)
+    check("local_path copy is removed", not os.path.exists(path))
+
+    keys = sorted(obj.key for obj in storage.list("blobs/"))
+    check("list returns keys without the prefix", keys == ["blobs/aa/small.jpg", "blobs/bb/large.pdf"])
+    try:
+        storage.open("blobs/aa/missing.jpg")
+        check("open of a missing key raises FileNotFoundError", False)
+    except FileNotFoundError:
+        check("open of a missing key raises FileNotFoundError", True)
+
+    for key in keys:
+        storage.delete(key)
+    check("delete removes objects", not any(storage.list("blobs/")))
+
+
+def main() -> int:
+    bucket = settings.s3_bucket or "buildflow-check"
+    storage = S3Storage(
+        bucket, f"check-{uuid.uuid4().hex[:8]}", settings.s3_endpoint_url, settings.s3_region or "us-east-1",
+        settings.s3_access_key, settings.s3_secret_key, part_size_mb=5, concurrency=3,
+    )
+    try:
+        storage.client.head_bucket(Bucket=bucket)
+    except storage.client.exceptions.ClientError:
+        storage.client.create_bucket(Bucket=bucket)
+    asyncio.run(run(storage))
+    print("S3 storage driver OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""Delete uploaded files that no row references any more (run daily from cron).
+
+Blobs are removed once ``STORAGE_GC_GRACE_HOURS`` have passed since their
+last reference went away; see ``backend/services/storage_gc.py`` for what
+is collected.
+
+    python scripts/collect_garbage.py [--dry-run] [--grace-hours H] [--verbose]
+"""
+import sys
+import os
+import argparse
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.database import init_db
+from backend.services.storage_gc import collect_garbage
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="report what would be deleted without deleting")
+    parser.add_argument("--grace-hours", type=float, help="override STORAGE_GC_GRACE_HOURS")
+    parser.add_argument("--verbose", action="store_true", help="list every file")
+    args = parser.parse_args()
+    init_db()
+    report = collect_garbage(dry_run=args.dry_run, grace_hours=args.grace_hours)
+    if args.verbose:
+        for kind, key, size in report.removed:
+            print(f"{kind:15} {size:>12}  {key}")
+    print(report.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Extract text from documents uploaded before text extraction existed (or whose extraction was skipped).
+
+Covers every document stored as a blob; blobs extracted before (whatever the
+outcome) are skipped. Documents are re-indexed for search as their text lands.
+"""
+import sys
+import os
+import asyncio
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import select
+
+from backend.database import SessionLocal, init_db
+from backend.models.blob import BlobText
+from backend.models.document import Document
+from backend.services import text_extraction
+
+
+async def extract_all(shas: list[str]) -> None:
+    await asyncio.gather(*(text_extraction.extract_blob_text(sha) for sha in shas))
+
+
+def main() -> int:
+    init_db()
+    db = SessionLocal()
+    shas = db.execute(
+        select(Document.blob_sha256).distinct()
+        .where(Document.blob_sha256.is_not(None))
+        .where(Document.blob_sha256.not_in(select(BlobText.sha256)))
+    ).scalars().all()
+    db.close()
+    asyncio.run(extract_all(shas))
+    text_extraction.shutdown()
+    print(f"Extracted text from {len(shas)} document files")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Render thumbnails/derivatives for photos uploaded before the image pipeline (or after a size change).
+
+Covers every daily log photo and punch item photo stored as a blob; blobs
+whose derivatives already exist are not rendered again, only marked as
+rendered (``blobs.derived_at``), which photos rendered before that column
+existed need once for their derivative URLs to be served.
+"""
+import sys
+import os
+import asyncio
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import select, union
+
+from backend.database import SessionLocal, init_db
+from backend.models.blob import Blob
+from backend.models.daily_log import DailyLogPhoto
+from backend.models.punchlist import PunchItem
+from backend.services import images
+
+
+async def render_all(blobs: list[tuple[str, str]]) -> None:
+    await asyncio.gather(*(images.generate_derivatives(sha, path) for sha, path in blobs))
+
+
+def main() -> int:
+    init_db()
+    db = SessionLocal()
+    photo_shas = union(
+        select(DailyLogPhoto.blob_sha256),
+        select(PunchItem.photo_before_sha256),
+        select(PunchItem.photo_after_sha256),
+    ).subquery()
+    blobs = db.execute(
+        select(Blob.sha256, Blob.file_path).where(Blob.sha256.in_(select(photo_shas.c[0])))
+    ).all()
+    db.close()
+    pending = [(sha, path) for sha, path in blobs if not images.derivatives_stored(sha)]
+    # Already stored ones are only marked as rendered
+    asyncio.run(render_all(blobs))
+    images.shutdown()
+    print(f"Rendered derivatives for {len(pending)} of {len(blobs)} photos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,11 @@
-"""Initialize the BuildFlow database with all tables."""
+"""Initialize the BuildFlow database by applying all schema migrations."""
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.database import Base, engine
-import backend.models  # noqa: F401 - registers all models
+from backend.database import init_db
 
 if __name__ == "__main__":
-    print("Creating all tables...")
-    Base.metadata.create_all(bind=engine)
+    print("Applying migrations...")
+    init_db()
     print("Done! Database ready at buildflow.db")
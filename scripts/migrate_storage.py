@@ -0,0 +1,88 @@
+"""Copy uploaded files into the configured storage and point rows at storage keys.
+
+Run after switching ``STORAGE_BACKEND`` (e.g. to ``s3``): every blob and
+rendered photo derivative under ``UPLOAD_DIR`` is uploaded unless the
+storage already has it, and file paths saved under ``UPLOAD_DIR`` (absolute,
+or relative to the working directory) are rewritten to keys. Local files are
+left in place; remove them once the new storage is verified. With ``STORAGE_BACKEND=local`` only
+the paths are rewritten. Safe to re-run.
+
+    python scripts/migrate_storage.py [--dry-run]
+"""
+import sys
+import os
+import argparse
+import asyncio
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import update
+
+from backend.config import settings
+from backend.database import SessionLocal, init_db
+from backend.models.blob import Blob
+from backend.utils.file_storage import BLOB_REFERENCES
+from backend.utils.storage import LocalStorage, get_storage, storage_key
+
+BATCH_SIZE = 200
+
+
+async def migrate(dry_run: bool) -> int:
+    source, target = LocalStorage(settings.upload_dir), get_storage()
+    copy = not (isinstance(target, LocalStorage) and target.root.resolve() == source.root.resolve())
+    existing = {obj.key for prefix in ("blobs/", "derived/") for obj in target.list(prefix)} if copy else set()
+    copied = rewritten = skipped = 0
+
+    db = SessionLocal()
+    blobs = db.query(Blob).order_by(Blob.sha256).all()
+    for i, blob in enumerate(blobs, start=1):
+        key = storage_key(blob.file_path)
+        if key is None:
+            print(f"outside upload dir, skipped: {blob.file_path}")
+            skipped += 1
+            continue
+        if copy and key not in existing:
+            if not source.exists(key):
+                print(f"missing on disk: {blob.file_path}")
+                skipped += 1
+                continue
+            if not dry_run:
+                await target.put(key, str(source.path(key)), move=False, content_encoding=blob.content_encoding)
+            copied += 1
+        if key != blob.file_path:
+            for model, path_attr, _ in BLOB_REFERENCES:
+                column = getattr(model, path_attr)
+                db.execute(update(model).where(column == blob.file_path).values({path_attr: key}))
+            blob.file_path = key
+            rewritten += 1
+        if i % BATCH_SIZE == 0 and not dry_run:
+            db.commit()
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+    db.close()
+
+    derived = 0
+    if copy:
+        for obj in source.list("derived"):
+            if obj.key not in existing:
+                if not dry_run:
+                    await target.put(obj.key, str(source.path(obj.key)), move=False)
+                derived += 1
+
+    prefix = "[dry run] " if dry_run else ""
+    print(f"{prefix}{len(blobs)} blobs: {copied} copied, {rewritten} paths rewritten to keys, {skipped} skipped; "
+          f"{derived} derivatives copied")
+    return 1 if skipped else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="report what would be copied and rewritten")
+    args = parser.parse_args()
+    init_db()
+    return asyncio.run(migrate(args.dry_run))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
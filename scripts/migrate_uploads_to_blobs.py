@@ -0,0 +1,46 @@
+"""Move uploads saved before the blob store into it and point their rows at the blobs.
+
+Every Document, DailyLogPhoto, PermitDocument, LienWaiver and punch item
+photo that is not yet a blob is hashed and stored once per content in the
+blob store; identical files collapse into one blob. Rows whose
+file is missing on disk are reported and left alone. Safe to re-run.
+"""
+import sys
+import os
+import asyncio
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.config import settings
+from backend.database import SessionLocal, init_db
+from backend.utils.file_storage import BLOB_REFERENCES, attach_blob, import_file
+from backend.utils.storage import LocalStorage
+
+
+def main() -> int:
+    init_db()
+    db = SessionLocal()
+    local = LocalStorage(settings.upload_dir)
+    blobs = {}  # legacy path -> blob, for files referenced by several rows
+    moved = missing = 0
+    for model, path_attr, ref_attr in BLOB_REFERENCES:
+        path_col, ref_col = getattr(model, path_attr), getattr(model, ref_attr)
+        for row in db.query(model).filter(ref_col.is_(None), path_col.isnot(None)).all():
+            path = getattr(row, path_attr)
+            blob = blobs.get(path)
+            if blob is None:
+                file = local.path(path)
+                if not file.is_file():
+                    print(f"missing  {model.__tablename__} {row.id}: {path}")
+                    missing += 1
+                    continue
+                blob = blobs[path] = asyncio.run(import_file(db, str(file)))
+            attach_blob(row, blob, path_attr, ref_attr)
+            moved += 1
+        db.commit()
+    db.close()
+    print(f"Moved {moved} file references ({len(blobs)} files) into the blob store; {missing} missing")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
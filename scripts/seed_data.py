@@ -3,7 +3,7 @@ import sys, os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from datetime import date, timedelta
-from backend.database import Base, engine, SessionLocal
+from backend.database import SessionLocal, init_db
 import backend.models  # noqa: F401
 from backend.models.project import Project, Phase
 from backend.models.budget import BudgetCategory, BudgetItem
@@ -13,7 +13,7 @@ from backend.models.punchlist import PunchList
 from backend.models.subcontractor import Subcontractor
 from backend.models.document import DocumentCategory
 
-Base.metadata.create_all(bind=engine)
+init_db()
 db = SessionLocal()
 
 # Project
@@ -0,0 +1,12 @@
+"""Record today's budget/KPI snapshot for every active project (run daily from cron)."""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.database import init_db
+from backend.services.snapshots import record_all_snapshots
+
+if __name__ == "__main__":
+    init_db()
+    count = record_all_snapshots()
+    print(f"Recorded snapshots for {count} projects")
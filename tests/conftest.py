@@ -0,0 +1,144 @@
+"""Shared fixtures: a throwaway migrated SQLite database seeded with project data,
+the app's test client and per-test query statistics.
+
+The environment is set before anything imports ``backend.config``, so the
+tests never touch the development database or upload folder.
+"""
+import os
+import tempfile
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'test.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp.name, "uploads")
+os.environ["STORAGE_BACKEND"] = "local"
+os.environ["COST_DATABASE_SOURCE"] = ""
+os.environ["SNAPSHOT_INTERVAL_HOURS"] = "0"
+os.environ["STORAGE_GC_INTERVAL_HOURS"] = "0"
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.database import SessionLocal, init_db
+from backend.main import app
+from backend.models.project import Project, Phase
+from backend.models.budget import BudgetCategory, BudgetItem, Bid, CostEntry, ChangeOrder
+from backend.models.schedule import Activity, ActivityDependency, Milestone, Decision
+from backend.models.punchlist import PunchList, PunchItem
+from backend.models.subcontractor import Subcontractor, SubcontractorPayment, LienWaiver
+from backend.models.permit import Permit, PermitDocument, Inspection, PermitFee
+from backend.models.daily_log import DailyLog, DailyLogCrew, DailyLogWorkItem, DailyLogPhoto
+from backend.models.document import DocumentCategory, Document
+from backend.utils import query_stats as query_stats_module
+
+
+def seed_project(db, n: int) -> int:
+    """A project with n rows of every child record (and nested rows under each)."""
+    start = date.today() - timedelta(days=60)
+    project = Project(name=f"Project x{n}", total_budget=100000 * n, start_date=start,
+                      target_end_date=start + timedelta(days=300))
+    db.add(project)
+    db.flush()
+    pid = project.id
+    prev = None
+    for i in range(n):
+        db.add(Phase(project_id=pid, name=f"Phase {i}"))
+        cat = BudgetCategory(project_id=pid, name=f"Cat {i}", code=f"{i:02d}", budgeted_amount=10000)
+        db.add(cat)
+        db.flush()
+        item = BudgetItem(project_id=pid, category_id=cat.id, item_code=f"{i:02d}-1", description="Item",
+                          original_budget=10000, current_budget=10000, actual_cost=2000, percent_complete=20)
+        db.add(item)
+        db.flush()
+        db.add(Bid(project_id=pid, budget_item_id=item.id, contractor_name="A", amount=9000 + i))
+        db.add(Bid(project_id=pid, budget_item_id=item.id, contractor_name="B", amount=11000 + i))
+        db.add(CostEntry(project_id=pid, budget_item_id=item.id, entry_date=start + timedelta(days=i),
+                         amount=2000, entry_type="actual"))
+        db.add(ChangeOrder(project_id=pid, co_number=f"CO-{i}", title="Change", change_type="addition",
+                           cost_impact=500, status="approved"))
+
+        act = Activity(project_id=pid, activity_code=f"A{i}", name=f"Activity {i}", duration_days=5,
+                       status="in_progress" if i % 2 else "not_started", percent_complete=50 if i % 2 else 0,
+                       planned_start=start + timedelta(days=5 * i),
+                       planned_finish=start + timedelta(days=5 * i + 4), sort_order=i)
+        db.add(act)
+        db.flush()
+        if prev:
+            db.add(ActivityDependency(activity_id=act.id, predecessor_id=prev.id))
+        prev = act
+        db.add(Milestone(project_id=pid, name=f"Milestone {i}", target_date=start + timedelta(days=30 * i)))
+        db.add(Decision(project_id=pid, title=f"Decision {i}", due_date=date.today() + timedelta(days=i)))
+
+        plist = PunchList(project_id=pid, name=f"List {i}")
+        db.add(plist)
+        db.flush()
+        for j in range(2):
+            db.add(PunchItem(project_id=pid, punch_list_id=plist.id, description="Fix",
+                             location="Kitchen", trade="Paint", status="Open" if j else "Completed",
+                             due_date=date.today() - timedelta(days=1)))
+
+        sub = Subcontractor(project_id=pid, company_name=f"Sub {i}", trade="Framing", contract_amount=20000,
+                            insurance_expiry=date.today() + timedelta(days=10))
+        db.add(sub)
+        db.flush()
+        for j in range(2):
+            pay = SubcontractorPayment(project_id=pid, subcontractor_id=sub.id, invoice_number=f"{i}-{j}",
+                                       gross_amount=5000, retention_held=500, net_amount=4500,
+                                       status="paid", paid_date=start + timedelta(days=i))
+            db.add(pay)
+            db.flush()
+            if j:
+                db.add(LienWaiver(payment_id=pay.id, waiver_type="conditional"))
+
+        permit = Permit(project_id=pid, permit_type="building", status="issued",
+                        expiry_date=date.today() + timedelta(days=20))
+        db.add(permit)
+        db.flush()
+        db.add(PermitDocument(permit_id=permit.id, document_type="Plans"))
+        db.add(PermitFee(permit_id=permit.id, fee_type="Plan review", amount=250))
+        db.add(Inspection(project_id=pid, permit_id=permit.id, inspection_type="Framing",
+                          scheduled_date=date.today() + timedelta(days=i)))
+
+        log = DailyLog(project_id=pid, log_date=date.today() - timedelta(days=i), work_summary="Work",
+                       weather_condition="Clear")
+        db.add(log)
+        db.flush()
+        db.add(DailyLogCrew(daily_log_id=log.id, trade="Framing", headcount=3, hours_worked=8))
+        db.add(DailyLogWorkItem(daily_log_id=log.id, description="Walls"))
+        db.add(DailyLogPhoto(daily_log_id=log.id, file_path="photos/x.jpg"))
+
+        doc_cat = DocumentCategory(project_id=pid, name=f"Folder {i}")
+        db.add(doc_cat)
+        db.flush()
+        db.add(Document(project_id=pid, category_id=doc_cat.id, name=f"Doc {i}", file_path="documents/x.pdf"))
+    db.commit()
+    return pid
+
+
+@pytest.fixture(scope="session")
+def seeded_projects() -> tuple[int, int]:
+    """Ids of two projects on the migrated test database, the second twice the size of the first."""
+    init_db()
+    with SessionLocal() as db:
+        return seed_project(db, 5), seed_project(db, 10)
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def query_stats():
+    """QueryStats of every statement run during the test, including those of client requests."""
+    with query_stats_module.collect("test") as stats:
+        yield stats
@@ -0,0 +1,37 @@
+"""Bid leveling flags: bids are measured against their own line item, not the category."""
+from backend.models.budget import Bid, BudgetCategory, BudgetItem
+from backend.models.project import Project
+from backend.services.bid_leveling import run_bid_leveling
+
+
+def _project_with_bids(db, budget: float, amounts: list[float]) -> int:
+    project = Project(name="Bids", state="TX", city="Austin")
+    db.add(project)
+    db.flush()
+    # The built-in regional average for 01-SITE is far above a single item's budget
+    category = BudgetCategory(project_id=project.id, name="Site Work", code="01-SITE", budgeted_amount=budget)
+    db.add(category)
+    db.flush()
+    item = BudgetItem(project_id=project.id, category_id=category.id, item_code="01-1", description="Clearing",
+                      original_budget=budget, current_budget=budget)
+    db.add(item)
+    db.flush()
+    for i, amount in enumerate(amounts):
+        db.add(Bid(project_id=project.id, budget_item_id=item.id, contractor_name=f"Bidder {i}", amount=amount))
+    db.commit()
+    return project.id
+
+
+def test_bids_near_the_median_are_not_flagged(db, seeded_projects):
+    result = run_bid_leveling(db, _project_with_bids(db, 8000, [7900, 8000, 8050, 8100]))
+    item = result.items[0]
+    assert item.reference_amount == 8000
+    assert item.missing_scope_count == 0
+    assert all(not bid.flags for bid in item.bids)
+
+
+def test_low_bid_under_the_item_budget_is_flagged(db, seeded_projects):
+    result = run_bid_leveling(db, _project_with_bids(db, 8000, [5000, 7900, 8000, 8100]))
+    flagged = [bid.amount for bid in result.items[0].bids if bid.missing_scope_suspected]
+    assert flagged == [5000]
+    assert "below_reference" in result.items[0].bids[0].flags
@@ -0,0 +1,56 @@
+"""Takeoff estimates: calculators are cached per region the cost database has, and takeoffs are size-limited."""
+import pytest
+
+from backend.config import settings
+from backend.services import costs
+from backend.services.cost_database import CostDatabase, build_cost_database
+
+CATALOG = """work_item_code,description,unit,region,labor_cost,material_cost,equipment_cost
+CONC-001,Concrete slab,m3,DEFAULT,100,200,10
+CONC-001,Concrete slab,m3,CA,130,240,12
+FRAM-001,Wall framing,m2,DEFAULT,40,60,0
+"""
+TAKEOFF = b"work_item_code,quantity\nCONC-001,2\nFRAM-001,10\n"
+
+
+@pytest.fixture
+def cost_db(tmp_path, monkeypatch) -> CostDatabase:
+    source = tmp_path / "cwicr.csv"
+    source.write_text(CATALOG)
+    db = CostDatabase(build_cost_database(source, tmp_path / "store"))
+    monkeypatch.setattr(costs, "get_cost_database", lambda: db)
+    monkeypatch.setattr(costs, "_calculators", type(costs._calculators)())
+    return db
+
+
+def _estimate(client, project_id: int, region: str | None, body: bytes = TAKEOFF):
+    data = {"region": region} if region else {}
+    return client.post(
+        f"/api/v1/projects/{project_id}/budget/estimate", files={"file": ("qto.csv", body, "text/csv")}, data=data,
+    )
+
+
+def test_unknown_regions_share_the_default_calculator(client, seeded_projects, cost_db):
+    project_id = seeded_projects[0]
+    totals = {}
+    for region in ("ca", "CA ", "DEFAULT", "nowhere", "x" * 40):
+        response = _estimate(client, project_id, region)
+        assert response.status_code == 200
+        totals[region] = response.json()["total_cost"]
+    assert totals["ca"] == totals["CA "] > totals["nowhere"] == totals["DEFAULT"] == totals["x" * 40]
+    assert {region for _, region in costs._calculators} == {"CA", "DEFAULT"}
+
+
+def test_calculator_cache_is_bounded(cost_db, monkeypatch):
+    monkeypatch.setattr(costs, "CALCULATOR_CACHE_SIZE", 1)
+    monkeypatch.setattr(cost_db, "regions", frozenset({"CA", "DEFAULT"}))
+    first = costs._calculator_for(cost_db, "CA")
+    costs._calculator_for(cost_db, None)
+    assert list(costs._calculators) == [(id(cost_db), "DEFAULT")]
+    assert costs._calculator_for(cost_db, "CA") is not first
+
+
+def test_oversized_takeoff_is_rejected(client, seeded_projects, cost_db, monkeypatch):
+    monkeypatch.setitem(settings.upload_max_mb, "takeoffs", 1)
+    body = TAKEOFF + b"CONC-001,1\n" * 100_000
+    assert _estimate(client, seeded_projects[0], None, body).status_code == 413
@@ -0,0 +1,8 @@
+"""Daily report requests are validated before a job is started."""
+import pytest
+
+
+@pytest.mark.parametrize("month", ["0000-01", "2026-13", "2026-1"])
+def test_invalid_month_is_rejected(client, seeded_projects, month):
+    response = client.post(f"/api/v1/projects/{seeded_projects[0]}/daily-reports", json={"month": month})
+    assert response.status_code == 422
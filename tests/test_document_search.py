@@ -0,0 +1,24 @@
+"""Search finds only the latest version of a revised document."""
+
+
+def _search(client, project_id: int, q: str) -> list[int]:
+    response = client.get(f"/api/v1/projects/{project_id}/search", params={"q": q, "types": "document"})
+    assert response.status_code == 200
+    return [hit["entity_id"] for hit in response.json()]
+
+
+def test_superseded_versions_leave_the_index(client, seeded_projects):
+    project_id = seeded_projects[0]
+    files = {"file": ("spec.txt", b"first draft", "text/plain")}
+    v1 = client.post(
+        f"/api/v1/projects/{project_id}/documents", files=files, data={"description": "zoning variance memo"},
+    ).json()
+    assert _search(client, project_id, "zoning variance") == [v1["id"]]
+
+    files = {"file": ("spec.txt", b"second draft", "text/plain")}
+    v2 = client.post(f"/api/v1/projects/{project_id}/documents/{v1['id']}/versions", files=files).json()
+    assert _search(client, project_id, "zoning variance") == [v2["id"]]
+
+    # Deleting the latest version makes the previous one latest, and searchable, again
+    assert client.delete(f"/api/v1/projects/{project_id}/documents/{v2['id']}").status_code == 204
+    assert _search(client, project_id, "zoning variance") == [v1["id"]]
@@ -0,0 +1,52 @@
+"""Earned value at the data date, and the curve cache following edits to the project's data."""
+from datetime import date, timedelta
+
+import pytest
+
+from backend.models.budget import BudgetCategory, BudgetItem, CostEntry
+from backend.models.project import Project
+from backend.models.schedule import Activity
+from backend.services.earned_value import run_earned_value
+
+
+@pytest.fixture
+def project_id(db, seeded_projects) -> int:
+    """Day 50 of a 100-day activity, half done, over a 1000 budget with 300 spent."""
+    start = date.today() - timedelta(days=50)
+    project = Project(name="EVM", total_budget=1000, start_date=start, target_end_date=start + timedelta(days=99))
+    db.add(project)
+    db.flush()
+    cat = BudgetCategory(project_id=project.id, name="Concrete", code="03", budgeted_amount=1000)
+    db.add(cat)
+    db.flush()
+    item = BudgetItem(project_id=project.id, category_id=cat.id, item_code="03-1", description="Slab",
+                      original_budget=1000, current_budget=1000, actual_cost=300, percent_complete=50)
+    db.add(item)
+    db.flush()
+    db.add(CostEntry(project_id=project.id, budget_item_id=item.id, entry_date=start + timedelta(days=10),
+                     amount=300, entry_type="actual"))
+    db.add(Activity(project_id=project.id, activity_code="A1", name="Pour", duration_days=100,
+                    status="in_progress", percent_complete=50, actual_start=start,
+                    planned_start=start, planned_finish=start + timedelta(days=99)))
+    db.commit()
+    return project.id
+
+
+def test_values_at_the_data_date(db, project_id):
+    result = run_earned_value(db, project_id)
+    assert result.data_date == str(date.today())
+    assert result.budget_at_completion == 1000
+    # 51 of 100 planned days are over by the end of today
+    assert result.planned_value == 510
+    assert result.earned_value == 500
+    assert result.actual_cost == 300
+    assert result.cpi == pytest.approx(500 / 300, abs=0.01)
+
+
+def test_edited_cost_entry_invalidates_the_cache(db, project_id):
+    assert run_earned_value(db, project_id).actual_cost == 300
+    # Same count, ids and amounts; only the date moves past the data date
+    entry = db.query(CostEntry).filter(CostEntry.project_id == project_id).one()
+    entry.entry_date = date.today() + timedelta(days=40)
+    db.commit()
+    assert run_earned_value(db, project_id).actual_cost == 0
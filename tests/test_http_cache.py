@@ -0,0 +1,49 @@
+"""CompressionMiddleware leaves file downloads alone so Range/If-Range keep working."""
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import FileResponse, JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from backend.utils.http_cache import CompressionMiddleware
+
+BODY = "line of a text document\n" * 500
+
+
+@pytest.fixture
+def app_client(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text(BODY)
+
+    def download(request):
+        return FileResponse(path, filename="notes.txt", headers={"ETag": '"abc123"'})
+
+    def listing(request):
+        return JSONResponse([{"name": BODY}])
+
+    app = Starlette(routes=[Route("/download", download), Route("/listing", listing)])
+    return TestClient(CompressionMiddleware(app, minimum_size=100))
+
+
+def test_text_download_is_not_compressed(app_client):
+    r = app_client.get("/download", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert "content-encoding" not in r.headers
+    assert r.headers["etag"] == '"abc123"'
+    assert r.headers["accept-ranges"] == "bytes"
+    assert r.headers["content-length"] == str(len(BODY))
+
+
+def test_ranged_download_matches_full_download(app_client):
+    r = app_client.get(
+        "/download", headers={"Accept-Encoding": "gzip", "Range": "bytes=10-19", "If-Range": '"abc123"'},
+    )
+    assert r.status_code == 206
+    assert r.text == BODY[10:20]
+
+
+def test_text_responses_are_still_compressed(app_client):
+    r = app_client.get("/listing", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.json() == [{"name": BODY}]
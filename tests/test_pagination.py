@@ -0,0 +1,24 @@
+"""Keyset pagination is opt-in: without limit or cursor a list is returned whole."""
+
+
+def _logs(client, project_id: int, **params):
+    response = client.get(f"/api/v1/projects/{project_id}/daily-logs", params=params)
+    assert response.status_code == 200
+    return [row["id"] for row in response.json()], response.headers.get("x-next-cursor")
+
+
+def test_unpaged_list_is_complete(client, seeded_projects):
+    ids, cursor = _logs(client, seeded_projects[1])
+    assert len(ids) == 10
+    assert cursor is None
+
+
+def test_pages_cover_the_list(client, seeded_projects):
+    project_id = seeded_projects[1]
+    everything, _ = _logs(client, project_id)
+    ids, cursor = _logs(client, project_id, limit=4)
+    assert len(ids) == 4 and cursor
+    while cursor:
+        page, cursor = _logs(client, project_id, limit=4, cursor=cursor)
+        ids += page
+    assert ids == everything
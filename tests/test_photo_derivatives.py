@@ -0,0 +1,36 @@
+"""Photo derivative URLs come from the blob's derived_at flag, not from storage lookups."""
+import io
+
+import pytest
+from PIL import Image
+
+from backend.models.daily_log import DailyLog
+from backend.utils import storage
+
+
+def _photo() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (1600, 1200), "orange").save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def log_id(db, seeded_projects) -> int:
+    return db.query(DailyLog.id).filter(DailyLog.project_id == seeded_projects[0]).limit(1).scalar()
+
+
+def test_derivatives_listed_once_rendered(client, seeded_projects, log_id, monkeypatch):
+    project_id = seeded_projects[0]
+    url = f"/api/v1/projects/{project_id}/daily-logs/{log_id}"
+    # The test client runs the background rendering before returning
+    response = client.post(f"{url}/photos", files={"file": ("site.jpg", _photo(), "image/jpeg")})
+    assert response.status_code == 201
+    photo_id = response.json()["id"]
+
+    def no_lookups(self, key):
+        raise AssertionError(f"storage lookup for {key} while serializing")
+
+    monkeypatch.setattr(storage.LocalStorage, "exists", no_lookups)
+    photo = next(p for p in client.get(url).json()["photos"] if p["id"] == photo_id)
+    assert set(photo["derivatives"]) == {"thumb", "thumb_jpeg", "medium", "medium_jpeg"}
+    assert "derivatives_rendered" not in photo
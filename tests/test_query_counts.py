@@ -0,0 +1,34 @@
+"""No project-scoped GET endpoint issues more queries as the project grows.
+
+Every parameterless ``/projects/{project_id}/...`` GET route is requested for
+a project and for one twice its size; a query count that differs is an N+1
+loop.
+"""
+import pytest
+
+from backend.main import app
+
+# External calls or request bodies; not meaningful to count here
+SKIP = ("weather", "chat")
+
+PROJECT_PATHS = [
+    path for path, operations in app.openapi()["paths"].items()
+    if "get" in operations and "{project_id}" in path
+    and "{" not in path.replace("{project_id}", "") and not any(s in path for s in SKIP)
+]
+
+
+def _query_count(client, query_stats, path: str, project_id: int) -> int:
+    before = query_stats.count
+    response = client.get(path.replace("{project_id}", str(project_id)))
+    if response.status_code != 200:
+        pytest.skip(f"HTTP {response.status_code}")
+    return query_stats.count - before
+
+
+@pytest.mark.parametrize("path", PROJECT_PATHS)
+def test_constant_query_count(client, query_stats, seeded_projects, path):
+    small, large = seeded_projects
+    n_small = _query_count(client, query_stats, path, small)
+    n_large = _query_count(client, query_stats, path, large)
+    assert n_large == n_small, f"{path}: {n_small} -> {n_large} queries"
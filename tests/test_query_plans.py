@@ -0,0 +1,101 @@
+"""The hot per-project queries are served by indexes (SQLite EXPLAIN QUERY PLAN).
+
+A query that falls back to a full table scan, or a keyset page that sorts
+in a temp b-tree (reading every matching row before the LIMIT), fails.
+"""
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import select, text, tuple_
+
+from backend.database import engine
+from backend.models.activity_log import ActivityLog
+from backend.models.budget import BudgetItem, CostEntry, Bid, ChangeOrder
+from backend.models.schedule import Activity, ActivityDependency, Decision
+from backend.models.punchlist import PunchItem
+from backend.models.permit import Inspection, Permit
+from backend.models.document import Document
+from backend.models.daily_log import DailyLog, DailyLogCrew, DailyLogWorkItem, DailyLogPhoto
+from backend.models.project import Project
+from backend.models.subcontractor import SubcontractorPayment, LienWaiver, Subcontractor
+
+HOT_QUERIES = {
+    "budget items by project": select(BudgetItem).where(BudgetItem.project_id == 1),
+    "bids by item": select(Bid).where(Bid.budget_item_id == 1),
+    "cost entries by project": select(CostEntry).where(CostEntry.project_id == 1),
+    "cost entries by item": select(CostEntry).where(CostEntry.budget_item_id == 1),
+    "change orders by project/status": select(ChangeOrder).where(ChangeOrder.project_id == 1, ChangeOrder.status == "approved"),
+    "activities by project": select(Activity).where(Activity.project_id == 1),
+    "activities by project/status": select(Activity).where(Activity.project_id == 1, Activity.status == "completed"),
+    "dependencies by activity": select(ActivityDependency).where(ActivityDependency.activity_id == 1),
+    "dependencies by predecessor": select(ActivityDependency).where(ActivityDependency.predecessor_id == 1),
+    "decisions by project": select(Decision).where(Decision.project_id == 1).order_by(Decision.due_date),
+    "punch items by project/status": select(PunchItem).where(PunchItem.project_id == 1, PunchItem.status == "Open"),
+    "overdue punch items": select(PunchItem).where(PunchItem.project_id == 1, PunchItem.due_date < date.today()),
+    "punch items by list": select(PunchItem).where(PunchItem.punch_list_id == 1),
+    "inspections by project": select(Inspection).where(Inspection.project_id == 1),
+    "inspections by permit": select(Inspection).where(Inspection.permit_id == 1),
+    "permits by project": select(Permit).where(Permit.project_id == 1),
+    "documents by project (newest first)": select(Document).where(Document.project_id == 1).order_by(Document.created_at.desc()),
+    "document versions": select(Document).where(Document.chain_id == 1).order_by(Document.version.desc()),
+    "subcontractors by project": select(Subcontractor).where(Subcontractor.project_id == 1),
+    "payments by subcontractor": select(SubcontractorPayment).where(SubcontractorPayment.subcontractor_id == 1),
+    "payments by project/status": select(SubcontractorPayment).where(SubcontractorPayment.project_id == 1, SubcontractorPayment.status == "paid"),
+    "lien waivers by payment": select(LienWaiver).where(LienWaiver.payment_id.in_([1, 2, 3])),
+    # selectinload of daily log children, one IN query per collection
+    "daily log crew by logs": select(DailyLogCrew).where(DailyLogCrew.daily_log_id.in_([1, 2, 3])),
+    "daily log work items by logs": select(DailyLogWorkItem).where(DailyLogWorkItem.daily_log_id.in_([1, 2, 3])),
+    "daily log photos by logs": select(DailyLogPhoto).where(DailyLogPhoto.daily_log_id.in_([1, 2, 3])),
+    "activity feed": select(ActivityLog).where(ActivityLog.project_id == 1).order_by(ActivityLog.created_at.desc()),
+}
+
+# Keyset pages (see backend/utils/pagination.py): filter past the cursor, ordered by the same keys
+_NOW = datetime(2026, 1, 1)
+
+
+def _page(model, filters, keys, values, descending=True):
+    after = tuple_(*keys) < tuple_(*values) if descending else tuple_(*keys) > tuple_(*values)
+    order = [k.desc() if descending else k for k in keys]
+    return select(model).where(*filters, after).order_by(*order).limit(101)
+
+
+HOT_QUERIES.update({
+    "projects page": _page(Project, [], [Project.created_at, Project.id], [_NOW, 50]),
+    "daily logs page": _page(DailyLog, [DailyLog.project_id == 1], [DailyLog.log_date, DailyLog.id], [date(2026, 1, 1), 50]),
+    "daily logs month page": _page(
+        DailyLog, [DailyLog.project_id == 1, DailyLog.log_date.between(date(2025, 12, 1), date(2025, 12, 31))],
+        [DailyLog.log_date, DailyLog.id], [date(2026, 1, 1), 50],
+    ),
+    "documents page": _page(
+        Document, [Document.project_id == 1, Document.is_latest.is_(True)], [Document.created_at, Document.id], [_NOW, 50],
+    ),
+    "documents page with history": _page(Document, [Document.project_id == 1], [Document.created_at, Document.id], [_NOW, 50]),
+    "punch items page": _page(PunchItem, [PunchItem.project_id == 1], [PunchItem.created_at, PunchItem.id], [_NOW, 50]),
+    "budget items page": _page(BudgetItem, [BudgetItem.project_id == 1], [BudgetItem.id], [50], descending=False),
+    "change orders page": _page(ChangeOrder, [ChangeOrder.project_id == 1], [ChangeOrder.id], [50], descending=False),
+    "payments page": _page(
+        SubcontractorPayment, [SubcontractorPayment.subcontractor_id == 1],
+        [SubcontractorPayment.created_at, SubcontractorPayment.id], [_NOW, 50],
+    ),
+})
+
+
+def query_plan(connection, stmt) -> list[str]:
+    compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+    return [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+
+
+@pytest.fixture(scope="module")
+def connection(seeded_projects):
+    with engine.connect() as conn:
+        yield conn
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_query_uses_index(connection, name):
+    plan = query_plan(connection, HOT_QUERIES[name])
+    # "SCAN t USING INDEX" walks an index in order; a bare "SCAN t" reads the whole table
+    scans = [step for step in plan if step.startswith("SCAN") and "USING" not in step]
+    if name.endswith(" page"):
+        scans += [step for step in plan if "TEMP B-TREE" in step]
+    assert not scans, f"{name}: {'; '.join(plan)}"
@@ -0,0 +1,25 @@
+"""The snapshot run records every project it can, even when one of them fails."""
+from datetime import date
+
+from backend.models.history import ProjectSnapshot
+from backend.models.project import Project
+from backend.services import snapshots
+
+
+def test_failing_project_is_skipped(db, seeded_projects, monkeypatch):
+    broken = seeded_projects[0]
+    record = snapshots.record_snapshot
+
+    def record_or_fail(session, project_id, snapshot_date=None):
+        if project_id == broken:
+            raise RuntimeError("broken project")
+        return record(session, project_id, snapshot_date)
+
+    monkeypatch.setattr(snapshots, "record_snapshot", record_or_fail)
+    day = date(2020, 1, 1)
+    active = db.query(Project.id).filter(Project.status == "active").count()
+    assert snapshots.record_all_snapshots(day) == active - 1
+
+    recorded = {pid for (pid,) in db.query(ProjectSnapshot.project_id).filter(ProjectSnapshot.snapshot_date == day)}
+    assert broken not in recorded
+    assert set(seeded_projects[1:]) <= recorded
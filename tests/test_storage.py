@@ -0,0 +1,18 @@
+"""Local storage finds files by key and by the paths older rows stored."""
+from pathlib import Path
+
+from backend.utils.storage import LocalStorage, storage_key
+
+
+def test_legacy_paths_map_to_keys(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    local = LocalStorage("backend/static")
+    assert local.path("blobs/ab/abc.jpg") == Path("backend/static/blobs/ab/abc.jpg")
+    # Relative to the working directory, as saved with a relative UPLOAD_DIR
+    assert local.path("backend/static/photos/old.jpg") == Path("backend/static/photos/old.jpg")
+    assert local.path(str(tmp_path / "backend/static/photos/old.jpg")) == Path("backend/static/photos/old.jpg")
+    assert local.path("/elsewhere/old.jpg") == Path("/elsewhere/old.jpg")
+
+    assert storage_key("backend/static/photos/old.jpg", "backend/static") == "photos/old.jpg"
+    assert storage_key(str(tmp_path / "backend/static/photos/old.jpg"), tmp_path / "backend/static") == "photos/old.jpg"
+    assert storage_key("/elsewhere/old.jpg", "backend/static") is None
@@ -0,0 +1,41 @@
+"""Garbage collection keeps legacy uploads that rows still point at, however the path was stored."""
+import os
+import time
+
+from backend.config import settings
+from backend.models.daily_log import DailyLog, DailyLogPhoto
+from backend.services.storage_gc import collect_garbage
+
+
+def _old_file(path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"jpeg")
+    week_ago = time.time() - 7 * 86400
+    os.utime(path, (week_ago, week_ago))
+
+
+def test_relative_legacy_paths_are_referenced(db, seeded_projects, tmp_path, monkeypatch):
+    # Uploads saved before blobs existed stored upload_dir/<folder>/<name>, with upload_dir
+    # relative to the working directory as in .env.example
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "upload_dir", "backend/static")
+    _old_file(tmp_path / "backend/static/photos/kept.jpg")
+    _old_file(tmp_path / "backend/static/photos/orphan.jpg")
+    _old_file(tmp_path / "backend/static/documents/absolute.pdf")
+
+    log_id = db.query(DailyLog.id).filter(DailyLog.project_id == seeded_projects[0]).limit(1).scalar()
+    photos = [
+        DailyLogPhoto(daily_log_id=log_id, file_path="backend/static/photos/kept.jpg"),
+        DailyLogPhoto(daily_log_id=log_id, file_path=str(tmp_path / "backend/static/documents/absolute.pdf")),
+    ]
+    db.add_all(photos)
+    db.commit()
+    try:
+        report = collect_garbage(dry_run=True, grace_hours=1)
+    finally:
+        for photo in photos:
+            db.delete(photo)
+        db.commit()
+
+    legacy = {key for kind, key, _ in report.removed if kind == "legacy uploads"}
+    assert legacy == {"photos/orphan.jpg"}